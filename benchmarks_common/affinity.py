@@ -0,0 +1,152 @@
+"""CPU / NUMA placement for benchmark worker threads and processes.
+
+On multi-socket hosts the same run can differ a lot depending on where
+the scheduler puts workers, and where their buffers are first touched.
+An :class:`AffinityPlan` assigns each worker a CPU set:
+
+- ``os``: leave placement to the scheduler (no pinning),
+- ``cpus``: pin worker *i* to the *i*-th CPU of ``cpu_list``, round-robin,
+- ``spread``: pin worker *i* to all CPUs of NUMA node ``i % nodes``,
+- ``node``: pin every worker to the CPUs of one NUMA node. ``numa_node
+  = -1`` picks the node of the device holding the data, so buffers are
+  allocated (first touch) next to the NVMe controller or NIC.
+
+Pinning uses ``os.sched_setaffinity(0, ...)``, which on Linux applies to
+the calling thread, so it works for thread pools as well as process
+pools. Where it is unavailable, plans degrade to ``os``.
+"""
+
+import itertools
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .sysinfo import (NODE_ROOT, allowed_cpus, format_cpu_list, numa_nodes,
+                      parse_cpu_list, path_numa_node)
+
+AFFINITY_MODES = ("os", "cpus", "spread", "node")
+
+
+def affinity_supported() -> bool:
+    return hasattr(os, "sched_setaffinity")
+
+
+@dataclass
+class AffinityPlan:
+    mode: str = "os"
+    cpus: Tuple[int, ...] = ()                 # cpus mode: CPUs to pin to
+    nodes: Tuple[Tuple[int, Tuple[int, ...]], ...] = ()  # (node, cpus)
+
+    def cpus_for(self, worker: int) -> Optional[Set[int]]:
+        """CPU set for *worker*, or ``None`` to leave it unpinned."""
+        if self.mode == "cpus" and self.cpus:
+            return {self.cpus[worker % len(self.cpus)]}
+        if self.mode in ("spread", "node") and self.nodes:
+            return set(self.nodes[worker % len(self.nodes)][1])
+        return None
+
+    def node_for(self, worker: int) -> Optional[int]:
+        """NUMA node *worker* runs on, when the plan fixes one."""
+        if self.mode in ("spread", "node") and self.nodes:
+            return self.nodes[worker % len(self.nodes)][0]
+        if self.mode == "cpus" and self.cpus:
+            cpu = self.cpus[worker % len(self.cpus)]
+            for node, cpus in self.nodes:
+                if cpu in cpus:
+                    return node
+        return None
+
+    def describe(self, workers: int) -> Dict[str, Any]:
+        """Placement of the first *workers* workers, for summaries."""
+        placement = {}
+        for w in range(workers):
+            cpus = self.cpus_for(w)
+            placement[w] = {
+                "cpus": format_cpu_list(cpus) if cpus else "any",
+                "node": self.node_for(w),
+            }
+        return {"mode": self.mode, "workers": placement}
+
+
+def make_plan(mode: str = "os", cpu_list: str = "", numa_node: int = -1,
+              data_path: str = "",
+              node_root: str = NODE_ROOT) -> AffinityPlan:
+    """Build an :class:`AffinityPlan` for this host.
+
+    *data_path* locates the device for ``node`` mode with ``numa_node=-1``.
+    Nodes and CPUs are restricted to the CPUs this process may use.
+    """
+    if mode not in AFFINITY_MODES:
+        raise ValueError(
+            f"Unknown affinity mode '{mode}'. "
+            f"Choose from: {', '.join(AFFINITY_MODES)}")
+    if mode == "os" or not affinity_supported():
+        return AffinityPlan()
+    allowed = set(allowed_cpus())
+    topology = numa_nodes(node_root)
+    nodes = [(n, tuple(c for c in cpus if c in allowed))
+             for n, cpus in topology.items()]
+    nodes = [(n, cpus) for n, cpus in nodes if cpus]
+    if not nodes:  # no sysfs: the allowed CPUs are one node
+        nodes = [(0, tuple(sorted(allowed)))]
+
+    if mode == "cpus":
+        cpus = tuple(c for c in parse_cpu_list(cpu_list) if c in allowed)
+        if not cpus:
+            raise ValueError(
+                f"CPU list '{cpu_list}' has no CPUs this process may use "
+                f"({format_cpu_list(allowed)})")
+        return AffinityPlan(mode, cpus=cpus, nodes=tuple(nodes))
+    if mode == "spread":
+        return AffinityPlan(mode, nodes=tuple(nodes))
+
+    node = numa_node
+    if node < 0:
+        found = path_numa_node(data_path) if data_path else None
+        node = found if found is not None else nodes[0][0]
+    chosen = [entry for entry in nodes if entry[0] == node]
+    if not chosen:
+        raise ValueError(
+            f"NUMA node {node} has no usable CPUs. "
+            f"Choose from: {', '.join(str(n) for n, _ in nodes)}")
+    return AffinityPlan(mode, nodes=tuple(chosen))
+
+
+def pin_current(cpus: Optional[Set[int]]) -> bool:
+    """Pin the calling thread (Linux) or process to *cpus*."""
+    if not cpus or not affinity_supported():
+        return False
+    os.sched_setaffinity(0, cpus)
+    return True
+
+
+def _pin_next(plan: AffinityPlan, counter: Any) -> None:
+    if hasattr(counter, "get_lock"):  # multiprocessing.Value
+        with counter.get_lock():
+            worker = counter.value
+            counter.value += 1
+    else:
+        worker = next(counter)
+    pin_current(plan.cpus_for(worker))
+
+
+def thread_initializer(plan: AffinityPlan) -> Tuple[Callable, tuple]:
+    """``(initializer, initargs)`` pinning each ThreadPoolExecutor worker."""
+    return _pin_next, (plan, itertools.count())
+
+
+def process_initializer(plan: AffinityPlan,
+                        ctx: Any) -> Tuple[Callable, tuple]:
+    """``(initializer, initargs)`` pinning each ProcessPoolExecutor worker.
+
+    *ctx* is the multiprocessing context the pool uses.
+    """
+    return _pin_next, (plan, ctx.Value("i", 0))
+
+
+def throughput_by_node(rows: List[Tuple[Optional[int], float]]) -> Dict[Any, float]:
+    """Mean throughput per NUMA node from ``(node, mb_s)`` pairs."""
+    by_node: Dict[Any, List[float]] = {}
+    for node, mb_s in rows:
+        by_node.setdefault("any" if node is None else node, []).append(mb_s)
+    return {node: round(sum(v) / len(v), 2) for node, v in by_node.items()}
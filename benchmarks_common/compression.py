@@ -0,0 +1,81 @@
+"""Pluggable compression codecs for synthetic datasets.
+
+Built-in codecs use the standard library (gzip, raw deflate, lzma, bz2).
+``zstd`` and ``lz4`` are registered only when ``zstandard`` / ``lz4`` are
+installed. Codecs are looked up by name so that decode work can be shipped
+to worker processes without pickling callables.
+"""
+
+import bz2
+import gzip
+import lzma
+import zlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+
+@dataclass(frozen=True)
+class Codec:
+    name: str
+    extension: str  # appended to ".bin", e.g. ".gz"
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+_REGISTRY: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec) -> None:
+    """Add (or replace) a codec in the registry."""
+    _REGISTRY[codec.name] = codec
+
+
+def get_codec(name: str) -> Codec:
+    """Return the codec registered under *name*."""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown codec '{name}'. "
+            f"Available: {', '.join(available_codecs())}"
+        ) from None
+
+
+def available_codecs() -> List[str]:
+    """Names of all codecs usable in this environment."""
+    return sorted(_REGISTRY)
+
+
+def _zlib_raw_compress(data: bytes) -> bytes:
+    comp = zlib.compressobj(wbits=-15)
+    return comp.compress(data) + comp.flush()
+
+
+def _zlib_raw_decompress(data: bytes) -> bytes:
+    return zlib.decompress(data, wbits=-15)
+
+
+register_codec(Codec("gzip", ".gz", gzip.compress, gzip.decompress))
+register_codec(Codec("zlib", ".deflate", _zlib_raw_compress, _zlib_raw_decompress))
+register_codec(Codec("lzma", ".xz", lzma.compress, lzma.decompress))
+register_codec(Codec("bz2", ".bz2", bz2.compress, bz2.decompress))
+
+try:
+    import zstandard as _zstd  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    _zstd = None  # type: ignore
+else:  # pragma: no cover - depends on optional package
+    def _zstd_compress(data: bytes) -> bytes:
+        return _zstd.ZstdCompressor().compress(data)
+
+    def _zstd_decompress(data: bytes) -> bytes:
+        return _zstd.ZstdDecompressor().decompress(data)
+
+    register_codec(Codec("zstd", ".zst", _zstd_compress, _zstd_decompress))
+
+try:
+    import lz4.frame as _lz4  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    _lz4 = None  # type: ignore
+else:  # pragma: no cover - depends on optional package
+    register_codec(Codec("lz4", ".lz4", _lz4.compress, _lz4.decompress))
@@ -0,0 +1,373 @@
+"""Persisted sample manifest that replaces glob-based discovery.
+
+Listing and sorting a directory with millions of samples on a network
+filesystem can take minutes, and a real training job pays that cost
+before its first batch. A manifest records the matching file names with
+their size and mtime, plus the directory mtime at the time of the scan.
+
+On later runs :func:`discover` compares the directory mtime with the
+recorded one. If it is unchanged the manifest is used as-is, with no
+listing at all. If it changed (files were added, removed or renamed)
+the directory is listed again and only new names are stat'ed. If the
+manifest is missing, corrupt or was written for another pattern, a full
+scan is done. The manifest is then rewritten.
+
+Directory mtimes are only trusted when they are older than the scan by
+more than the filesystem timestamp granularity; a directory modified
+during the scan is recorded as "racy" so the next run relists it (the
+same trick git uses for its index).
+
+The file is line-delimited, tab-separated text::
+
+    # benchmarks-ai-io manifest v1
+    pattern <TAB> *.bin
+    dir_mtime_ns <TAB> 1700000000000000000
+    sample_000000.bin <TAB> 524288 <TAB> 1700000000000000000
+    ...
+    # end 1000
+"""
+
+import fnmatch
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+MANIFEST_NAME = ".samples.manifest"
+
+_HEADER = "# benchmarks-ai-io manifest v1"
+_RACY_NS = 2_000_000_000  # coarse mtime granularity (e.g. FAT, some NFS)
+
+
+@dataclass
+class ManifestEntry:
+    name: str  # relative to the dataset root
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class DiscoveryReport:
+    source: str  # "manifest" | "refresh" | "scan" | "glob"
+    files: int
+    added: int
+    removed: int
+    duration_sec: float
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "source": self.source,
+            "files": self.files,
+            "added": self.added,
+            "removed": self.removed,
+            "discovery_sec": round(self.duration_sec, 6),
+        }
+
+
+def manifest_path_for(root: str, manifest_path: str = "") -> str:
+    """Default manifest location: a dotfile inside *root*."""
+    return manifest_path or os.path.join(root, MANIFEST_NAME)
+
+
+def _stat_entry(root: str, name: str) -> Optional[ManifestEntry]:
+    try:
+        st = os.stat(os.path.join(root, name))
+    except FileNotFoundError:  # removed between listing and stat
+        return None
+    return ManifestEntry(name, st.st_size, st.st_mtime_ns)
+
+
+def _list_names(root: str, pattern: str) -> List[str]:
+    with os.scandir(root) as it:
+        return [e.name for e in it
+                if not e.name.startswith(".") and fnmatch.fnmatch(e.name, pattern)]
+
+
+def scan(root: str, pattern: str) -> List[ManifestEntry]:
+    """List and stat every file in *root* matching *pattern*, sorted."""
+    if not os.path.isdir(root):
+        return []
+    entries = [_stat_entry(root, n) for n in _list_names(root, pattern)]
+    return sorted((e for e in entries if e is not None), key=lambda e: e.name)
+
+
+def load_manifest(path: str) -> Optional[Tuple[str, int, List[ManifestEntry]]]:
+    """Return ``(pattern, dir_mtime_ns, entries)`` or None if unusable."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = fh.read().split("\n")
+    except (FileNotFoundError, IsADirectoryError, UnicodeDecodeError):
+        return None
+    try:
+        if lines[0] != _HEADER:
+            return None
+        key, pattern = lines[1].split("\t")
+        key2, dir_mtime = lines[2].split("\t")
+        if (key, key2) != ("pattern", "dir_mtime_ns"):
+            return None
+        entries: List[ManifestEntry] = []
+        for line in lines[3:]:
+            if line.startswith("# end "):
+                # A missing or mismatched trailer means a torn write.
+                if int(line[len("# end "):]) != len(entries):
+                    return None
+                return pattern, int(dir_mtime), entries
+            name, size, mtime = line.split("\t")
+            entries.append(ManifestEntry(name, int(size), int(mtime)))
+    except (IndexError, ValueError):
+        return None
+    return None
+
+
+def write_manifest(path: str, pattern: str, dir_mtime_ns: int,
+                   entries: List[ManifestEntry]) -> None:
+    """Write *entries* to *path*.
+
+    The file is rewritten in place rather than renamed into place, so that
+    updating a manifest stored inside the dataset directory does not itself
+    change that directory's mtime. The ``# end`` trailer detects torn writes.
+    """
+    lines = [_HEADER, f"pattern\t{pattern}", f"dir_mtime_ns\t{dir_mtime_ns}"]
+    lines.extend(f"{e.name}\t{e.size}\t{e.mtime_ns}" for e in entries)
+    lines.append(f"# end {len(entries)}")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def _try_write(path: str, pattern: str, dir_mtime_ns: int,
+               entries: List[ManifestEntry]) -> None:
+    # A read-only dataset can still be discovered, just not cached.
+    try:
+        write_manifest(path, pattern, dir_mtime_ns, entries)
+    except OSError:
+        pass
+
+
+def _trusted_mtime(root: str, scan_start_ns: int) -> int:
+    mtime = os.stat(root).st_mtime_ns
+    return 0 if mtime >= scan_start_ns - _RACY_NS else mtime
+
+
+def build_manifest(root: str, pattern: str,
+                   manifest_path: str = "") -> List[ManifestEntry]:
+    """Scan *root* and (re)write its manifest; returns the entries."""
+    path = manifest_path_for(root, manifest_path)
+    try:
+        # Create the file first so its creation is not a later directory change.
+        open(path, "a").close()
+    except OSError:
+        pass
+    start_ns = time.time_ns()
+    entries = scan(root, pattern)
+    _try_write(path, pattern, _trusted_mtime(root, start_ns), entries)
+    return entries
+
+
+def discover(root: str, pattern: str, use_manifest: bool = True,
+             manifest_path: str = "") -> Tuple[List[str], DiscoveryReport]:
+    """Return sorted sample paths under *root* and how they were found."""
+    start = time.perf_counter()
+    if not os.path.isdir(root):
+        return [], DiscoveryReport("glob", 0, 0, 0, time.perf_counter() - start)
+    if not use_manifest:
+        names = sorted(_list_names(root, pattern))
+        return ([os.path.join(root, n) for n in names],
+                DiscoveryReport("glob", len(names), 0, 0,
+                                time.perf_counter() - start))
+
+    path = manifest_path_for(root, manifest_path)
+    loaded = load_manifest(path)
+    if loaded is not None and loaded[0] == pattern:
+        _, dir_mtime, entries = loaded
+        if dir_mtime and os.stat(root).st_mtime_ns == dir_mtime:
+            source, added, removed = "manifest", 0, 0
+        else:
+            start_ns = time.time_ns()
+            known = {e.name: e for e in entries}
+            names = _list_names(root, pattern)
+            fresh = [_stat_entry(root, n) for n in names if n not in known]
+            fresh = [e for e in fresh if e is not None]
+            current = set(names)
+            entries = sorted([e for e in entries if e.name in current] + fresh,
+                             key=lambda e: e.name)
+            source, added = "refresh", len(fresh)
+            removed = len(known) - (len(entries) - added)
+            _try_write(path, pattern, _trusted_mtime(root, start_ns), entries)
+    else:
+        entries = build_manifest(root, pattern, manifest_path)
+        source, added, removed = "scan", len(entries), 0
+
+    paths = [os.path.join(root, e.name) for e in entries]
+    return paths, DiscoveryReport(source, len(paths), added, removed,
+                                  time.perf_counter() - start)
+
+
+# --- directory trees ----------------------------------------------------
+#
+# A tree manifest records, for every directory under a root, its mtime and
+# inode and the names of its files and subdirectories. Refreshing costs one
+# stat per directory: a directory whose mtime and inode still match is taken
+# from the manifest, any other directory is rescanned. Adding, removing or
+# renaming an entry changes the parent directory's mtime, so changes are
+# found without listing unchanged directories. Racy mtimes are handled as
+# for sample manifests. Format::
+#
+#     # benchmarks-ai-io tree manifest v1
+#     D <TAB> relative/dir <TAB> mtime_ns <TAB> inode
+#     f <TAB> file name <TAB> file name ...
+#     d <TAB> subdirectory name ...
+#     ...
+#
+# Names are joined on one line per directory so loading costs a split per
+# directory rather than per file.
+#     # end <directories>
+
+# Appended to the root: the manifest sits next to the tree, not in it, so
+# listers that do not use it never count it as an entry.
+TREE_MANIFEST_SUFFIX = ".listing.manifest"
+
+_TREE_HEADER = "# benchmarks-ai-io tree manifest v1"
+
+
+@dataclass
+class DirRecord:
+    mtime_ns: int  # 0 = racy, always rescan
+    inode: int
+    files: List[str]
+    subdirs: List[str]
+
+
+@dataclass
+class TreeRefreshReport:
+    source: str  # "manifest" | "refresh" | "scan"
+    dirs: int
+    files: int
+    rescanned: int   # directories listed again
+    stat_calls: int  # directory stats used for revalidation
+    duration_sec: float
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "source": self.source,
+            "dirs": self.dirs,
+            "files": self.files,
+            "rescanned_dirs": self.rescanned,
+            "stat_calls": self.stat_calls,
+            "discovery_sec": round(self.duration_sec, 6),
+        }
+
+
+def tree_manifest_path_for(root: str, manifest_path: str = "") -> str:
+    return manifest_path or root.rstrip(os.sep) + TREE_MANIFEST_SUFFIX
+
+
+def _scan_dir(path: str, skip: str) -> Tuple[List[str], List[str]]:
+    files: List[str] = []
+    subdirs: List[str] = []
+    with os.scandir(path) as it:
+        for e in it:
+            if e.path == skip:
+                continue
+            if e.is_file(follow_symlinks=False):
+                files.append(e.name)
+            elif e.is_dir(follow_symlinks=False):
+                subdirs.append(e.name)
+    return sorted(files), sorted(subdirs)
+
+
+def load_tree_manifest(path: str) -> Optional[Dict[str, DirRecord]]:
+    """Return ``{relative_dir: DirRecord}`` or None if unusable."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = fh.read().split("\n")
+    except (FileNotFoundError, IsADirectoryError, UnicodeDecodeError):
+        return None
+    if not lines or lines[0] != _TREE_HEADER:
+        return None
+    dirs: Dict[str, DirRecord] = {}
+    try:
+        for i in range(1, len(lines), 3):
+            if lines[i].startswith("# end "):
+                if int(lines[i][len("# end "):]) != len(dirs):
+                    return None
+                return dirs
+            kind, rel, mtime, inode = lines[i].split("\t")
+            files, subdirs = lines[i + 1].split("\t"), lines[i + 2].split("\t")
+            if (kind, files[0], subdirs[0]) != ("D", "f", "d"):
+                return None
+            dirs[rel] = DirRecord(int(mtime), int(inode), files[1:], subdirs[1:])
+    except (IndexError, ValueError):
+        return None
+    return None
+
+
+def write_tree_manifest(path: str, dirs: Dict[str, DirRecord]) -> None:
+    """Write *dirs* to *path*, in place (see :func:`write_manifest`)."""
+    lines = [_TREE_HEADER]
+    for rel, d in dirs.items():
+        lines.append(f"D\t{rel}\t{d.mtime_ns}\t{d.inode}")
+        lines.append("\t".join(["f"] + d.files))
+        lines.append("\t".join(["d"] + d.subdirs))
+    lines.append(f"# end {len(dirs)}")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def refresh_tree(root: str, manifest_path: str = "", use_manifest: bool = True,
+                 racy_ns: int = _RACY_NS
+                 ) -> Tuple[Dict[str, DirRecord], TreeRefreshReport]:
+    """Return ``{relative_dir: DirRecord}`` for *root* and update its manifest.
+
+    With *use_manifest* False, or without a usable manifest, every
+    directory is scanned. Unreadable or vanished directories are skipped.
+    """
+    start = time.perf_counter()
+    path = tree_manifest_path_for(root, manifest_path)
+    old = load_tree_manifest(path) if use_manifest else None
+    if use_manifest:
+        try:
+            # Create the file first so its creation is not a later change.
+            open(path, "a").close()
+        except OSError:
+            pass
+    start_ns = time.time_ns()
+    dirs: Dict[str, DirRecord] = {}
+    rescanned = stat_calls = 0
+    pending = [""]
+    while pending:
+        rel = pending.pop()
+        full = os.path.join(root, rel) if rel else root
+        try:
+            st = os.stat(full)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        stat_calls += 1
+        known = old.get(rel) if old else None
+        if (known is not None and known.mtime_ns
+                and known.mtime_ns == st.st_mtime_ns
+                and known.inode == st.st_ino):
+            entry = known
+        else:
+            try:
+                files, subdirs = _scan_dir(full, path)
+            except (FileNotFoundError, PermissionError):
+                continue
+            rescanned += 1
+            mtime = st.st_mtime_ns
+            entry = DirRecord(0 if mtime >= start_ns - racy_ns else mtime,
+                             st.st_ino, files, subdirs)
+        dirs[rel] = entry
+        pending.extend(os.path.join(rel, s) if rel else s
+                       for s in reversed(entry.subdirs))
+    if use_manifest:
+        try:
+            write_tree_manifest(path, dirs)
+        except OSError:
+            pass
+    if old is None:
+        source = "scan"
+    else:
+        source = "refresh" if rescanned else "manifest"
+    return dirs, TreeRefreshReport(
+        source, len(dirs), sum(len(d.files) for d in dirs.values()),
+        rescanned, stat_calls, time.perf_counter() - start)
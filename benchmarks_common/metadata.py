@@ -6,6 +6,8 @@ import socket as _socket
 from dataclasses import asdict, dataclass, field
 from typing import Any, Dict
 
+from .sysinfo import numa_topology
+
 
 @dataclass
 class RunMetadata:
@@ -15,6 +17,7 @@ class RunMetadata:
     host: Dict[str, str] = field(default_factory=dict)
     parameters: Dict[str, Any] = field(default_factory=dict)
     summary: Dict[str, Any] = field(default_factory=dict)
+    topology: Dict[str, Any] = field(default_factory=dict)  # CPUs / NUMA nodes
 
     def __post_init__(self) -> None:
         if not self.timestamp_utc:
@@ -28,6 +31,8 @@ class RunMetadata:
                 "platform": _platform.platform(),
                 "python_version": _platform.python_version(),
             }
+        if not self.topology:
+            self.topology = numa_topology()
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
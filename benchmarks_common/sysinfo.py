@@ -0,0 +1,180 @@
+"""Process-level counters and host topology that benchmarks record."""
+
+import multiprocessing as mp
+import os
+import queue
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import resource
+except ModuleNotFoundError:  # pragma: no cover - Windows
+    resource = None  # type: ignore
+
+NODE_ROOT = "/sys/devices/system/node"
+
+
+def page_faults() -> Tuple[int, int]:
+    """Return this process's cumulative ``(major, minor)`` page faults.
+
+    Major faults needed I/O to bring a page in; minor faults were served
+    from the page cache. Returns ``(0, 0)`` where ``resource`` is missing.
+    """
+    if resource is None:
+        return 0, 0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_majflt, usage.ru_minflt
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB (0.0 where unknown).
+
+    Prefers ``VmHWM`` from ``/proc/self/status``, which starts afresh on
+    exec; ``ru_maxrss`` carries over the parent's RSS into spawned
+    children. ``ru_maxrss`` is in KiB on Linux and in bytes on macOS.
+    """
+    for line in _read("/proc/self/status").splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_isolated(target: Callable[..., None], args: tuple,
+                 label: str) -> Any:
+    """Run ``target(*args, out)`` in a fresh spawned process.
+
+    *target* puts one result on the ``out`` queue, which is returned. A
+    spawned child starts from a clean interpreter, so its
+    :func:`peak_rss_mb` is its own. Raises ``RuntimeError`` naming *label*
+    if the child exits without a result.
+    """
+    ctx = mp.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=target, args=args + (out,))
+    proc.start()
+    try:
+        while True:
+            try:
+                return out.get(timeout=1.0)
+            except queue.Empty:
+                if not proc.is_alive():
+                    raise RuntimeError(
+                        f"{label} process exited with code {proc.exitcode}")
+    finally:
+        proc.join()
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Parse a kernel CPU list such as ``"0-3,8,10-11"``."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    return sorted(set(cpus))
+
+
+def format_cpu_list(cpus: Iterable[int]) -> str:
+    """Inverse of :func:`parse_cpu_list`: ``[0, 1, 2, 5]`` -> ``"0-2,5"``."""
+    ranges: List[str] = []
+    run: List[int] = []
+    for cpu in sorted(set(cpus)):
+        if run and cpu != run[-1] + 1:
+            ranges.append(_format_run(run))
+            run = []
+        run.append(cpu)
+    if run:
+        ranges.append(_format_run(run))
+    return ",".join(ranges)
+
+
+def _format_run(run: List[int]) -> str:
+    return str(run[0]) if len(run) == 1 else f"{run[0]}-{run[-1]}"
+
+
+def allowed_cpus() -> List[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def numa_nodes(node_root: str = NODE_ROOT) -> Dict[int, List[int]]:
+    """Map each online NUMA node to its CPUs; empty if sysfs is missing."""
+    nodes: Dict[int, List[int]] = {}
+    try:
+        names = os.listdir(node_root)
+    except OSError:
+        return nodes
+    for name in names:
+        if not (name.startswith("node") and name[4:].isdigit()):
+            continue
+        cpus = parse_cpu_list(_read(os.path.join(node_root, name, "cpulist")))
+        if cpus:
+            nodes[int(name[4:])] = cpus
+    return dict(sorted(nodes.items()))
+
+
+def numa_topology(node_root: str = NODE_ROOT) -> Dict[str, Any]:
+    """Describe NUMA nodes, their CPUs and memory for run metadata."""
+    nodes: Dict[int, Dict[str, Any]] = {}
+    for node, cpus in numa_nodes(node_root).items():
+        info: Dict[str, Any] = {"cpus": format_cpu_list(cpus)}
+        for line in _read(os.path.join(node_root, f"node{node}",
+                                       "meminfo")).splitlines():
+            # "Node 0 MemTotal:       65843896 kB"
+            fields = line.split()
+            if len(fields) >= 4 and fields[2] == "MemTotal:":
+                info["memory_mb"] = int(fields[3]) // 1024
+        distance = _read(os.path.join(node_root, f"node{node}", "distance"))
+        if distance:
+            info["distance"] = [int(d) for d in distance.split()]
+        nodes[node] = info
+    return {
+        "cpu_count": os.cpu_count() or 1,
+        "allowed_cpus": format_cpu_list(allowed_cpus()),
+        "numa_nodes": len(nodes),
+        "nodes": nodes,
+    }
+
+
+def path_numa_node(path: str) -> Optional[int]:
+    """NUMA node of the block device holding *path*, if the kernel reports it.
+
+    Walks from ``/sys/dev/block/<major>:<minor>`` up the device tree to the
+    first ``numa_node`` attribute (the NVMe controller's PCI device).
+    Returns ``None`` for network and virtual filesystems, unknown nodes
+    (``-1``) and non-Linux hosts.
+    """
+    try:
+        dev = os.stat(path).st_dev
+    except OSError:
+        return None
+    sys_dev = f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+    if not os.path.exists(sys_dev):
+        return None
+    current = os.path.realpath(sys_dev)
+    while current not in ("/", "/sys", "/sys/devices"):
+        value = _read(os.path.join(current, "device", "numa_node")) or \
+            _read(os.path.join(current, "numa_node"))
+        if value:
+            node = int(value)
+            return node if node >= 0 else None
+        current = os.path.dirname(current)
+    return None
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
+from benchmarks_common.affinity import make_plan, thread_initializer
 from benchmarks_common.stats import throughput_mb_s
 
 
@@ -26,6 +27,9 @@ class BenchmarkParams:
     read_buffer_kb: int
     cleanup_after: bool
     io_engine: str = "sync"  # sync | async
+    affinity: str = "os"  # os | cpus | spread | node (sync engine pools)
+    cpu_list: str = ""
+    numa_node: int = -1
 
 
 @dataclass
@@ -54,6 +58,8 @@ class CheckpointingBenchmark:
         self.root = Path(params.root)
         self.root.mkdir(parents=True, exist_ok=True)
         self._validate_mode()
+        self.affinity = make_plan(params.affinity, params.cpu_list,
+                                  params.numa_node, str(self.root))
 
     def _validate_mode(self) -> None:
         if self.params.mode not in {"write", "read", "write-read"}:
@@ -189,6 +195,11 @@ class CheckpointingBenchmark:
             for idx in range(self.params.shard_count)
         ]
 
+    def _pool(self) -> ThreadPoolExecutor:
+        initializer, initargs = thread_initializer(self.affinity)
+        return ThreadPoolExecutor(max_workers=self.params.concurrency,
+                                  initializer=initializer, initargs=initargs)
+
     def _run_write_phase(self, checkpoint_dir: Path,
                          iteration: int) -> Tuple[List[ShardRecord], IterationRecord]:
         shard_paths = self._shard_paths(checkpoint_dir)
@@ -197,7 +208,7 @@ class CheckpointingBenchmark:
         shard_records: List[ShardRecord] = []
 
         start = time.perf_counter()
-        with ThreadPoolExecutor(max_workers=self.params.concurrency) as pool:
+        with self._pool() as pool:
             futures = []
             for shard_id, path in enumerate(shard_paths):
                 futures.append(
@@ -240,7 +251,7 @@ class CheckpointingBenchmark:
         shard_records: List[ShardRecord] = []
 
         start = time.perf_counter()
-        with ThreadPoolExecutor(max_workers=self.params.concurrency) as pool:
+        with self._pool() as pool:
             futures = []
             for shard_id, path in enumerate(shard_paths):
                 futures.append(pool.submit(_read_shard, path, buffer_bytes))
@@ -2,6 +2,7 @@ import argparse
 import os
 from typing import Any, Dict, List
 
+from benchmarks_common.affinity import AFFINITY_MODES
 from benchmarks_common.cli import load_yaml_config, parse_bool
 from benchmarks_common.metadata import build_metadata
 from benchmarks_common.outputs import write_csv, write_yaml
@@ -29,6 +30,15 @@ def main() -> None:
     parser.add_argument("--io-engine", type=str, default="sync",
                         choices=["sync", "async"],
                         help="IO engine: sync (default) or async (aiofiles)")
+    parser.add_argument("--affinity", type=str, default="os",
+                        choices=list(AFFINITY_MODES),
+                        help="Pool thread placement: OS scheduler, CPU list, "
+                             "spread across NUMA nodes, or one node")
+    parser.add_argument("--cpu-list", type=str, default="",
+                        help="CPUs for --affinity cpus, e.g. 0-7,16")
+    parser.add_argument("--numa-node", type=int, default=-1,
+                        help="Node for --affinity node (-1 = node of the "
+                             "storage-root device)")
     parser.add_argument("--outdir", type=str, default="metrics")
     args = parser.parse_args()
 
@@ -55,6 +65,9 @@ def main() -> None:
                                      {}).get("cleanup_after", args.cleanup_after)
         args.io_engine = cfg.get("benchmark",
                                  {}).get("io_engine", args.io_engine)
+        args.affinity = cfg.get("affinity", {}).get("mode", args.affinity)
+        args.cpu_list = str(cfg.get("affinity", {}).get("cpus", args.cpu_list))
+        args.numa_node = cfg.get("affinity", {}).get("numa_node", args.numa_node)
         args.outdir = cfg.get("output", {}).get("dir", args.outdir)
 
     params = BenchmarkParams(
@@ -71,6 +84,9 @@ def main() -> None:
         read_buffer_kb=max(1, int(args.read_buffer_kb)),
         cleanup_after=parse_bool(args.cleanup_after),
         io_engine=str(args.io_engine),
+        affinity=str(args.affinity),
+        cpu_list=str(args.cpu_list or ""),
+        numa_node=int(args.numa_node),
     )
 
     benchmark = CheckpointingBenchmark(params)
@@ -89,6 +105,9 @@ def main() -> None:
     write_csv(iterations_path, iter_csv)
 
     summary = _build_summary(iteration_records, shard_records, params)
+    if params.affinity != "os":
+        summary["affinity"] = benchmark.affinity.describe(params.concurrency)
+        summary["affinity"]["applied"] = params.io_engine == "sync"
     write_yaml(summary_path, summary)
     write_yaml(meta_path, build_metadata(
         run_name=args.run_name,
@@ -106,6 +125,9 @@ def main() -> None:
             "read_buffer_kb": params.read_buffer_kb,
             "cleanup_after": params.cleanup_after,
             "io_engine": params.io_engine,
+            "affinity": params.affinity,
+            "cpu_list": params.cpu_list,
+            "numa_node": params.numa_node,
         },
         summary=summary,
     ))
@@ -0,0 +1,306 @@
+"""Runtime prefetch autotuner (tf.data AUTOTUNE-style).
+
+Instead of sweeping ``prefetch_depth`` and ``read_buffer_kb`` with one run
+per value, the ``autotune`` strategy starts conservatively (1 worker,
+queue depth 2, 64 KiB reads) and adjusts the settings live:
+
+- A consumer pulls samples from an elastic bounded queue fed by reader
+  threads. Every ``autotune_window`` samples it measures throughput and
+  the fraction of wall time it spent stalled waiting for data.
+- While the stall fraction is above ``autotune_stall_threshold`` the
+  tuner doubles one knob at a time (workers, queue depth, read size),
+  keeps the change if throughput improved by at least
+  ``autotune_min_gain`` and otherwise reverts it and marks that knob as
+  saturated.
+- Knob growth is capped by ``autotune_max_workers`` and by a memory
+  budget covering queued samples plus per-worker read buffers.
+
+The run converges when stalls drop below the threshold or every knob is
+saturated. Each window is logged as an :class:`AutotuneStep`.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from benchmarks_common.stats import throughput_mb_s
+
+from .cache import TieredCache
+from .loader import (EpochRecord, LoaderParams, SampleRecord, _codec_name,
+                     _read_cached, params_cache, require_samples)
+
+KNOBS = ("workers", "queue_depth", "read_buffer_kb")
+
+_START = {"workers": 1, "queue_depth": 2, "read_buffer_kb": 64}
+_MAX_READ_BUFFER_KB = 4096
+
+
+@dataclass
+class AutotuneStep:
+    window: int
+    epoch: int
+    samples_done: int
+    workers: int
+    queue_depth: int
+    read_buffer_kb: int
+    throughput_mb_s: float
+    stall_fraction: float
+    action: str  # e.g. "grow workers", "keep workers; grow queue_depth"
+    converged: bool = False  # the tuner had converged after this window
+
+
+class _ElasticQueue:
+    """FIFO whose capacity can change while producers are blocked on it.
+
+    :meth:`close` wakes blocked producers; ``put`` then returns False.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items: List[object] = []
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def set_capacity(self, capacity: int) -> None:
+        with self._cond:
+            self.capacity = capacity
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def put(self, item: object) -> bool:
+        with self._cond:
+            while len(self._items) >= self.capacity and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                return False
+            self._items.append(item)
+            self._cond.notify_all()
+            return True
+
+    def get(self) -> object:
+        with self._cond:
+            while not self._items:
+                self._cond.wait()
+            item = self._items.pop(0)
+            self._cond.notify_all()
+            return item
+
+
+class Autotuner:
+    """Hill-climbing controller over worker count, queue depth and read size."""
+
+    def __init__(self, params: LoaderParams, sample_bytes: int):
+        self.settings: Dict[str, int] = dict(_START)
+        self.max_workers = (params.autotune_max_workers
+                            or 4 * (os.cpu_count() or 1))
+        self.memory_budget = params.autotune_memory_mb * 1024 * 1024
+        self.sample_bytes = max(1, sample_bytes)
+        self.stall_threshold = params.autotune_stall_threshold
+        self.min_gain = params.autotune_min_gain
+        self.saturated = set()
+        self.best_tp = 0.0
+        self.converged = False
+        self._trial: Optional[tuple] = None  # (knob, previous value)
+        self._next_knob = 0
+
+    def memory_bytes(self, settings: Dict[str, int]) -> int:
+        """Bytes held by queued samples, in-flight samples and read buffers."""
+        in_flight = settings["queue_depth"] + settings["workers"]
+        return (in_flight * self.sample_bytes
+                + settings["workers"] * settings["read_buffer_kb"] * 1024)
+
+    def _grown(self, knob: str) -> Optional[int]:
+        value = self.settings[knob] * 2
+        limit = {"workers": self.max_workers,
+                 "read_buffer_kb": _MAX_READ_BUFFER_KB}.get(knob)
+        if limit is not None and value > limit:
+            return None
+        candidate = dict(self.settings, **{knob: value})
+        if self.memory_bytes(candidate) > self.memory_budget:
+            return None
+        return value
+
+    def observe(self, tp: float, stall: float) -> str:
+        """Feed one window's measurements; returns the action taken."""
+        action = "hold"
+        if self._trial is not None:
+            knob, previous = self._trial
+            self._trial = None
+            if tp >= self.best_tp * (1.0 + self.min_gain):
+                self.best_tp = tp
+                action = f"keep {knob}"
+            else:
+                self.settings[knob] = previous
+                self.saturated.add(knob)
+                return f"revert {knob}"
+        else:
+            self.best_tp = max(self.best_tp, tp)
+
+        if self.converged or stall <= self.stall_threshold:
+            self.converged = True
+            return action if action != "hold" else "converged"
+
+        for _ in range(len(KNOBS)):
+            knob = KNOBS[self._next_knob % len(KNOBS)]
+            self._next_knob += 1
+            if knob in self.saturated:
+                continue
+            grown = self._grown(knob)
+            if grown is None:
+                self.saturated.add(knob)
+                continue
+            self._trial = (knob, self.settings[knob])
+            self.settings[knob] = grown
+            grow = f"grow {knob}"
+            return grow if action == "hold" else f"{action}; {grow}"
+
+        self.converged = True
+        return "converged"
+
+
+def run_autotune(params: LoaderParams,
+                 cache: Optional[TieredCache] = None) -> tuple:
+    """Run the autotuned loader.
+
+    Returns ``(sample_records, epoch_records, autotune_steps, settings)``
+    where *settings* are the knob values the tuner ended with.
+    """
+    samples = require_samples(params)
+    if cache is None:
+        cache = params_cache(params)
+    codec = _codec_name(params)
+    tuner = Autotuner(params, os.path.getsize(samples[0]))
+    buf = _ElasticQueue(tuner.settings["queue_depth"])
+
+    work = [(epoch, idx, path)
+            for epoch in range(1, params.epochs + 1)
+            for idx, path in enumerate(samples)]
+    cursor = {"next": 0}
+    cursor_lock = threading.Lock()
+    gate = threading.Condition()
+    stop = threading.Event()
+
+    def _producer(slot: int) -> None:
+        while not stop.is_set():
+            with gate:
+                while slot >= tuner.settings["workers"] and not stop.is_set():
+                    gate.wait(timeout=0.1)
+            if stop.is_set():
+                return
+            with cursor_lock:
+                if cursor["next"] >= len(work):
+                    return
+                epoch, idx, path = work[cursor["next"]]
+                cursor["next"] += 1
+            try:
+                result = _read_cached(
+                    path, tuner.settings["read_buffer_kb"], codec, cache)
+            except Exception as exc:  # I/O or codec errors reach the consumer
+                buf.put(exc)
+                return
+            if not buf.put((epoch, idx, path) + result):
+                return
+
+    threads = [threading.Thread(target=_producer, args=(slot,), daemon=True)
+               for slot in range(tuner.max_workers)]
+    for t in threads:
+        t.start()
+
+    window = max(1, params.autotune_window)
+    records: List[SampleRecord] = []
+    epoch_records: List[EpochRecord] = []
+    steps: List[AutotuneStep] = []
+    epoch_start = win_start = time.perf_counter()
+    epoch_bytes = win_bytes = 0
+    epoch_ttfb = 0.0
+    epoch_count = 0
+    stall = 0.0
+    current_epoch = 1
+
+    try:
+        for done in range(1, len(work) + 1):
+            t0 = time.perf_counter()
+            item = buf.get()
+            if isinstance(item, Exception):
+                raise item
+            epoch, idx, path, nbytes, io_sec, decode_sec, tier = item
+            now = time.perf_counter()
+            stall += now - t0
+            if epoch_count == 0:
+                epoch_ttfb = now - epoch_start
+            dur = io_sec + decode_sec
+            records.append(SampleRecord(
+                epoch=epoch, sample_idx=idx, path=path,
+                bytes_read=nbytes, duration_sec=dur,
+                throughput_mb_s=throughput_mb_s(nbytes, dur),
+                io_sec=io_sec, decode_sec=decode_sec, tier=tier,
+            ))
+            epoch_bytes += nbytes
+            win_bytes += nbytes
+            epoch_count += 1
+
+            if done % window == 0 or done == len(work):
+                win_dur = max(now - win_start, 1e-9)
+                tp = throughput_mb_s(win_bytes, win_dur)
+                stall_frac = min(1.0, stall / win_dur)
+                snapshot = dict(tuner.settings)
+                action = tuner.observe(tp, stall_frac)
+                steps.append(AutotuneStep(
+                    window=len(steps) + 1, epoch=current_epoch,
+                    samples_done=done, throughput_mb_s=tp,
+                    stall_fraction=stall_frac, action=action,
+                    converged=tuner.converged, **snapshot,
+                ))
+                buf.set_capacity(tuner.settings["queue_depth"])
+                with gate:
+                    gate.notify_all()
+                win_start = time.perf_counter()
+                win_bytes = 0
+                stall = 0.0
+
+            if epoch_count == len(samples):
+                epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
+                epoch_records.append(EpochRecord(
+                    epoch=current_epoch, strategy="autotune",
+                    samples=epoch_count, total_bytes=epoch_bytes,
+                    duration_sec=epoch_dur,
+                    throughput_mb_s=throughput_mb_s(epoch_bytes, epoch_dur),
+                    ttfb_sec=epoch_ttfb,
+                ))
+                current_epoch += 1
+                epoch_start = time.perf_counter()
+                epoch_bytes = epoch_count = 0
+    finally:
+        stop.set()
+        buf.close()
+        with gate:
+            gate.notify_all()
+        for t in threads:
+            t.join(timeout=1.0)
+
+    return records, epoch_records, steps, dict(tuner.settings)
+
+
+def converged_settings(steps: List[AutotuneStep],
+                       settings: Dict[str, int]) -> Dict[str, object]:
+    """Summarize the tuner's final *settings* and whether it converged."""
+    if not steps:
+        return {"converged": False, "windows": 0}
+    # Not the "converged" action: the converging window may also keep a
+    # trial and be logged as "keep <knob>".
+    converged_at = next((s.window for s in steps if s.converged), None)
+    last = steps[-1]
+    return {
+        "converged": converged_at is not None,
+        "converged_at_window": converged_at,
+        "windows": len(steps),
+        "final_throughput_mb_s": round(last.throughput_mb_s, 2),
+        "final_stall_fraction": round(last.stall_fraction, 4),
+        **{k: settings[k] for k in KNOBS},
+    }
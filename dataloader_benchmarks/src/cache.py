@@ -0,0 +1,249 @@
+"""Local sample cache tiers between the read strategies and storage.
+
+Two optional tiers sit in front of ``data_root``:
+
+- memory: a byte-budgeted LRU of stored sample bytes,
+- disk: a local cache directory (emulating a gcsfuse / Alluxio file cache)
+  with LRU, LFU or FIFO eviction under a byte budget.
+
+Lookups go memory → disk → storage. A disk hit is promoted into memory; a
+storage miss fills both tiers. Cached bytes are the *stored* bytes, so
+compressed samples are still decoded on every read, as with a file cache.
+Each sample record carries the tier that served it, which is what the
+per-epoch hit-rate report is built from.
+"""
+
+import hashlib
+import heapq
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks_common.stats import percentile, safe_median
+
+TIERS = ("memory", "disk", "storage")
+POLICIES = ("lru", "lfu", "fifo")
+
+_SUFFIX = ".cache"
+
+# LFU heap entries allowed per indexed key before stale ones are dropped.
+_HEAP_SLACK = 2
+
+
+class MemoryLRU:
+    """Byte-budgeted in-memory LRU of ``path -> bytes``."""
+
+    def __init__(self, budget_bytes: int):
+        self.budget = budget_bytes
+        self.used = 0
+        self.evictions = 0
+        self._data: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._data.get(key)
+            if data is not None:
+                self._data.move_to_end(key)
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.budget:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.used -= len(old)
+            while self._data and self.used + len(data) > self.budget:
+                _, evicted = self._data.popitem(last=False)
+                self.used -= len(evicted)
+                self.evictions += 1
+            self._data[key] = data
+            self.used += len(data)
+
+
+class DiskCache:
+    """Byte-budgeted cache directory with LRU, LFU or FIFO eviction.
+
+    Any ``*.cache`` files left in *root* by an earlier run are removed on
+    start-up, since the index is kept in memory only.
+    """
+
+    def __init__(self, root: str, budget_bytes: int, policy: str = "lru"):
+        if policy not in POLICIES:
+            raise ValueError(
+                f"Unknown cache policy '{policy}'. "
+                f"Choose from: {', '.join(POLICIES)}")
+        self.root = root
+        self.budget = budget_bytes
+        self.policy = policy
+        self.used = 0
+        self.evictions = 0
+        # key -> [cache_path, size, hits]; insertion/recency order for LRU/FIFO
+        self._index: "OrderedDict[str, list]" = OrderedDict()
+        self._heap: List[Tuple[int, int, str]] = []  # LFU: (hits, seq, key)
+        self._seq = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        for name in os.listdir(root):
+            if name.endswith(_SUFFIX):
+                os.unlink(os.path.join(root, name))
+
+    def _cache_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.root, digest + _SUFFIX)
+
+    def _touch(self, key: str, entry: list) -> None:
+        entry[2] += 1
+        if self.policy == "lru":
+            self._index.move_to_end(key)
+        elif self.policy == "lfu":
+            self._push(key, entry[2])
+
+    def _push(self, key: str, hits: int) -> None:
+        # Every hit pushes a new entry and leaves the old one stale; rebuild
+        # from the live ones before the heap outgrows the index.
+        self._seq += 1
+        heapq.heappush(self._heap, (hits, self._seq, key))
+        if len(self._heap) > _HEAP_SLACK * len(self._index) + 16:
+            latest: Dict[str, Tuple[int, int, str]] = {}
+            for item in self._heap:
+                entry = self._index.get(item[2])
+                if entry is not None and entry[2] == item[0]:
+                    if item[2] not in latest or item[1] > latest[item[2]][1]:
+                        latest[item[2]] = item
+            self._heap = list(latest.values())
+            heapq.heapify(self._heap)
+
+    def _victim(self) -> str:
+        if self.policy != "lfu":
+            return next(iter(self._index))
+        while True:
+            hits, _, key = heapq.heappop(self._heap)
+            entry = self._index.get(key)
+            if entry is not None and entry[2] == hits:
+                return key
+
+    def get(self, key: str, buffer_kb: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            self._touch(key, entry)
+            cache_path = entry[0]
+        try:
+            chunks = []
+            with open(cache_path, "rb") as f:
+                while True:
+                    chunk = f.read(buffer_kb * 1024)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+            return b"".join(chunks)
+        except FileNotFoundError:  # evicted concurrently
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.budget:
+            return
+        cache_path = self._cache_path(key)
+        tmp = os.path.join(self.root, f".tmp-{uuid.uuid4()}")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, cache_path)
+        doomed = []
+        with self._lock:
+            if key in self._index:
+                self.used -= self._index.pop(key)[1]
+            while self._index and self.used + len(data) > self.budget:
+                victim = self._victim()
+                path, size, _ = self._index.pop(victim)
+                self.used -= size
+                self.evictions += 1
+                doomed.append(path)
+            self._index[key] = [cache_path, len(data), 0]
+            self.used += len(data)
+            if self.policy == "lfu":
+                self._push(key, 0)
+        for path in doomed:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class TieredCache:
+    """Memory LRU in front of a disk cache; either tier may be disabled."""
+
+    def __init__(self, memory: Optional[MemoryLRU] = None,
+                 disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str, buffer_kb: int) -> Tuple[Optional[bytes], str]:
+        """Return ``(data, tier)``; *data* is None on a miss."""
+        if self.memory is not None:
+            data = self.memory.get(key)
+            if data is not None:
+                return data, "memory"
+        if self.disk is not None:
+            data = self.disk.get(key, buffer_kb)
+            if data is not None:
+                if self.memory is not None:
+                    self.memory.put(key, data)
+                return data, "disk"
+        return None, "storage"
+
+    def put(self, key: str, data: bytes) -> None:
+        if self.disk is not None:
+            self.disk.put(key, data)
+        if self.memory is not None:
+            self.memory.put(key, data)
+
+    def evictions(self) -> Dict[str, int]:
+        return {
+            "memory": self.memory.evictions if self.memory else 0,
+            "disk": self.disk.evictions if self.disk else 0,
+        }
+
+
+def build_cache(memory_mb: float, cache_dir: str, disk_mb: float,
+                policy: str = "lru") -> Optional[TieredCache]:
+    """Build a :class:`TieredCache`, or None if both tiers are disabled."""
+    memory = MemoryLRU(int(memory_mb * 1024 * 1024)) if memory_mb > 0 else None
+    disk = (DiskCache(cache_dir, int(disk_mb * 1024 * 1024), policy)
+            if cache_dir and disk_mb > 0 else None)
+    if memory is None and disk is None:
+        return None
+    return TieredCache(memory, disk)
+
+
+def cache_epoch_stats(records: List[Any]) -> List[Dict[str, Any]]:
+    """Per-epoch hit rate, bytes per tier and hit/miss latency."""
+    by_epoch: Dict[int, List[Any]] = {}
+    for r in records:
+        by_epoch.setdefault(r.epoch, []).append(r)
+    rows = []
+    for epoch in sorted(by_epoch):
+        recs = by_epoch[epoch]
+        hits = [r.io_sec for r in recs if r.tier != "storage"]
+        misses = [r.io_sec for r in recs if r.tier == "storage"]
+        row: Dict[str, Any] = {
+            "epoch": epoch,
+            "samples": len(recs),
+            "hit_rate": round(len(hits) / max(1, len(recs)), 4),
+        }
+        for tier in TIERS:
+            tier_recs = [r for r in recs if r.tier == tier]
+            row[f"{tier}_samples"] = len(tier_recs)
+            row[f"{tier}_bytes"] = sum(r.bytes_read for r in tier_recs)
+        row.update({
+            "hit_p50_sec": round(safe_median(hits), 6),
+            "hit_p95_sec": round(percentile(hits, 0.95), 6),
+            "miss_p50_sec": round(safe_median(misses), 6),
+            "miss_p95_sec": round(percentile(misses, 0.95), 6),
+        })
+        rows.append(row)
+    return rows
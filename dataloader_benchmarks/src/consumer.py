@@ -0,0 +1,143 @@
+"""Simulated training consumer for the per-epoch read strategies.
+
+A loader that reads as fast as it can says nothing about whether it would
+keep a model fed. :class:`TrainingConsumer` runs in its own thread and
+pulls batches of ``batch_size`` samples from a bounded queue of
+``consumer_prefetch`` batches, like ``DataLoader(prefetch_factor=...)``.
+For each batch it waits for data, then "computes" for a per-step time
+drawn from ``compute_dist``. Compute is a sleep, which, like a GPU step,
+does not hold the GIL.
+
+The strategy feeds the queue as samples complete, so a consumer that
+falls behind blocks the readers, and slow readers stall the consumer:
+
+- data-stall % is time blocked on input divided by total step time,
+- steady-state step time is the median step, excluding each epoch's first,
+- the zero-stall throughput is the mean batch size over the mean compute
+  time, i.e. the storage bandwidth that would hide all I/O.
+"""
+
+import math
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from benchmarks_common.stats import safe_mean, safe_median, throughput_mb_s
+
+from .loader import LoaderParams, SampleRecord
+
+COMPUTE_DISTRIBUTIONS = ("fixed", "normal", "lognormal")
+
+_DONE = object()
+
+
+@dataclass
+class StepRecord:
+    epoch: int
+    step: int
+    samples: int
+    batch_bytes: int
+    wait_sec: float     # blocked waiting for the batch (data stall)
+    compute_sec: float  # simulated compute
+    step_sec: float
+
+
+class TrainingConsumer:
+    """Consumes batches from a strategy and simulates compute per step."""
+
+    def __init__(self, params: LoaderParams):
+        if params.compute_dist not in COMPUTE_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown compute distribution '{params.compute_dist}'. "
+                f"Choose from: {', '.join(COMPUTE_DISTRIBUTIONS)}")
+        self.params = params
+        self.steps: List[StepRecord] = []
+        self._rng = random.Random(params.shuffle_seed)
+        self._queue: "queue.Queue" = queue.Queue(
+            maxsize=max(1, params.consumer_prefetch))
+        self._pending: List[SampleRecord] = []
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="training-consumer")
+        self._thread.start()
+
+    def compute_time(self) -> float:
+        """Draw one step's compute time in seconds."""
+        mean = self.params.compute_ms / 1000.0
+        cv = max(0.0, self.params.compute_jitter)
+        if self.params.compute_dist == "normal":
+            return max(0.0, self._rng.gauss(mean, mean * cv))
+        if self.params.compute_dist == "lognormal" and mean > 0 and cv > 0:
+            sigma = math.sqrt(math.log(1 + cv ** 2))
+            return self._rng.lognormvariate(math.log(mean) - sigma ** 2 / 2,
+                                            sigma)
+        return mean
+
+    def offer(self, record: SampleRecord) -> None:
+        """Add a completed sample; blocks while the batch queue is full."""
+        self._pending.append(record)
+        if len(self._pending) >= self.params.batch_size:
+            self._queue.put(self._pending)
+            self._pending = []
+
+    def end_epoch(self) -> None:
+        """Hand over the epoch's final partial batch."""
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending = []
+
+    def finish(self) -> List[StepRecord]:
+        """Drain the queue, stop the consumer and return its steps."""
+        self.end_epoch()
+        self._queue.put(_DONE)
+        self._thread.join()
+        return self.steps
+
+    def _run(self) -> None:
+        step = 0
+        while True:
+            t0 = time.perf_counter()
+            batch = self._queue.get()
+            if batch is _DONE:
+                return
+            wait = time.perf_counter() - t0
+            compute = self.compute_time()
+            if compute > 0:
+                time.sleep(compute)
+            step += 1
+            self.steps.append(StepRecord(
+                epoch=batch[0].epoch, step=step, samples=len(batch),
+                batch_bytes=sum(r.bytes_read for r in batch),
+                wait_sec=wait, compute_sec=compute,
+                step_sec=time.perf_counter() - t0,
+            ))
+
+
+def consumer_summary(steps: List[StepRecord],
+                     params: LoaderParams) -> Dict[str, Any]:
+    """Data-stall %, steady-state step time and zero-stall throughput."""
+    total = sum(s.step_sec for s in steps)
+    waits = sum(s.wait_sec for s in steps)
+    first_of_epoch = {}
+    for s in steps:
+        first_of_epoch.setdefault(s.epoch, s.step)
+    steady = [s.step_sec for s in steps if first_of_epoch[s.epoch] != s.step]
+    mean_compute = safe_mean([s.compute_sec for s in steps])
+    mean_batch = safe_mean([s.batch_bytes for s in steps])
+    required: Optional[float] = (throughput_mb_s(mean_batch, mean_compute)
+                                 if mean_compute > 0 else None)
+    return {
+        "compute_ms": params.compute_ms,
+        "compute_dist": params.compute_dist,
+        "steps": len(steps),
+        "data_stall_pct": round(100.0 * waits / max(total, 1e-9), 2),
+        "steady_state_step_sec": round(
+            safe_median(steady or [s.step_sec for s in steps]), 6),
+        "mean_wait_sec": round(safe_mean([s.wait_sec for s in steps]), 6),
+        "mean_compute_sec": round(mean_compute, 6),
+        "mean_batch_bytes": int(mean_batch),
+        "zero_stall_throughput_mb_s": (round(required, 2)
+                                       if required is not None else "inf"),
+    }
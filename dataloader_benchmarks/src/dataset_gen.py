@@ -1,14 +1,45 @@
 """Generate synthetic datasets for the data-loader benchmark.
 
-Creates binary files of configurable size with optional gzip compression
-to simulate realistic AI training data samples.
+Creates binary files of configurable size distribution and entropy with
+optional compression (any codec from :mod:`benchmarks_common.compression`)
+to simulate realistic AI training data samples. Generation runs in a
+process pool and is deterministic per seed regardless of worker count;
+see :mod:`benchmarks_common.datagen`.
 """
 
-import gzip
-import os
-import pathlib
-import random
 import argparse
+from typing import Optional
+
+from benchmarks_common.compression import available_codecs
+from benchmarks_common.datagen import (SIZE_DISTRIBUTIONS, GenerationReport,
+                                       SizeSpec, generate_samples,
+                                       make_payload, size_spec)
+
+__all__ = ["generate_dataset", "generate_dataset_report", "make_payload",
+           "size_spec"]
+
+
+def generate_dataset_report(
+    root: str,
+    count: int,
+    size_kb: int,
+    compress: bool = False,
+    seed: int = 42,
+    codec: str = "gzip",
+    entropy: float = 1.0,
+    workers: int = 1,
+    sizes: Optional[SizeSpec] = None,
+    resume: bool = False,
+) -> GenerationReport:
+    """Create *count* sample files under *root* and report timing.
+
+    *sizes* overrides the fixed ``size_kb`` with a size distribution.
+    """
+    return generate_samples(
+        root, count, sizes or SizeSpec(size_kb=size_kb), seed=seed,
+        codec=codec if compress else None, entropy=entropy,
+        workers=workers, resume=resume,
+    )
 
 
 def generate_dataset(
@@ -17,30 +48,19 @@ def generate_dataset(
     size_kb: int,
     compress: bool = False,
     seed: int = 42,
+    codec: str = "gzip",
+    entropy: float = 1.0,
+    workers: int = 1,
+    sizes: Optional[SizeSpec] = None,
+    resume: bool = False,
 ) -> str:
     """Create *count* sample files under *root*.
 
     Returns the absolute path to *root*.
     """
-    random.seed(seed)
-    pathlib.Path(root).mkdir(parents=True, exist_ok=True)
-    ext = ".bin.gz" if compress else ".bin"
-
-    # Pre-allocate a chunk for efficient writing
-    chunk_size = min(size_kb * 1024, 1024 * 1024)
-    chunk = os.urandom(chunk_size)
-
-    for i in range(count):
-        path = os.path.join(root, f"sample_{i:06d}{ext}")
-        remaining = size_kb * 1024
-        opener = gzip.open if compress else open
-        with opener(path, "wb") as f:
-            while remaining > 0:
-                to_write = chunk if remaining >= len(chunk) else chunk[:remaining]
-                f.write(to_write)
-                remaining -= len(to_write)
-
-    return os.path.abspath(root)
+    return generate_dataset_report(
+        root, count, size_kb, compress, seed, codec, entropy,
+        workers, sizes, resume).root
 
 
 def main():
@@ -48,16 +68,40 @@ def main():
         description="Generate synthetic dataset for data-loader benchmark")
     parser.add_argument("--out", type=str, default="./data/dataloader")
     parser.add_argument("--count", type=int, default=1000)
-    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--size-kb", type=float, default=512,
+                        help="Sample size (fixed) or mean size (lognormal)")
+    parser.add_argument("--size-dist", type=str, default="fixed",
+                        choices=list(SIZE_DISTRIBUTIONS))
+    parser.add_argument("--size-min-kb", type=float, default=0)
+    parser.add_argument("--size-max-kb", type=float, default=0)
+    parser.add_argument("--size-sigma", type=float, default=0.5,
+                        help="Shape parameter for lognormal sizes")
+    parser.add_argument("--size-csv", type=str, default=None,
+                        help="CSV of sizes in bytes for --size-dist empirical")
     parser.add_argument("--compress", action="store_true",
-                        help="Gzip-compress each sample")
+                        help="Compress each sample with --codec")
+    parser.add_argument("--codec", type=str, default="gzip",
+                        choices=available_codecs())
+    parser.add_argument("--entropy", type=float, default=1.0,
+                        help="Fraction of random bytes per block (0..1)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Generator processes")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip samples that already exist")
     parser.add_argument("--seed", type=int, default=42)
     args = parser.parse_args()
 
-    path = generate_dataset(args.out, args.count, args.size_kb,
-                            args.compress, args.seed)
-    comp = " (gzip)" if args.compress else ""
-    print(f"Generated {args.count} × {args.size_kb} KiB{comp} samples in {path}")
+    sizes = size_spec(args.size_kb, args.size_dist, args.size_min_kb,
+                      args.size_max_kb, args.size_sigma, args.size_csv)
+    report = generate_dataset_report(
+        args.out, args.count, args.size_kb, args.compress, args.seed,
+        codec=args.codec, entropy=args.entropy, workers=args.workers,
+        sizes=sizes, resume=args.resume)
+    comp = f" ({args.codec})" if args.compress else ""
+    print(f"Generated {report.generated} {args.size_dist}-size samples{comp} "
+          f"(entropy {args.entropy}, {report.skipped} skipped) in "
+          f"{report.root} with {report.workers} workers in "
+          f"{report.duration_sec:.2f}s")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+"""Multi-rank dataloader runs with a DistributedSampler-style partition.
+
+:func:`run_distributed` starts ``world_size`` loader processes on this
+node. Each epoch:
+
+1. every rank reshuffles the full index list with ``seed + epoch`` (so all
+   ranks agree on the permutation) and keeps every ``world_size``-th
+   index starting at its rank, like ``torch.utils.data.DistributedSampler``;
+2. ranks wait on a shared barrier so they start reading together;
+3. each rank reads its shard with the selected read strategy.
+
+Per-rank records are merged in the parent. Aggregate throughput uses the
+span from the earliest rank start to the latest rank end. Skew is the
+slowest rank's duration divided by the fastest rank's. Straggler time is
+how long the fastest rank idles at the next barrier. A single process
+cannot show contention between ranks on one node; this can.
+
+With ``affinity`` set, each rank pins itself per the
+:class:`~benchmarks_common.affinity.AffinityPlan` before reading, and
+throughput is also reported per NUMA node.
+"""
+
+import dataclasses
+import math
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+from benchmarks_common.affinity import pin_current, throughput_by_node
+from benchmarks_common.stats import safe_mean, throughput_mb_s
+
+from .loader import (READ_STRATEGIES, EpochRecord, LoaderParams,
+                     PackedMapping, SampleRecord, pack_samples,
+                     params_affinity, params_cache, require_samples,
+                     run_epoch_with_faults, strategy_function)
+
+_BARRIER_TIMEOUT_SEC = 600.0
+
+
+class DistributedSampler:
+    """Deterministic per-epoch partition of ``num_samples`` indices.
+
+    Mirrors ``torch.utils.data.DistributedSampler``: without ``drop_last``
+    the permutation is padded by wrapping around so every rank gets the
+    same number of indices.
+    """
+
+    def __init__(self, num_samples: int, num_replicas: int, rank: int,
+                 shuffle: bool = True, seed: int = 0,
+                 drop_last: bool = False):
+        if not 0 <= rank < num_replicas:
+            raise ValueError(
+                f"Invalid rank {rank} for num_replicas={num_replicas}")
+        self.num_samples = num_samples
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_last = drop_last
+        self.epoch = 0
+        if drop_last:
+            self.per_rank = num_samples // num_replicas
+        else:
+            self.per_rank = math.ceil(num_samples / num_replicas)
+        self.total_size = self.per_rank * num_replicas
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def indices(self) -> List[int]:
+        order = list(range(self.num_samples))
+        if self.shuffle:
+            random.Random(self.seed + self.epoch).shuffle(order)
+        if self.drop_last:
+            order = order[:self.total_size]
+        elif order:
+            while len(order) < self.total_size:
+                order += order[:self.total_size - len(order)]
+        return order[self.rank:self.total_size:self.num_replicas]
+
+    def __iter__(self):
+        return iter(self.indices())
+
+    def __len__(self) -> int:
+        return self.per_rank
+
+
+@dataclass
+class RankEpochRecord:
+    epoch: int
+    rank: int
+    samples: int
+    total_bytes: int
+    start_ts: float  # wall clock, comparable across ranks
+    end_ts: float
+    duration_sec: float
+    throughput_mb_s: float
+    ttfb_sec: float
+    node: int = -1  # NUMA node the rank was pinned to (-1 = unpinned)
+
+
+def _rank_main(rank: int, world_size: int, params: LoaderParams,
+               samples: List[str], barrier: Any, out: Any) -> None:
+    mapping = None
+    try:
+        strategy_fn = strategy_function(params.strategy)
+        plan = params_affinity(params)
+        pin_current(plan.cpus_for(rank))
+        node = plan.node_for(rank)
+        if params.cache_dir:
+            # Ranks must not share (and wipe) one cache directory.
+            params = dataclasses.replace(
+                params, cache_dir=os.path.join(params.cache_dir, f"rank{rank}"))
+        cache = params_cache(params)
+        sampler = DistributedSampler(
+            len(samples), world_size, rank,
+            shuffle=params.shuffle_seed is not None,
+            seed=params.shuffle_seed or 0)
+        # Every rank maps the whole packed dataset (packed by the parent)
+        # and reads its shard of each epoch as slices of it.
+        extra: Dict[str, Any] = {}
+        if params.strategy == "mmap" and params.mmap_packed:
+            mapping = extra["mapping"] = PackedMapping(samples, params)
+        sample_records: List[SampleRecord] = []
+        rank_records: List[RankEpochRecord] = []
+        for epoch in range(1, params.epochs + 1):
+            sampler.set_epoch(epoch)
+            shard = [samples[i] for i in sampler]
+            barrier.wait(_BARRIER_TIMEOUT_SEC)
+            start = time.time()
+            records, epoch_rec = run_epoch_with_faults(
+                strategy_fn, shard, epoch, params, cache, **extra)
+            end = time.time()
+            for r in records:
+                r.rank = rank
+            sample_records.extend(records)
+            rank_records.append(RankEpochRecord(
+                epoch=epoch, rank=rank, samples=epoch_rec.samples,
+                total_bytes=epoch_rec.total_bytes, start_ts=start,
+                end_ts=end, duration_sec=max(end - start, 1e-9),
+                throughput_mb_s=epoch_rec.throughput_mb_s,
+                ttfb_sec=epoch_rec.ttfb_sec,
+                node=-1 if node is None else node,
+            ))
+        out.put(("ok", rank, sample_records, rank_records))
+    except BaseException as exc:  # report, and release peers at the barrier
+        barrier.abort()
+        out.put(("error", rank, repr(exc), None))
+    finally:
+        if mapping is not None:
+            mapping.close()
+
+
+def run_distributed(params: LoaderParams, world_size: int) -> tuple:
+    """Run *world_size* loader processes on this node.
+
+    Returns ``(sample_records, epoch_records, rank_records)`` where
+    *epoch_records* aggregate all ranks per epoch.
+    """
+    if world_size < 1:
+        raise ValueError("world_size must be >= 1")
+    if params.strategy not in READ_STRATEGIES:
+        raise ValueError(
+            f"Strategy '{params.strategy}' does not support world_size > 1. "
+            f"Choose from: {', '.join(READ_STRATEGIES)}")
+    samples = require_samples(params)
+    if params.strategy == "mmap" and params.mmap_packed:
+        pack_samples(samples, params)  # once, before any rank starts
+    ctx = mp.get_context()
+    barrier = ctx.Barrier(world_size)
+    out = ctx.Queue()
+    procs = [
+        ctx.Process(target=_rank_main,
+                    args=(rank, world_size, params, samples, barrier, out),
+                    name=f"loader-rank{rank}")
+        for rank in range(world_size)
+    ]
+    for p in procs:
+        p.start()
+
+    results: Dict[int, tuple] = {}
+    errors: List[str] = []
+    try:
+        while len(results) + len(errors) < world_size:
+            try:
+                status, rank, payload, rank_records = out.get(timeout=1.0)
+            except queue.Empty:
+                if not any(p.is_alive() for p in procs):
+                    errors.append("a rank exited without reporting results")
+                    break
+                continue
+            if status == "ok":
+                results[rank] = (payload, rank_records)
+            else:
+                errors.append(f"rank {rank}: {payload}")
+    finally:
+        for p in procs:
+            p.join()
+    if errors:
+        raise RuntimeError("Distributed loader failed: " + "; ".join(errors))
+
+    sample_records: List[SampleRecord] = []
+    rank_records: List[RankEpochRecord] = []
+    for rank in sorted(results):
+        sample_records.extend(results[rank][0])
+        rank_records.extend(results[rank][1])
+    rank_records.sort(key=lambda r: (r.epoch, r.rank))
+    return sample_records, _aggregate_epochs(rank_records, params), rank_records
+
+
+def _aggregate_epochs(rank_records: List[RankEpochRecord],
+                      params: LoaderParams) -> List[EpochRecord]:
+    epochs: List[EpochRecord] = []
+    for epoch in sorted({r.epoch for r in rank_records}):
+        recs = [r for r in rank_records if r.epoch == epoch]
+        span = max(max(r.end_ts for r in recs) - min(r.start_ts for r in recs),
+                   1e-9)
+        total_bytes = sum(r.total_bytes for r in recs)
+        epochs.append(EpochRecord(
+            epoch=epoch, strategy=params.strategy,
+            samples=sum(r.samples for r in recs),
+            total_bytes=total_bytes, duration_sec=span,
+            throughput_mb_s=throughput_mb_s(total_bytes, span),
+            # A synchronous step needs a batch from every rank.
+            ttfb_sec=max(r.ttfb_sec for r in recs),
+        ))
+    return epochs
+
+
+def rank_summary(rank_records: List[RankEpochRecord],
+                 epoch_records: List[EpochRecord]) -> Dict[str, Any]:
+    """Aggregate throughput, per-rank skew and straggler time."""
+    skews: List[float] = []
+    stragglers: List[float] = []
+    for epoch in sorted({r.epoch for r in rank_records}):
+        recs = [r for r in rank_records if r.epoch == epoch]
+        durations = [r.duration_sec for r in recs]
+        skews.append(max(durations) / max(min(durations), 1e-9))
+        ends = [r.end_ts for r in recs]
+        stragglers.append(max(ends) - min(ends))
+    ranks = sorted({r.rank for r in rank_records})
+    per_rank_tp = {
+        rank: round(safe_mean([r.throughput_mb_s for r in rank_records
+                               if r.rank == rank]), 2)
+        for rank in ranks
+    }
+    return {
+        "world_size": len(ranks),
+        "aggregate_throughput_mb_s": round(
+            safe_mean([e.throughput_mb_s for e in epoch_records]), 2),
+        "per_rank_throughput_mb_s": per_rank_tp,
+        "throughput_by_node_mb_s": throughput_by_node(
+            [(None if r.node < 0 else r.node, r.throughput_mb_s)
+             for r in rank_records]),
+        "mean_skew": round(safe_mean(skews), 4),
+        "max_skew": round(max(skews), 4) if skews else 0.0,
+        "mean_straggler_sec": round(safe_mean(stragglers), 6),
+        "max_straggler_sec": round(max(stragglers), 6) if stragglers else 0.0,
+    }
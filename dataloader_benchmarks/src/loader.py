@@ -1,25 +1,41 @@
 """Core data-loading benchmark engine.
 
-Supports four read strategies that model real training data-pipeline patterns:
+Implements the per-epoch read strategies that model real training
+data-pipeline patterns:
 - sequential: Read files in order (baseline, sequential scan)
 - random: Shuffle files and read in random order (worst-case for HDDs / object stores)
-- mmap: Memory-mapped reads via mmap (zero-copy, OS page cache)
+- mmap: Memory-mapped reads via mmap (zero-copy page touches, madvise hints)
 - prefetch: Concurrent prefetching via ThreadPoolExecutor
+- decode_pool: I/O threads feeding a separate decode process pool
+
+Strategies with their own loops build on these helpers in sibling
+modules: pipeline, autotune, random_range, tokens and resume.
 
 Each strategy reports per-sample and per-epoch aggregate metrics.
 """
 
-import gzip
+import hashlib
+import json
 import mmap
+import multiprocessing as mp
 import os
 import random
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import List, Optional
-
+import zlib
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from benchmarks_common.affinity import (AffinityPlan, make_plan,
+                                       process_initializer, thread_initializer)
+from benchmarks_common.compression import get_codec
+from benchmarks_common.manifest import discover
 from benchmarks_common.stats import throughput_mb_s
+from benchmarks_common.sysinfo import page_faults
+
+from .cache import TieredCache, build_cache
 
 
 @dataclass
@@ -30,6 +46,10 @@ class SampleRecord:
     bytes_read: int
     duration_sec: float
     throughput_mb_s: float
+    io_sec: float = 0.0      # storage read time
+    decode_sec: float = 0.0  # decompression time (0 if uncompressed)
+    tier: str = "storage"    # memory | disk | storage (cache tier that served it)
+    rank: int = 0            # loader rank (multi-rank runs)
 
 
 @dataclass
@@ -41,79 +61,414 @@ class EpochRecord:
     duration_sec: float
     throughput_mb_s: float
     ttfb_sec: float  # time to first batch
+    major_faults: int = 0  # page faults during the epoch (this process)
+    minor_faults: int = 0
+    madvise_applied: Optional[bool] = None  # mmap: every hint was accepted
 
 
 @dataclass
 class LoaderParams:
     data_root: str
-    strategy: str = "sequential"      # sequential | random | mmap | prefetch
+    strategy: str = "sequential"      # sequential | random | mmap | prefetch | decode_pool
     epochs: int = 3
     prefetch_depth: int = 4
     read_buffer_kb: int = 256
     batch_size: int = 32
     shuffle_seed: Optional[int] = 42
     compressed: bool = False
-
-
-def discover_samples(root: str, compressed: bool = False) -> List[str]:
+    codec: str = "gzip"
+    decode_workers: int = 0           # decode_pool processes / pipeline threads (0 = cpu count)
+    transform_workers: int = 1        # pipeline transform threads
+    transform_cost: int = 1           # pipeline transform passes per sample
+    queue_depth: int = 8              # pipeline bounded queue size between stages
+    autotune_window: int = 32         # samples per autotune measurement window
+    autotune_max_workers: int = 0     # worker cap (0 = 4 x cpu count)
+    autotune_memory_mb: int = 512     # budget for queued samples + read buffers
+    autotune_stall_threshold: float = 0.05  # stall fraction considered "fed"
+    autotune_min_gain: float = 0.05   # relative throughput gain to keep a change
+    cache_memory_mb: float = 0        # in-memory LRU tier (0 = disabled)
+    cache_dir: str = ""               # local-disk cache tier directory
+    cache_disk_mb: float = 0          # disk tier budget (0 = disabled)
+    cache_policy: str = "lru"         # disk tier eviction: lru | lfu | fifo
+    use_manifest: bool = True         # discover samples via the persisted manifest
+    manifest_path: str = ""           # manifest location ("" = inside data_root)
+    record_sizes_kb: Tuple[int, ...] = (4, 64, 1024, 4096)  # random_range record sizes
+    record_layout: str = "fixed"      # random_range records: fixed | variable
+    range_reads: int = 1024           # random_range reads per record size per epoch
+    token_reader: str = "mmap"        # tokens strategy: mmap | pread
+    seq_len: int = 2048               # tokens per packed training sequence
+    token_dtype: str = "uint16"       # generated token width: uint16 | uint32
+    token_count: int = 8 * 1024 * 1024  # tokens in an auto-generated token file
+    mean_doc_tokens: int = 1024       # mean document length when generating
+    mmap_touch: str = "page"          # mmap: page (1 byte/page) | checksum (crc32 of all bytes)
+    mmap_advice: str = "none"         # mmap madvise: none | sequential | random | willneed | hugepage
+    mmap_packed: bool = False         # mmap: one long-lived mapping of a packed file
+    work_dir: str = ""                # derived files, e.g. the packed file ("" = <data_root>.work)
+    compute_ms: float = 0.0           # simulated training compute per batch (0 = no consumer)
+    compute_dist: str = "fixed"       # compute time: fixed | normal | lognormal
+    compute_jitter: float = 0.1       # coefficient of variation for normal / lognormal
+    consumer_prefetch: int = 2        # batches buffered ahead of the consumer
+    resume_order: str = "random"      # resume benchmark order: sequential | random | buffer
+    shuffle_buffer: int = 256         # streaming shuffle buffer size (buffer order)
+    resume_trials: int = 3            # restarts at random mid-epoch points
+    state_path: str = ""              # resume state file ("" = in the work dir)
+    affinity: str = "os"              # worker placement: os | cpus | spread | node
+    cpu_list: str = ""                # CPUs for affinity=cpus, e.g. "0-7,16"
+    numa_node: int = -1               # node for affinity=node (-1 = data's device)
+
+
+def params_cache(params: LoaderParams) -> Optional[TieredCache]:
+    """Build the cache tiers configured in *params* (None if disabled)."""
+    return build_cache(params.cache_memory_mb, params.cache_dir,
+                       params.cache_disk_mb, params.cache_policy)
+
+
+def params_affinity(params: LoaderParams) -> AffinityPlan:
+    """Build the worker placement configured in *params*."""
+    return make_plan(params.affinity, params.cpu_list, params.numa_node,
+                     params.data_root)
+
+
+def params_work_dir(params: LoaderParams) -> str:
+    """Directory for files derived from the dataset, never inside it."""
+    return params.work_dir or params.data_root.rstrip(os.sep) + ".work"
+
+
+def discover_samples_report(root: str, compressed: bool = False,
+                            codec: str = "gzip", use_manifest: bool = True,
+                            manifest_path: str = "") -> tuple:
+    """Find all sample files under *root*.
+
+    Returns ``(samples, report)`` where *report* is a
+    :class:`~benchmarks_common.manifest.DiscoveryReport` with the time
+    spent enumerating and whether the manifest could be used.
+    """
+    pattern = "*.bin" + (get_codec(codec).extension if compressed else "")
+    return discover(root, pattern, use_manifest, manifest_path)
+
+
+def discover_samples(root: str, compressed: bool = False,
+                     codec: str = "gzip", use_manifest: bool = True,
+                     manifest_path: str = "") -> List[str]:
     """Find all sample files under *root*."""
-    ext = "*.bin.gz" if compressed else "*.bin"
-    return sorted(str(p) for p in Path(root).glob(ext))
+    return discover_samples_report(root, compressed, codec, use_manifest,
+                                   manifest_path)[0]
 
 
-def run_loader(params: LoaderParams) -> tuple:
-    """Run the data-loading benchmark and return (sample_records, epoch_records)."""
-    samples = discover_samples(params.data_root, params.compressed)
+def require_samples(params: LoaderParams) -> List[str]:
+    """Discover samples for *params*, raising if the dataset is empty."""
+    samples = discover_samples(params.data_root, params.compressed,
+                               params.codec, params.use_manifest,
+                               params.manifest_path)
     if not samples:
         raise FileNotFoundError(
             f"No sample files in {params.data_root}. "
             "Run dataset_gen.py first."
         )
+    return samples
+
+
+ORDERS = ("sequential", "random", "buffer")
+
+
+@dataclass
+class LoaderState:
+    """Serializable position of a :class:`SampleIterator`.
+
+    ``rng_state``, ``shuffle_buffer`` and ``source_position`` are only used
+    by the streaming ``buffer`` order; ``random`` orders are regenerated
+    from ``seed + epoch``.
+    """
+
+    epoch: int
+    position: int  # samples already yielded this epoch
+    order: str
+    seed: int
+    num_samples: int
+    buffer_size: int = 0
+    rng_state: Optional[list] = None
+    shuffle_buffer: List[int] = field(default_factory=list)
+    source_position: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text: str) -> "LoaderState":
+        return cls(**json.loads(text))
+
+
+class SampleIterator:
+    """Yields sample indices in strategy order, with checkpointable state.
+
+    - ``sequential``: ``0 .. n-1``,
+    - ``random``: the permutation of ``random.Random(seed + epoch)``, the
+      same order the ``random`` strategy uses,
+    - ``buffer``: a tf.data-style streaming shuffle over a sequential
+      source with a ``buffer_size`` reservoir.
+
+    :meth:`state` captures enough to continue exactly where it stopped;
+    :meth:`restore` resumes without touching any sample data.
+    """
+
+    def __init__(self, num_samples: int, order: str = "sequential",
+                 seed: Optional[int] = None, buffer_size: int = 0):
+        if order not in ORDERS:
+            raise ValueError(
+                f"Unknown sample order '{order}'. Choose from: {', '.join(ORDERS)}")
+        self.num_samples = num_samples
+        self.order = order
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.buffer_size = max(1, buffer_size) if order == "buffer" else 0
+        self.start_epoch(1)
+
+    def start_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+        self.position = 0
+        self._perm: Optional[List[int]] = None
+        self._rng: Optional[random.Random] = None
+        self._buffer: List[int] = []
+        self._source = 0
+        if self.order == "random":
+            self._perm = list(range(self.num_samples))
+            random.Random(self.seed + epoch).shuffle(self._perm)
+        elif self.order == "buffer":
+            self._rng = random.Random(self.seed + epoch)
+            self._source = min(self.buffer_size, self.num_samples)
+            self._buffer = list(range(self._source))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> int:
+        if self.position >= self.num_samples:
+            raise StopIteration
+        if self.order == "sequential":
+            idx = self.position
+        elif self.order == "random":
+            idx = self._perm[self.position]
+        else:
+            j = self._rng.randrange(len(self._buffer))
+            idx = self._buffer[j]
+            if self._source < self.num_samples:
+                self._buffer[j] = self._source
+                self._source += 1
+            else:
+                self._buffer[j] = self._buffer[-1]
+                self._buffer.pop()
+        self.position += 1
+        return idx
+
+    def state(self) -> LoaderState:
+        return LoaderState(
+            epoch=self.epoch, position=self.position, order=self.order,
+            seed=self.seed, num_samples=self.num_samples,
+            buffer_size=self.buffer_size,
+            rng_state=(_rng_state_to_list(self._rng.getstate())
+                       if self._rng is not None else None),
+            shuffle_buffer=list(self._buffer),
+            source_position=self._source,
+        )
+
+    @classmethod
+    def from_state(cls, state: LoaderState) -> "SampleIterator":
+        it = cls(state.num_samples, state.order, state.seed, state.buffer_size)
+        it.start_epoch(state.epoch)
+        it.position = state.position
+        if state.order == "buffer":
+            it._rng.setstate(_rng_state_from_list(state.rng_state))
+            it._buffer = list(state.shuffle_buffer)
+            it._source = state.source_position
+        return it
+
+
+def _rng_state_to_list(state: tuple) -> list:
+    version, internal, gauss = state
+    return [version, list(internal), gauss]
+
+
+def _rng_state_from_list(state: list) -> tuple:
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
+
+
+# Strategies implemented as one function per epoch (see strategy_function);
+# the others (pipeline, autotune, ...) run their own loops.
+READ_STRATEGIES = ("sequential", "random", "mmap", "prefetch", "decode_pool")
+
 
+def strategy_function(name: str):
+    """Return the per-epoch function implementing strategy *name*."""
     strategy_fn = {
         "sequential": _load_sequential,
         "random": _load_random,
         "mmap": _load_mmap,
         "prefetch": _load_prefetch,
-    }.get(params.strategy)
+        "decode_pool": _load_decode_pool,
+    }.get(name)
 
     if strategy_fn is None:
         raise ValueError(
-            f"Unknown strategy '{params.strategy}'. "
-            "Choose from: sequential, random, mmap, prefetch"
+            f"Unknown strategy '{name}'. "
+            f"Choose from: {', '.join(READ_STRATEGIES)}"
         )
+    return strategy_fn
+
+
+def run_loader(params: LoaderParams,
+               cache: Optional[TieredCache] = None,
+               consumer: Optional[Any] = None) -> tuple:
+    """Run the data-loading benchmark and return (sample_records, epoch_records).
+
+    *cache* defaults to the tiers configured in *params*; pass one in to
+    inspect its eviction counters afterwards. The ``mmap`` strategy always
+    maps files from ``data_root`` and bypasses the cache.
+
+    With a *consumer* (see :mod:`.consumer`), every sample is handed to
+    ``consumer.offer`` as it completes and ``consumer.end_epoch`` is called
+    after each epoch, so a slow consumer back-pressures the strategy.
+    """
+    strategy_fn = strategy_function(params.strategy)
+    samples = require_samples(params)
+    if cache is None:
+        cache = params_cache(params)
 
     all_sample_records: List[SampleRecord] = []
     all_epoch_records: List[EpochRecord] = []
 
-    for epoch in range(1, params.epochs + 1):
-        sample_records, epoch_record = strategy_fn(samples, epoch, params)
-        all_sample_records.extend(sample_records)
-        all_epoch_records.append(epoch_record)
+    # A packed mapping lives across epochs, like a long-running job's.
+    mapping = (PackedMapping(samples, params)
+               if params.strategy == "mmap" and params.mmap_packed else None)
+    extra: Dict[str, Any] = {"mapping": mapping} if mapping is not None else {}
+    if consumer is not None:
+        extra["sink"] = consumer.offer
+    try:
+        for epoch in range(1, params.epochs + 1):
+            sample_records, epoch_record = run_epoch_with_faults(
+                strategy_fn, samples, epoch, params, cache, **extra)
+            all_sample_records.extend(sample_records)
+            all_epoch_records.append(epoch_record)
+            if consumer is not None:
+                consumer.end_epoch()
+    finally:
+        if mapping is not None:
+            mapping.close()
 
     return all_sample_records, all_epoch_records
 
 
+def run_epoch_with_faults(strategy_fn, samples: List[str], epoch: int,
+                          params: LoaderParams,
+                          cache: Optional[TieredCache] = None,
+                          **kwargs) -> tuple:
+    """Run one epoch of *strategy_fn* and record its page faults."""
+    major0, minor0 = page_faults()
+    records, epoch_rec = strategy_fn(samples, epoch, params, cache=cache,
+                                     **kwargs)
+    major1, minor1 = page_faults()
+    epoch_rec.major_faults = major1 - major0
+    epoch_rec.minor_faults = minor1 - minor0
+    return records, epoch_rec
+
+
 # --- strategies ---------------------------------------------------------
 
-def _read_file(path: str, buffer_kb: int, compressed: bool) -> tuple:
-    """Read a file, return (bytes_read, duration_sec)."""
+def _emit(records: List[SampleRecord], record: SampleRecord,
+          sink: Optional[Callable[[SampleRecord], None]]) -> None:
+    """Keep *record* and hand it to *sink*, which may block (back-pressure)."""
+    records.append(record)
+    if sink is not None:
+        sink(record)
+
+
+def _codec_name(params: LoaderParams) -> Optional[str]:
+    return params.codec if params.compressed else None
+
+
+def _read_raw(path: str, buffer_kb: int) -> tuple:
+    """Read a file's stored bytes, return (data, io_sec)."""
     buf_size = buffer_kb * 1024
-    opener = gzip.open if compressed else open
+    chunks = []
     start = time.perf_counter()
-    total = 0
-    with opener(path, "rb") as f:
+    with open(path, "rb") as f:
         while True:
             chunk = f.read(buf_size)
             if not chunk:
                 break
-            total += len(chunk)
+            chunks.append(chunk)
     end = time.perf_counter()
-    return total, max(end - start, 1e-9)
+    return b"".join(chunks), max(end - start, 1e-9)
+
+
+def _decode_bytes(codec: str, data: bytes) -> tuple:
+    """Decompress *data*, return (decoded_bytes, decode_sec).
+
+    Module-level so it can run inside a ProcessPoolExecutor worker.
+    """
+    start = time.perf_counter()
+    decoded = get_codec(codec).decompress(data)
+    return len(decoded), max(time.perf_counter() - start, 1e-9)
+
+
+def _read_file(path: str, buffer_kb: int, codec: Optional[str]) -> tuple:
+    """Read (and decode) a file, return (bytes_read, io_sec, decode_sec).
+
+    Uncompressed files are streamed in *buffer_kb* chunks. Compressed
+    files are read fully first so storage time and decode time can be
+    reported separately; *bytes_read* is the decoded size.
+    """
+    if codec is None:
+        buf_size = buffer_kb * 1024
+        start = time.perf_counter()
+        total = 0
+        with open(path, "rb") as f:
+            while True:
+                chunk = f.read(buf_size)
+                if not chunk:
+                    break
+                total += len(chunk)
+        end = time.perf_counter()
+        return total, max(end - start, 1e-9), 0.0
+    data, io_sec = _read_raw(path, buffer_kb)
+    nbytes, decode_sec = _decode_bytes(codec, data)
+    return nbytes, io_sec, decode_sec
+
+
+def _read_raw_cached(path: str, buffer_kb: int,
+                     cache: Optional[TieredCache]) -> tuple:
+    """Like :func:`_read_raw` but through *cache*; returns (data, io_sec, tier).
+
+    On a miss *io_sec* includes filling the cache tiers.
+    """
+    if cache is None:
+        return _read_raw(path, buffer_kb) + ("storage",)
+    start = time.perf_counter()
+    data, tier = cache.get(path, buffer_kb)
+    if data is None:
+        data, _ = _read_raw(path, buffer_kb)
+        cache.put(path, data)
+    return data, max(time.perf_counter() - start, 1e-9), tier
+
+
+def _read_cached(path: str, buffer_kb: int, codec: Optional[str],
+                 cache: Optional[TieredCache]) -> tuple:
+    """Like :func:`_read_file` but through *cache*.
+
+    Returns (bytes_read, io_sec, decode_sec, tier).
+    """
+    if cache is None:
+        return _read_file(path, buffer_kb, codec) + ("storage",)
+    data, io_sec, tier = _read_raw_cached(path, buffer_kb, cache)
+    if codec is None:
+        return len(data), io_sec, 0.0, tier
+    nbytes, decode_sec = _decode_bytes(codec, data)
+    return nbytes, io_sec, decode_sec, tier
 
 
 def _load_sequential(
     samples: List[str], epoch: int, params: LoaderParams,
+    cache: Optional[TieredCache] = None,
+    sink: Optional[Callable[[SampleRecord], None]] = None,
 ) -> tuple:
     """Read files in order — baseline sequential scan."""
     records: List[SampleRecord] = []
@@ -122,15 +477,18 @@ def _load_sequential(
     total_bytes = 0
 
     for idx, path in enumerate(samples):
-        nbytes, dur = _read_file(path, params.read_buffer_kb, params.compressed)
+        nbytes, io_sec, decode_sec, tier = _read_cached(
+            path, params.read_buffer_kb, _codec_name(params), cache)
+        dur = io_sec + decode_sec
         if idx == 0:
             ttfb = time.perf_counter() - epoch_start
         total_bytes += nbytes
-        records.append(SampleRecord(
+        _emit(records, SampleRecord(
             epoch=epoch, sample_idx=idx, path=path,
             bytes_read=nbytes, duration_sec=dur,
             throughput_mb_s=throughput_mb_s(nbytes, dur),
-        ))
+            io_sec=io_sec, decode_sec=decode_sec, tier=tier,
+        ), sink)
 
     epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
     epoch_rec = EpochRecord(
@@ -144,14 +502,13 @@ def _load_sequential(
 
 def _load_random(
     samples: List[str], epoch: int, params: LoaderParams,
+    cache: Optional[TieredCache] = None,
+    sink: Optional[Callable[[SampleRecord], None]] = None,
 ) -> tuple:
     """Shuffle files and read in random order — worst-case for HDDs."""
-    order = list(samples)
-    if params.shuffle_seed is not None:
-        rng = random.Random(params.shuffle_seed + epoch)
-        rng.shuffle(order)
-    else:
-        random.shuffle(order)
+    it = SampleIterator(len(samples), "random", params.shuffle_seed)
+    it.start_epoch(epoch)
+    order = [samples[i] for i in it]
 
     records: List[SampleRecord] = []
     epoch_start = time.perf_counter()
@@ -159,15 +516,18 @@ def _load_random(
     total_bytes = 0
 
     for idx, path in enumerate(order):
-        nbytes, dur = _read_file(path, params.read_buffer_kb, params.compressed)
+        nbytes, io_sec, decode_sec, tier = _read_cached(
+            path, params.read_buffer_kb, _codec_name(params), cache)
+        dur = io_sec + decode_sec
         if idx == 0:
             ttfb = time.perf_counter() - epoch_start
         total_bytes += nbytes
-        records.append(SampleRecord(
+        _emit(records, SampleRecord(
             epoch=epoch, sample_idx=idx, path=path,
             bytes_read=nbytes, duration_sec=dur,
             throughput_mb_s=throughput_mb_s(nbytes, dur),
-        ))
+            io_sec=io_sec, decode_sec=decode_sec, tier=tier,
+        ), sink)
 
     epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
     epoch_rec = EpochRecord(
@@ -179,77 +539,301 @@ def _load_random(
     return records, epoch_rec
 
 
+MMAP_TOUCH = ("page", "checksum")
+MMAP_ADVICE = ("none", "sequential", "random", "willneed", "hugepage")
+
+
+def _madvise(mm: mmap.mmap, advice: str) -> bool:
+    """Apply *advice* to *mm*; returns False if unsupported here."""
+    if advice not in MMAP_ADVICE:
+        raise ValueError(
+            f"Unknown madvise hint '{advice}'. "
+            f"Choose from: {', '.join(MMAP_ADVICE)}")
+    if advice == "none":
+        return True
+    flag = getattr(mmap, f"MADV_{advice.upper()}", None)
+    if flag is None or not hasattr(mm, "madvise"):
+        return False
+    try:
+        mm.madvise(flag)
+    except OSError:  # e.g. MADV_HUGEPAGE on a filesystem without THP support
+        return False
+    return True
+
+
+def _touch(view: memoryview, mode: str) -> int:
+    """Fault in every page of *view* without copying it.
+
+    ``page`` reads one byte per page through a strided view; ``checksum``
+    runs crc32 over every byte, which also pulls it through the CPU.
+    """
+    if mode == "page":
+        return sum(view[::mmap.PAGESIZE])
+    if mode == "checksum":
+        return zlib.crc32(view)
+    raise ValueError(
+        f"Unknown mmap touch mode '{mode}'. Choose from: {', '.join(MMAP_TOUCH)}")
+
+
+def pack_samples(samples: List[str], params: LoaderParams) -> tuple:
+    """Concatenate *samples* into one file in the work directory.
+
+    Returns ``(path, offsets)`` with ``offsets[sample] = (offset, size)``.
+    The file is named after the sample list (count, bytes and a digest of
+    paths and sizes), so a different list never reuses it, and written
+    under a per-process temporary name so concurrent packers cannot
+    clobber each other. An existing file of the right size is reused.
+    """
+    offsets: Dict[str, Tuple[int, int]] = {}
+    digest = hashlib.blake2b(digest_size=8)
+    total = 0
+    for path in samples:
+        size = os.path.getsize(path)
+        offsets[path] = (total, size)
+        total += size
+        digest.update(f"{path}\0{size}\0".encode("utf-8", "surrogateescape"))
+    work_dir = params_work_dir(params)
+    os.makedirs(work_dir, exist_ok=True)
+    packed = os.path.join(
+        work_dir, f"packed-{len(samples)}-{total}-{digest.hexdigest()}.bin")
+    if not os.path.exists(packed) or os.path.getsize(packed) != total:
+        tmp = f"{packed}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as out:
+            for path in samples:
+                with open(path, "rb") as f:
+                    while True:
+                        chunk = f.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+        os.replace(tmp, packed)
+    return packed, offsets
+
+
+class PackedMapping:
+    """All samples concatenated into one file under one long-lived mapping.
+
+    The packed file comes from :func:`pack_samples`, in the work directory
+    (by default ``<data_root>.work``, on the same filesystem as the
+    samples). Build the mapping before timing starts; any subset of
+    *samples*, e.g. one rank's shard, can then be read as slices.
+    """
+
+    def __init__(self, samples: List[str], params: LoaderParams):
+        self.path, self.offsets = pack_samples(samples, params)
+        total = sum(size for _, size in self.offsets.values())
+        self._file = open(self.path, "rb")
+        self.mm = (mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                   if total else None)
+        self.view = memoryview(self.mm) if self.mm is not None else None
+        self.advice_applied = (_madvise(self.mm, params.mmap_advice)
+                               if self.mm is not None else True)
+
+    def slice(self, path: str) -> memoryview:
+        offset, size = self.offsets[path]
+        return self.view[offset:offset + size]
+
+    def close(self) -> None:
+        if self.view is not None:
+            self.view.release()
+        if self.mm is not None:
+            self.mm.close()
+        self._file.close()
+
+
 def _load_mmap(
     samples: List[str], epoch: int, params: LoaderParams,
+    cache: Optional[TieredCache] = None,
+    mapping: Optional[PackedMapping] = None,
+    sink: Optional[Callable[[SampleRecord], None]] = None,
 ) -> tuple:
-    """Memory-mapped reads — zero-copy via OS page cache."""
+    """Memory-mapped reads — pages are touched in place, never copied.
+
+    Without a packed mapping each sample is mapped, advised, touched and
+    unmapped in turn. With ``mmap_packed`` all samples are slices of one
+    mapping; *mapping* is kept across epochs by :func:`run_loader`.
+    """
+    own_mapping = mapping is None and params.mmap_packed
+    if own_mapping:
+        mapping = PackedMapping(samples, params)  # not part of the epoch
     records: List[SampleRecord] = []
     epoch_start = time.perf_counter()
     ttfb = 0.0
     total_bytes = 0
+    applied = mapping.advice_applied if mapping is not None else True
 
-    for idx, path in enumerate(samples):
-        start = time.perf_counter()
-        sz = os.path.getsize(path)
-        if sz == 0:
-            dur = max(time.perf_counter() - start, 1e-9)
-        else:
-            with open(path, "rb") as f:
-                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
-                    # Touch every page to force actual reads
-                    _ = mm[:]
+    try:
+        for idx, path in enumerate(samples):
+            start = time.perf_counter()
+            if mapping is not None:
+                with mapping.slice(path) as view:
+                    sz = len(view)
+                    _touch(view, params.mmap_touch)
+            else:
+                sz = os.path.getsize(path)
+                if sz:
+                    with open(path, "rb") as f:
+                        with mmap.mmap(f.fileno(), 0,
+                                       access=mmap.ACCESS_READ) as mm:
+                            applied &= _madvise(mm, params.mmap_advice)
+                            with memoryview(mm) as view:
+                                _touch(view, params.mmap_touch)
             dur = max(time.perf_counter() - start, 1e-9)
 
-        if idx == 0:
-            ttfb = time.perf_counter() - epoch_start
-        total_bytes += sz
-        records.append(SampleRecord(
-            epoch=epoch, sample_idx=idx, path=path,
-            bytes_read=sz, duration_sec=dur,
-            throughput_mb_s=throughput_mb_s(sz, dur),
-        ))
+            if idx == 0:
+                ttfb = time.perf_counter() - epoch_start
+            total_bytes += sz
+            _emit(records, SampleRecord(
+                epoch=epoch, sample_idx=idx, path=path,
+                bytes_read=sz, duration_sec=dur,
+                throughput_mb_s=throughput_mb_s(sz, dur), io_sec=dur,
+            ), sink)
+    finally:
+        if own_mapping:
+            mapping.close()
 
     epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
     epoch_rec = EpochRecord(
         epoch=epoch, strategy="mmap", samples=len(samples),
         total_bytes=total_bytes, duration_sec=epoch_dur,
         throughput_mb_s=throughput_mb_s(total_bytes, epoch_dur),
-        ttfb_sec=ttfb,
+        ttfb_sec=ttfb, madvise_applied=applied,
     )
     return records, epoch_rec
 
 
 def _load_prefetch(
     samples: List[str], epoch: int, params: LoaderParams,
+    cache: Optional[TieredCache] = None,
+    sink: Optional[Callable[[SampleRecord], None]] = None,
 ) -> tuple:
-    """Concurrent prefetching via thread pool — models DataLoader workers."""
+    """Concurrent prefetching via thread pool — models DataLoader workers.
+
+    Like ``DataLoader(prefetch_factor=2)``, at most ``2 * prefetch_depth``
+    samples are submitted but not yet handed to *sink*, so a blocked sink
+    stops new reads instead of letting finished samples pile up.
+    """
     records: List[SampleRecord] = []
     epoch_start = time.perf_counter()
     ttfb = 0.0
     total_bytes = 0
+    window = 2 * params.prefetch_depth
+    queued = iter(enumerate(samples))
 
-    with ThreadPoolExecutor(max_workers=params.prefetch_depth) as pool:
+    initializer, initargs = thread_initializer(params_affinity(params))
+    with ThreadPoolExecutor(max_workers=params.prefetch_depth,
+                            initializer=initializer,
+                            initargs=initargs) as pool:
         futures = {}
-        for idx, path in enumerate(samples):
-            fut = pool.submit(_read_file, path, params.read_buffer_kb,
-                              params.compressed)
-            futures[fut] = (idx, path)
-
-        for i, fut in enumerate(as_completed(futures)):
-            idx, path = futures[fut]
-            nbytes, dur = fut.result()
-            if i == 0:
-                ttfb = time.perf_counter() - epoch_start
+        while True:
+            for idx, path in queued:
+                fut = pool.submit(_read_cached, path, params.read_buffer_kb,
+                                  _codec_name(params), cache)
+                futures[fut] = (idx, path)
+                if len(futures) >= window:
+                    break
+            if not futures:
+                break
+
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                idx, path = futures.pop(fut)
+                nbytes, io_sec, decode_sec, tier = fut.result()
+                dur = io_sec + decode_sec
+                if not records:
+                    ttfb = time.perf_counter() - epoch_start
+                total_bytes += nbytes
+                _emit(records, SampleRecord(
+                    epoch=epoch, sample_idx=idx, path=path,
+                    bytes_read=nbytes, duration_sec=dur,
+                    throughput_mb_s=throughput_mb_s(nbytes, dur),
+                    io_sec=io_sec, decode_sec=decode_sec, tier=tier,
+                ), sink)
+
+    epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
+    epoch_rec = EpochRecord(
+        epoch=epoch, strategy="prefetch", samples=len(samples),
+        total_bytes=total_bytes, duration_sec=epoch_dur,
+        throughput_mb_s=throughput_mb_s(total_bytes, epoch_dur),
+        ttfb_sec=ttfb,
+    )
+    return records, epoch_rec
+
+
+def _load_decode_pool(
+    samples: List[str], epoch: int, params: LoaderParams,
+    cache: Optional[TieredCache] = None,
+    sink: Optional[Callable[[SampleRecord], None]] = None,
+) -> tuple:
+    """I/O threads read stored bytes; a process pool decompresses them.
+
+    Separating the two pools shows whether a compressed dataset is bound
+    by storage or by decode CPU: I/O and decode time are recorded per
+    sample. At most ``prefetch_depth + 2 * decode_workers`` samples are
+    in flight or waiting for *sink* at once, so a blocked sink stops new
+    reads.
+    """
+    codec = _codec_name(params)
+    if codec is None:
+        raise ValueError("decode_pool strategy requires compressed samples")
+    decode_workers = params.decode_workers or os.cpu_count() or 1
+    window = params.prefetch_depth + 2 * decode_workers
+    done_at = {}
+    records: List[SampleRecord] = []
+    epoch_start = time.perf_counter()
+    total_bytes = 0
+
+    # Decode processes and I/O threads are placed by the same plan.
+    plan = params_affinity(params)
+    ctx = mp.get_context()
+    p_init, p_args = process_initializer(plan, ctx)
+    t_init, t_args = thread_initializer(plan)
+    with ProcessPoolExecutor(max_workers=decode_workers, mp_context=ctx,
+                             initializer=p_init,
+                             initargs=p_args) as decode_pool, \
+            ThreadPoolExecutor(max_workers=params.prefetch_depth,
+                               initializer=t_init,
+                               initargs=t_args) as io_pool:
+
+        def _io_then_decode(idx: int, path: str) -> tuple:
+            data, io_sec, tier = _read_raw_cached(
+                path, params.read_buffer_kb, cache)
+            dfut = decode_pool.submit(_decode_bytes, codec, data)
+
+            def _finished(_f, idx=idx):
+                done_at[idx] = time.perf_counter()
+
+            dfut.add_done_callback(_finished)
+            return idx, path, io_sec, tier, dfut
+
+        # Samples are handed to the sink in submission order; a failed
+        # read surfaces from result() as soon as it reaches the head.
+        io_futures: Deque[Future] = deque()
+        queued = iter(enumerate(samples))
+        while True:
+            for idx, path in queued:
+                io_futures.append(io_pool.submit(_io_then_decode, idx, path))
+                if len(io_futures) >= window:
+                    break
+            if not io_futures:
+                break
+
+            idx, path, io_sec, tier, dfut = io_futures.popleft().result()
+            nbytes, decode_sec = dfut.result()
+            dur = io_sec + decode_sec
             total_bytes += nbytes
-            records.append(SampleRecord(
+            _emit(records, SampleRecord(
                 epoch=epoch, sample_idx=idx, path=path,
                 bytes_read=nbytes, duration_sec=dur,
                 throughput_mb_s=throughput_mb_s(nbytes, dur),
-            ))
+                io_sec=io_sec, decode_sec=decode_sec, tier=tier,
+            ), sink)
 
+    ttfb = (min(done_at.values()) - epoch_start) if done_at else 0.0
+    records.sort(key=lambda r: done_at.get(r.sample_idx, 0.0))
     epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
     epoch_rec = EpochRecord(
-        epoch=epoch, strategy="prefetch", samples=len(samples),
+        epoch=epoch, strategy="decode_pool", samples=len(samples),
         total_bytes=total_bytes, duration_sec=epoch_dur,
         throughput_mb_s=throughput_mb_s(total_bytes, epoch_dur),
         ttfb_sec=ttfb,
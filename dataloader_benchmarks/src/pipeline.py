@@ -0,0 +1,368 @@
+"""Staged read → decode → transform → collate input pipeline.
+
+Each stage has its own thread pool and hands work to the next stage
+through a bounded queue, mirroring tf.data / DataLoader pipelines. Every
+worker records how long it was
+
+- busy: processing an item,
+- idle: waiting for input from the upstream queue,
+- blocked: waiting for space in the downstream queue.
+
+A worker whose item raises forwards the exception to the sink, where
+:func:`run_pipeline` re-raises it once every stage has drained; the
+remaining input is skipped.
+
+The stage with the highest busy utilization (busy time divided by
+``workers × wall time``) is reported as the bottleneck, which answers
+whether a slow pipeline is limited by storage (``read``) or by CPU
+(``decode`` / ``transform`` / ``collate``).
+"""
+
+import hashlib
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+from benchmarks_common.compression import get_codec
+from benchmarks_common.stats import throughput_mb_s
+
+from .cache import TieredCache
+from .loader import (EpochRecord, LoaderParams, SampleRecord, _codec_name,
+                     _read_raw_cached, params_cache, require_samples)
+
+try:
+    import numpy as np  # type: ignore
+except ModuleNotFoundError:  # pragma: no cover
+    np = None  # type: ignore
+
+STAGES = ("read", "decode", "transform", "collate")
+
+_DONE = object()
+
+
+class _Failed:
+    """An exception raised by a stage worker, on its way to the sink."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+@dataclass
+class StageRecord:
+    epoch: int
+    stage: str
+    workers: int
+    items: int
+    busy_sec: float
+    idle_sec: float
+    blocked_sec: float
+    wall_sec: float
+    utilization: float  # busy_sec / (workers * wall_sec)
+
+
+@dataclass
+class _Item:
+    idx: int
+    path: str
+    payload: Any = None
+    nbytes: int = 0
+    io_sec: float = 0.0
+    decode_sec: float = 0.0
+    tier: str = "storage"
+
+
+class _Stage:
+    """A pool of worker threads between two queues."""
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int,
+                 inq: "queue.Queue", outq: "queue.Queue",
+                 downstream_workers: int, failed: threading.Event,
+                 flush: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inq = inq
+        self.outq = outq
+        self.downstream_workers = downstream_workers
+        self.flush = flush
+        self.failed = failed  # shared by all stages of one epoch
+        self.busy = 0.0
+        self.idle = 0.0
+        self.blocked = 0.0
+        self.items = 0
+        self._lock = threading.Lock()
+        self._remaining = workers
+        self._threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self) -> None:
+        for t in self._threads:
+            t.start()
+
+    def join(self) -> None:
+        for t in self._threads:
+            t.join()
+
+    def _put(self, item: Any) -> float:
+        start = time.perf_counter()
+        self.outq.put(item)
+        return time.perf_counter() - start
+
+    def _fail(self, exc: BaseException) -> float:
+        self.failed.set()
+        return self._put(_Failed(exc))
+
+    def _run(self) -> None:
+        busy = idle = blocked = 0.0
+        items = 0
+        try:
+            while True:
+                t0 = time.perf_counter()
+                item = self.inq.get()
+                t1 = time.perf_counter()
+                idle += t1 - t0
+                if item is _DONE:
+                    break
+                if isinstance(item, _Failed):
+                    blocked += self._put(item)
+                    continue
+                if self.failed.is_set():
+                    # Keep draining so upstream stages are never blocked.
+                    continue
+                try:
+                    out = self.fn(item)
+                except Exception as exc:
+                    blocked += self._fail(exc)
+                    continue
+                busy += time.perf_counter() - t1
+                items += 1
+                if out is not None:
+                    blocked += self._put(out)
+        finally:
+            self._finish(busy, idle, blocked, items)
+
+    def _finish(self, busy: float, idle: float, blocked: float,
+                items: int) -> None:
+        with self._lock:
+            self.busy += busy
+            self.idle += idle
+            self.blocked += blocked
+            self.items += items
+            self._remaining -= 1
+            last = self._remaining == 0
+        if not last:
+            return
+        # The last worker out flushes stage state and tells every
+        # downstream worker that no more input is coming.
+        try:
+            if self.flush is not None and not self.failed.is_set():
+                t0 = time.perf_counter()
+                out = self.flush()
+                with self._lock:
+                    self.busy += time.perf_counter() - t0
+                if out is not None:
+                    blocked_tail = self._put(out)
+                    with self._lock:
+                        self.blocked += blocked_tail
+        except Exception as exc:
+            self._fail(exc)
+        finally:
+            for _ in range(self.downstream_workers):
+                self.outq.put(_DONE)
+
+    def record(self, epoch: int, wall_sec: float) -> StageRecord:
+        wall_sec = max(wall_sec, 1e-9)
+        return StageRecord(
+            epoch=epoch, stage=self.name, workers=self.workers,
+            items=self.items, busy_sec=self.busy, idle_sec=self.idle,
+            blocked_sec=self.blocked, wall_sec=wall_sec,
+            utilization=self.busy / (self.workers * wall_sec),
+        )
+
+
+def synthetic_transform(payload: bytes, cost: int) -> Any:
+    """CPU-bound stand-in for normalize/augment, *cost* passes per sample.
+
+    Uses NumPy (normalize + flip on float32) when available, otherwise
+    hashes the payload *cost* times.
+    """
+    if np is not None:
+        x = np.frombuffer(payload, dtype=np.uint8).astype(np.float32)
+        for _ in range(max(0, cost)):
+            x = (x - x.mean()) / (x.std() + 1e-6)
+            x = x[::-1]
+        return x
+    for _ in range(max(0, cost)):
+        hashlib.sha256(payload).digest()
+    return payload
+
+
+def _collate(payloads: List[Any]) -> Any:
+    if np is not None:
+        return np.concatenate([np.asarray(p).ravel() for p in payloads])
+    return b"".join(payloads)
+
+
+def run_pipeline(params: LoaderParams,
+                 cache: Optional[TieredCache] = None) -> tuple:
+    """Run the staged pipeline.
+
+    Returns ``(sample_records, epoch_records, stage_records)``.
+    """
+    samples = require_samples(params)
+    if cache is None:
+        cache = params_cache(params)
+    all_samples: List[SampleRecord] = []
+    all_epochs: List[EpochRecord] = []
+    all_stages: List[StageRecord] = []
+    for epoch in range(1, params.epochs + 1):
+        sample_records, epoch_record, stage_records = _run_epoch(
+            samples, epoch, params, cache)
+        all_samples.extend(sample_records)
+        all_epochs.append(epoch_record)
+        all_stages.extend(stage_records)
+    return all_samples, all_epochs, all_stages
+
+
+def _run_epoch(samples: List[str], epoch: int, params: LoaderParams,
+               cache: Optional[TieredCache]) -> tuple:
+    codec = _codec_name(params)
+    depth = max(1, params.queue_depth)
+    workers = {
+        "read": max(1, params.prefetch_depth),
+        "decode": params.decode_workers or os.cpu_count() or 1,
+        "transform": max(1, params.transform_workers),
+        "collate": 1,
+    }
+
+    def _read(item: _Item) -> _Item:
+        item.payload, item.io_sec, item.tier = _read_raw_cached(
+            item.path, params.read_buffer_kb, cache)
+        item.nbytes = len(item.payload)
+        return item
+
+    def _decode(item: _Item) -> _Item:
+        if codec is not None:
+            start = time.perf_counter()
+            item.payload = get_codec(codec).decompress(item.payload)
+            item.decode_sec = max(time.perf_counter() - start, 1e-9)
+            item.nbytes = len(item.payload)
+        return item
+
+    def _transform(item: _Item) -> _Item:
+        item.payload = synthetic_transform(item.payload, params.transform_cost)
+        return item
+
+    pending: List[_Item] = []
+
+    def _batch() -> Optional[List[_Item]]:
+        if not pending:
+            return None
+        batch = list(pending)
+        pending.clear()
+        _collate([it.payload for it in batch])
+        for it in batch:
+            it.payload = None
+        return batch
+
+    def _collect(item: _Item) -> Optional[List[_Item]]:
+        pending.append(item)
+        if len(pending) >= params.batch_size:
+            return _batch()
+        return None
+
+    source: "queue.Queue" = queue.Queue()
+    for idx, path in enumerate(samples):
+        source.put(_Item(idx=idx, path=path))
+    for _ in range(workers["read"]):
+        source.put(_DONE)
+
+    queues = [source] + [queue.Queue(maxsize=depth) for _ in STAGES]
+    fns = {"read": _read, "decode": _decode, "transform": _transform,
+           "collate": _collect}
+    failed = threading.Event()
+    stages = []
+    for i, name in enumerate(STAGES):
+        downstream = workers[STAGES[i + 1]] if i + 1 < len(STAGES) else 1
+        stages.append(_Stage(
+            name, fns[name], workers[name], queues[i], queues[i + 1],
+            downstream, failed, flush=_batch if name == "collate" else None))
+
+    records: List[SampleRecord] = []
+    total_bytes = 0
+    ttfb = 0.0
+    epoch_start = time.perf_counter()
+    for stage in stages:
+        stage.start()
+
+    sink = queues[-1]
+    error: Optional[BaseException] = None
+    while True:
+        batch = sink.get()
+        if batch is _DONE:
+            break
+        if isinstance(batch, _Failed):
+            error = error or batch.exc
+            continue
+        if not records:
+            ttfb = time.perf_counter() - epoch_start
+        for it in batch:
+            dur = it.io_sec + it.decode_sec
+            total_bytes += it.nbytes
+            records.append(SampleRecord(
+                epoch=epoch, sample_idx=it.idx, path=it.path,
+                bytes_read=it.nbytes, duration_sec=dur,
+                throughput_mb_s=throughput_mb_s(it.nbytes, dur),
+                io_sec=it.io_sec, decode_sec=it.decode_sec, tier=it.tier,
+            ))
+
+    for stage in stages:
+        stage.join()
+    if error is not None:
+        raise error
+    epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
+    epoch_rec = EpochRecord(
+        epoch=epoch, strategy="pipeline", samples=len(samples),
+        total_bytes=total_bytes, duration_sec=epoch_dur,
+        throughput_mb_s=throughput_mb_s(total_bytes, epoch_dur),
+        ttfb_sec=ttfb,
+    )
+    return records, epoch_rec, [s.record(epoch, epoch_dur) for s in stages]
+
+
+def bottleneck(stage_records: List[StageRecord]) -> dict:
+    """Aggregate stage records and name the bottleneck stage."""
+    totals = {}
+    for r in stage_records:
+        agg = totals.setdefault(r.stage, {
+            "workers": r.workers, "items": 0, "busy_sec": 0.0,
+            "idle_sec": 0.0, "blocked_sec": 0.0, "wall_sec": 0.0})
+        agg["items"] += r.items
+        agg["busy_sec"] += r.busy_sec
+        agg["idle_sec"] += r.idle_sec
+        agg["blocked_sec"] += r.blocked_sec
+        agg["wall_sec"] += r.wall_sec
+    stages = {}
+    for name, agg in totals.items():
+        util = agg["busy_sec"] / max(agg["workers"] * agg["wall_sec"], 1e-9)
+        stages[name] = {
+            "workers": agg["workers"],
+            "items": agg["items"],
+            "busy_sec": round(agg["busy_sec"], 6),
+            "idle_sec": round(agg["idle_sec"], 6),
+            "blocked_sec": round(agg["blocked_sec"], 6),
+            "utilization": round(util, 4),
+        }
+    if not stages:
+        return {"bottleneck_stage": None, "bound": None, "stages": {}}
+    worst = max(stages, key=lambda n: stages[n]["utilization"])
+    return {
+        "bottleneck_stage": worst,
+        "bound": "storage" if worst == "read" else "cpu",
+        "stages": stages,
+    }
@@ -0,0 +1,227 @@
+"""Record-level random-range reads within large files.
+
+Tokenized LLM datasets (Megatron-style ``.bin`` + ``.idx``, ``.npy``
+memmaps) are a few very large files read as arrays of records at random
+offsets, not one file per sample. The ``random_range`` strategy models
+that: every discovered sample file is treated as an array of records and
+``os.pread`` is issued at random record offsets from a thread pool whose
+size is the I/O queue depth (``queue_depth``).
+
+Records are either ``fixed`` size, or ``variable``: boundaries are drawn
+between half and one and a half times the nominal size, like documents
+of different lengths behind an index file. Each epoch runs
+``range_reads`` reads for every size in ``record_sizes_kb`` so IOPS and
+latency percentiles can be compared per record size in one run. Record
+sizes larger than every file are skipped with a warning.
+
+Repeated epochs over files smaller than RAM are served by the page cache;
+use files larger than memory (or drop caches between runs) to measure the
+device.
+"""
+
+import bisect
+import os
+import random
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from benchmarks_common.stats import percentile, safe_median, throughput_mb_s
+
+from .loader import EpochRecord, LoaderParams, SampleRecord, require_samples
+
+LAYOUTS = ("fixed", "variable")
+
+
+@dataclass
+class RangeStat:
+    epoch: int
+    record_size_kb: int
+    reads: int
+    total_bytes: int
+    duration_sec: float
+    iops: float
+    throughput_mb_s: float
+    p50_sec: float
+    p95_sec: float
+    p99_sec: float
+
+
+class RecordIndex:
+    """Record boundaries across a list of files.
+
+    ``fixed`` layouts are computed on the fly; ``variable`` layouts keep a
+    per-file list of record start offsets, as an ``.idx`` file would.
+    """
+
+    def __init__(self, sizes: List[int], record_bytes: int,
+                 layout: str = "fixed", seed: int = 0):
+        if layout not in LAYOUTS:
+            raise ValueError(
+                f"Unknown record layout '{layout}'. "
+                f"Choose from: {', '.join(LAYOUTS)}")
+        self.record_bytes = record_bytes
+        self.layout = layout
+        self._starts: List[List[int]] = []
+        counts: List[int] = []
+        if layout == "fixed":
+            counts = [size // record_bytes for size in sizes]
+        else:
+            rng = random.Random(f"{seed}:{record_bytes}")
+            lo, hi = max(1, record_bytes // 2), record_bytes * 3 // 2
+            for size in sizes:
+                starts, offset = [], 0
+                while True:
+                    length = rng.randint(lo, hi)
+                    if offset + length > size:
+                        break
+                    starts.append(offset)
+                    offset += length
+                starts.append(offset)  # end sentinel
+                self._starts.append(starts)
+                counts.append(len(starts) - 1)
+        self._cumulative: List[int] = []
+        total = 0
+        for c in counts:
+            total += c
+            self._cumulative.append(total)
+        self.records = total
+
+    def locate(self, record: int) -> Tuple[int, int, int]:
+        """Return ``(file_idx, offset, length)`` of global *record*."""
+        f = bisect.bisect_right(self._cumulative, record)
+        local = record - (self._cumulative[f - 1] if f else 0)
+        if self.layout == "fixed":
+            return f, local * self.record_bytes, self.record_bytes
+        starts = self._starts[f]
+        return f, starts[local], starts[local + 1] - starts[local]
+
+
+def _pread(fd: int, offset: int, length: int) -> Tuple[int, float, float]:
+    """Read *length* bytes at *offset*.
+
+    Returns ``(bytes_read, latency_sec, done)`` with *done* the
+    ``perf_counter`` time the read completed.
+    """
+    start = time.perf_counter()
+    got = 0
+    while got < length:
+        chunk = os.pread(fd, length - got, offset + got)
+        if not chunk:
+            break
+        got += len(chunk)
+    done = time.perf_counter()
+    return got, max(done - start, 1e-9), done
+
+
+def run_random_range(params: LoaderParams) -> tuple:
+    """Run random record reads for every size in ``record_sizes_kb``.
+
+    Returns ``(sample_records, epoch_records, range_stats)``; one sample
+    record per read, with ``sample_idx`` the global record number.
+    """
+    if params.compressed:
+        raise ValueError("random_range reads raw records; "
+                         "compressed samples are not supported")
+    samples = require_samples(params)
+    sizes = [os.path.getsize(p) for p in samples]
+    seed = params.shuffle_seed or 0
+    indexes = {}
+    for kb in params.record_sizes_kb:
+        index = RecordIndex(sizes, kb * 1024, params.record_layout, seed)
+        if index.records == 0:
+            warnings.warn(f"Skipping record size {kb} KiB: larger than every "
+                          f"file in {params.data_root}")
+            continue
+        indexes[kb] = index
+    if not indexes:
+        raise ValueError(
+            f"Every record size ({', '.join(map(str, params.record_sizes_kb))} "
+            f"KiB) is larger than every file in {params.data_root}")
+
+    fds = [os.open(p, os.O_RDONLY) for p in samples]
+    all_samples: List[SampleRecord] = []
+    all_epochs: List[EpochRecord] = []
+    all_stats: List[RangeStat] = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, params.queue_depth)) as pool:
+            for epoch in range(1, params.epochs + 1):
+                epoch_start = time.perf_counter()
+                ttfb = None
+                epoch_bytes = 0
+                epoch_reads = 0
+                for kb, index in indexes.items():
+                    rng = random.Random(f"{seed}:{epoch}:{kb}")
+                    picks = [rng.randrange(index.records)
+                             for _ in range(max(1, params.range_reads))]
+                    locs = [index.locate(r) for r in picks]
+                    start = time.perf_counter()
+                    results = list(pool.map(
+                        lambda loc: _pread(fds[loc[0]], loc[1], loc[2]), locs))
+                    dur = max(time.perf_counter() - start, 1e-9)
+                    if ttfb is None:
+                        # The first read to complete, not the first submitted.
+                        ttfb = min(done for _, _, done in results) - epoch_start
+                    latencies = [lat for _, lat, _ in results]
+                    nbytes = sum(n for n, _, _ in results)
+                    for record, (f, _, _), (n, lat, _) in zip(picks, locs,
+                                                               results):
+                        all_samples.append(SampleRecord(
+                            epoch=epoch, sample_idx=record, path=samples[f],
+                            bytes_read=n, duration_sec=lat,
+                            throughput_mb_s=throughput_mb_s(n, lat), io_sec=lat,
+                        ))
+                    all_stats.append(RangeStat(
+                        epoch=epoch, record_size_kb=kb, reads=len(results),
+                        total_bytes=nbytes, duration_sec=dur,
+                        iops=len(results) / dur,
+                        throughput_mb_s=throughput_mb_s(nbytes, dur),
+                        p50_sec=safe_median(latencies),
+                        p95_sec=percentile(latencies, 0.95),
+                        p99_sec=percentile(latencies, 0.99),
+                    ))
+                    epoch_bytes += nbytes
+                    epoch_reads += len(results)
+                epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
+                all_epochs.append(EpochRecord(
+                    epoch=epoch, strategy="random_range", samples=epoch_reads,
+                    total_bytes=epoch_bytes, duration_sec=epoch_dur,
+                    throughput_mb_s=throughput_mb_s(epoch_bytes, epoch_dur),
+                    ttfb_sec=ttfb or 0.0,
+                ))
+    finally:
+        for fd in fds:
+            os.close(fd)
+    return all_samples, all_epochs, all_stats
+
+
+def range_summary(stats: List[RangeStat],
+                  records: List[SampleRecord]) -> Dict[str, Any]:
+    """IOPS and latency percentiles per record size across all epochs."""
+    by_size: Dict[int, List[RangeStat]] = {}
+    for s in stats:
+        by_size.setdefault(s.record_size_kb, []).append(s)
+    # Sample records are appended size by size in the same order as stats.
+    latencies: Dict[int, List[float]] = {kb: [] for kb in by_size}
+    pos = 0
+    for s in stats:
+        latencies[s.record_size_kb].extend(
+            r.io_sec for r in records[pos:pos + s.reads])
+        pos += s.reads
+    out: Dict[str, Any] = {}
+    for kb, rows in by_size.items():
+        reads = sum(r.reads for r in rows)
+        dur = sum(r.duration_sec for r in rows)
+        nbytes = sum(r.total_bytes for r in rows)
+        lat = latencies[kb]
+        out[kb] = {
+            "reads": reads,
+            "iops": round(reads / max(dur, 1e-9), 1),
+            "throughput_mb_s": round(throughput_mb_s(nbytes, dur), 2),
+            "p50_sec": round(safe_median(lat), 6),
+            "p95_sec": round(percentile(lat, 0.95), 6),
+            "p99_sec": round(percentile(lat, 0.99), 6),
+        }
+    return out
@@ -0,0 +1,183 @@
+"""Mid-epoch resume: restore iterator state versus replaying the epoch.
+
+Preempted training jobs restart from a checkpoint that is usually taken in
+the middle of an epoch. A loader that can only start epochs from the
+beginning has to *replay* the consumed prefix (read and discard every
+sample already seen) before the first useful batch. A loader with
+checkpointable state restores a :class:`~.loader.LoaderState` (epoch,
+position, seed, shuffle buffer) and *skips* straight to the next index.
+
+Each trial picks a random epoch and a random position within it, saves the
+iterator state as JSON to ``state_path`` (never inside ``data_root``, which
+may be read-only), then measures both modes:
+
+- ``skip``: load the state file, restore the iterator, read one batch,
+- ``replay``: rebuild the epoch order, read and discard ``position``
+  samples, read one batch.
+
+Resume TTFB is the time to the first full batch. Both modes must yield
+the same batch; ``consistent`` records that they did. The mode that runs
+first alternates between trials so neither always finds the batch in the
+page cache.
+"""
+
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from benchmarks_common.stats import safe_mean, safe_median, throughput_mb_s
+
+from .loader import (EpochRecord, LoaderParams, LoaderState, SampleIterator,
+                     SampleRecord, _codec_name, _read_cached,
+                     params_work_dir, require_samples)
+
+MODES = ("skip", "replay")
+STATE_FILE = "loader-state.json"
+
+
+@dataclass
+class ResumeRecord:
+    trial: int
+    mode: str
+    epoch: int
+    position: int          # samples consumed before the checkpoint
+    ttfb_sec: float        # restart to first full batch
+    samples_reread: int
+    bytes_reread: int
+    state_bytes: int       # size of the serialized state
+    consistent: bool       # same first batch as the other mode
+
+
+def _read_batch(samples: List[str], it: SampleIterator, params: LoaderParams,
+                trial: int, records: List[SampleRecord]) -> Tuple[List[int], int]:
+    """Read the next ``batch_size`` samples of *it*; return (indices, bytes)."""
+    picked: List[int] = []
+    total = 0
+    for idx in it:
+        nbytes, io_sec, decode_sec, tier = _read_cached(
+            samples[idx], params.read_buffer_kb, _codec_name(params), None)
+        dur = io_sec + decode_sec
+        records.append(SampleRecord(
+            epoch=trial, sample_idx=idx, path=samples[idx], bytes_read=nbytes,
+            duration_sec=dur, throughput_mb_s=throughput_mb_s(nbytes, dur),
+            io_sec=io_sec, decode_sec=decode_sec, tier=tier,
+        ))
+        picked.append(idx)
+        total += nbytes
+        if len(picked) == params.batch_size:
+            break
+    return picked, total
+
+
+def _skip(samples: List[str], state_path: str, params: LoaderParams,
+          trial: int, records: List[SampleRecord]) -> tuple:
+    start = time.perf_counter()
+    with open(state_path) as f:
+        it = SampleIterator.from_state(LoaderState.from_json(f.read()))
+    batch, nbytes = _read_batch(samples, it, params, trial, records)
+    return batch, nbytes, time.perf_counter() - start, 0, 0
+
+
+def _replay(samples: List[str], state: LoaderState, params: LoaderParams,
+            trial: int, records: List[SampleRecord]) -> tuple:
+    codec = _codec_name(params)
+    start = time.perf_counter()
+    it = SampleIterator(state.num_samples, state.order, state.seed,
+                        state.buffer_size)
+    it.start_epoch(state.epoch)
+    reread = 0
+    for _ in range(state.position):
+        nbytes, _, _, _ = _read_cached(samples[next(it)],
+                                       params.read_buffer_kb, codec, None)
+        reread += nbytes
+    batch, nbytes = _read_batch(samples, it, params, trial, records)
+    return (batch, nbytes, time.perf_counter() - start, state.position,
+            reread)
+
+
+def run_resume(params: LoaderParams) -> tuple:
+    """Run ``resume_trials`` mid-epoch restarts in both modes.
+
+    Returns ``(sample_records, epoch_records, resume_records)``; sample
+    records cover the first batch after each restart, with ``epoch`` the
+    trial number, and there is one epoch record per trial and mode.
+    """
+    samples = require_samples(params)
+    n = len(samples)
+    seed = params.shuffle_seed if params.shuffle_seed is not None else 0
+    rng = random.Random(f"resume:{seed}")
+    state_path = (params.state_path
+                  or os.path.join(params_work_dir(params), STATE_FILE))
+    os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+
+    records: List[SampleRecord] = []
+    epochs: List[EpochRecord] = []
+    results: List[ResumeRecord] = []
+    try:
+        for trial in range(1, max(1, params.resume_trials) + 1):
+            epoch = rng.randint(1, params.epochs)
+            position = rng.randrange(1, n) if n > 1 else 0
+            it = SampleIterator(n, params.resume_order, seed,
+                                params.shuffle_buffer)
+            it.start_epoch(epoch)
+            for _ in range(position):
+                next(it)
+            state = it.state()
+            text = state.to_json()
+            with open(state_path, "w") as f:
+                f.write(text)
+
+            modes = MODES if trial % 2 else MODES[::-1]
+            runs: Dict[str, tuple] = {}
+            for mode in modes:
+                if mode == "skip":
+                    runs[mode] = _skip(samples, state_path, params, trial,
+                                       records)
+                else:
+                    runs[mode] = _replay(samples, state, params, trial,
+                                         records)
+            consistent = runs["skip"][0] == runs["replay"][0]
+            for mode in MODES:
+                batch, nbytes, ttfb, reread_samples, reread = runs[mode]
+                results.append(ResumeRecord(
+                    trial=trial, mode=mode, epoch=epoch, position=position,
+                    ttfb_sec=ttfb, samples_reread=reread_samples,
+                    bytes_reread=reread, state_bytes=len(text),
+                    consistent=consistent,
+                ))
+                epochs.append(EpochRecord(
+                    epoch=trial, strategy=f"resume_{mode}",
+                    samples=len(batch) + reread_samples,
+                    total_bytes=nbytes + reread, duration_sec=ttfb,
+                    throughput_mb_s=throughput_mb_s(nbytes + reread, ttfb),
+                    ttfb_sec=ttfb,
+                ))
+    finally:
+        if os.path.exists(state_path):
+            os.remove(state_path)
+    return records, epochs, results
+
+
+def resume_summary(results: List[ResumeRecord],
+                   params: LoaderParams) -> Dict[str, Any]:
+    """Resume TTFB and bytes reread per mode."""
+    out: Dict[str, Any] = {
+        "order": params.resume_order,
+        "trials": len({r.trial for r in results}),
+        "consistent": all(r.consistent for r in results),
+    }
+    for mode in MODES:
+        rows = [r for r in results if r.mode == mode]
+        out[mode] = {
+            "median_ttfb_sec": round(safe_median([r.ttfb_sec for r in rows]), 6),
+            "mean_ttfb_sec": round(safe_mean([r.ttfb_sec for r in rows]), 6),
+            "mean_samples_reread": round(
+                safe_mean([r.samples_reread for r in rows]), 1),
+            "total_bytes_reread": sum(r.bytes_reread for r in rows),
+        }
+    out["state_bytes"] = max((r.state_bytes for r in results), default=0)
+    skip, replay = out["skip"]["median_ttfb_sec"], out["replay"]["median_ttfb_sec"]
+    out["replay_over_skip"] = round(replay / skip, 2) if skip > 0 else None
+    return out
@@ -4,13 +4,29 @@ import argparse
 import os
 from typing import Any, Dict, List
 
+from benchmarks_common.affinity import AFFINITY_MODES
 from benchmarks_common.cli import load_yaml_config, parse_bool
+from benchmarks_common.compression import available_codecs
 from benchmarks_common.metadata import build_metadata
 from benchmarks_common.outputs import write_csv, write_yaml
 from benchmarks_common.stats import percentile, safe_mean, safe_median
+from benchmarks_common.sysinfo import path_numa_node
 
-from .dataset_gen import generate_dataset
-from .loader import EpochRecord, LoaderParams, SampleRecord, run_loader
+from .dataset_gen import generate_dataset_report
+from .loader import (MMAP_ADVICE, MMAP_TOUCH, ORDERS, READ_STRATEGIES,
+                     EpochRecord, LoaderParams, SampleRecord,
+                     discover_samples_report,
+                     params_affinity, params_cache, run_loader)
+from .autotune import AutotuneStep, converged_settings, run_autotune
+from .cache import POLICIES, cache_epoch_stats
+from .consumer import (COMPUTE_DISTRIBUTIONS, StepRecord, TrainingConsumer,
+                       consumer_summary)
+from .distributed import RankEpochRecord, rank_summary, run_distributed
+from .pipeline import StageRecord, bottleneck, run_pipeline
+from .random_range import LAYOUTS, RangeStat, range_summary, run_random_range
+from .resume import STATE_FILE, ResumeRecord, resume_summary, run_resume
+from .tokens import (DTYPES, READERS, TOKEN_FILE, TokenStat,
+                     generate_token_file, run_tokens)
 
 
 def main() -> None:
@@ -20,7 +36,9 @@ def main() -> None:
     parser.add_argument("--run-name", type=str, default="dl-run")
     parser.add_argument("--data-root", type=str, default="./data/dataloader")
     parser.add_argument("--strategy", type=str, default="sequential",
-                        choices=["sequential", "random", "mmap", "prefetch"],
+                        choices=["sequential", "random", "mmap", "prefetch",
+                                 "decode_pool", "pipeline", "autotune",
+                                 "random_range", "tokens", "resume"],
                         help="Read strategy to benchmark")
     parser.add_argument("--epochs", type=int, default=3)
     parser.add_argument("--prefetch-depth", type=int, default=4,
@@ -29,10 +47,107 @@ def main() -> None:
     parser.add_argument("--batch-size", type=int, default=32)
     parser.add_argument("--shuffle-seed", type=int, default=42)
     parser.add_argument("--compressed", type=str, default="false",
-                        help="Expect gzip-compressed samples")
+                        help="Expect compressed samples (see --codec)")
+    parser.add_argument("--codec", type=str, default="gzip",
+                        choices=available_codecs(),
+                        help="Compression codec for compressed samples")
+    parser.add_argument("--entropy", type=float, default=1.0,
+                        help="Payload entropy for auto-generated samples (0..1)")
+    parser.add_argument("--decode-workers", type=int, default=0,
+                        help="Decode processes for decode_pool, decode threads "
+                             "for pipeline (0 = cpu count)")
+    parser.add_argument("--transform-workers", type=int, default=1,
+                        help="Transform threads for pipeline strategy")
+    parser.add_argument("--transform-cost", type=int, default=1,
+                        help="Synthetic transform passes per sample (pipeline)")
+    parser.add_argument("--queue-depth", type=int, default=8,
+                        help="Bounded queue size between pipeline stages")
+    parser.add_argument("--record-sizes-kb", type=str, default="4,64,1024,4096",
+                        help="Comma-separated record sizes for random_range")
+    parser.add_argument("--record-layout", type=str, default="fixed",
+                        choices=list(LAYOUTS),
+                        help="Fixed or variable-size records (random_range)")
+    parser.add_argument("--range-reads", type=int, default=1024,
+                        help="random_range reads per record size per epoch")
+    parser.add_argument("--compute-ms", type=float, default=0.0,
+                        help="Simulated training compute per batch in ms "
+                             "(0 = no consumer)")
+    parser.add_argument("--compute-dist", type=str, default="fixed",
+                        choices=list(COMPUTE_DISTRIBUTIONS),
+                        help="Distribution of per-batch compute time")
+    parser.add_argument("--compute-jitter", type=float, default=0.1,
+                        help="Coefficient of variation for normal/lognormal compute")
+    parser.add_argument("--consumer-prefetch", type=int, default=2,
+                        help="Batches buffered ahead of the consumer")
+    parser.add_argument("--mmap-touch", type=str, default="page",
+                        choices=list(MMAP_TOUCH),
+                        help="mmap: touch one byte per page, or crc32 every byte")
+    parser.add_argument("--mmap-advice", type=str, default="none",
+                        choices=list(MMAP_ADVICE),
+                        help="madvise hint for mmap mappings")
+    parser.add_argument("--mmap-packed", type=str, default="false",
+                        help="mmap: map one packed file for the whole run")
+    parser.add_argument("--token-reader", type=str, default="mmap",
+                        choices=list(READERS),
+                        help="tokens strategy: mmap+memoryview or pread")
+    parser.add_argument("--seq-len", type=int, default=2048,
+                        help="Tokens per packed training sequence")
+    parser.add_argument("--token-dtype", type=str, default="uint16",
+                        choices=list(DTYPES),
+                        help="Token width for an auto-generated token file")
+    parser.add_argument("--token-count", type=int, default=8 * 1024 * 1024,
+                        help="Tokens in an auto-generated token file")
+    parser.add_argument("--mean-doc-tokens", type=int, default=1024,
+                        help="Mean document length for an auto-generated token file")
+    parser.add_argument("--resume-order", type=str, default="random",
+                        choices=list(ORDERS),
+                        help="resume strategy: sample order being checkpointed")
+    parser.add_argument("--shuffle-buffer", type=int, default=256,
+                        help="Shuffle buffer size for --resume-order buffer")
+    parser.add_argument("--resume-trials", type=int, default=3,
+                        help="Mid-epoch restarts measured by the resume strategy")
+    parser.add_argument("--state-path", type=str, default="",
+                        help="resume strategy: iterator state file "
+                             "(default: loader-state.json in the run directory)")
+    parser.add_argument("--autotune-window", type=int, default=32,
+                        help="Samples per autotune measurement window")
+    parser.add_argument("--autotune-max-workers", type=int, default=0,
+                        help="Autotune worker cap (0 = 4 x cpu count)")
+    parser.add_argument("--autotune-memory-mb", type=int, default=512,
+                        help="Autotune memory budget for queue + read buffers")
+    parser.add_argument("--cache-memory-mb", type=float, default=0,
+                        help="In-memory LRU cache tier budget (0 = off)")
+    parser.add_argument("--cache-dir", type=str, default="",
+                        help="Local-disk cache tier directory")
+    parser.add_argument("--cache-disk-mb", type=float, default=0,
+                        help="Disk cache tier budget (0 = off)")
+    parser.add_argument("--cache-policy", type=str, default="lru",
+                        choices=list(POLICIES),
+                        help="Disk cache tier eviction policy")
+    parser.add_argument("--world-size", type=int, default=1,
+                        help="Loader processes (ranks) to launch on this node")
+    parser.add_argument("--affinity", type=str, default="os",
+                        choices=list(AFFINITY_MODES),
+                        help="Worker placement: OS scheduler, CPU list, "
+                             "spread across NUMA nodes, or one node")
+    parser.add_argument("--cpu-list", type=str, default="",
+                        help="CPUs for --affinity cpus, e.g. 0-7,16")
+    parser.add_argument("--numa-node", type=int, default=-1,
+                        help="Node for --affinity node (-1 = node of the "
+                             "data-root device)")
     parser.add_argument("--auto-generate", type=str, default="true")
     parser.add_argument("--sample-count", type=int, default=200)
     parser.add_argument("--sample-size-kb", type=int, default=512)
+    parser.add_argument("--gen-workers", type=int, default=1,
+                        help="Processes for auto-generating samples")
+    parser.add_argument("--manifest", type=str, default="true",
+                        help="Discover samples via a persisted manifest "
+                             "instead of listing data-root every run")
+    parser.add_argument("--manifest-path", type=str, default="",
+                        help="Manifest file (default: inside data-root)")
+    parser.add_argument("--work-dir", type=str, default="",
+                        help="Directory for derived files such as the packed "
+                             "mmap file (default: <data-root>.work)")
     parser.add_argument("--outdir", type=str, default="metrics")
     args = parser.parse_args()
 
@@ -46,18 +161,81 @@ def main() -> None:
         args.read_buffer_kb = cfg.get("benchmark", {}).get("read_buffer_kb", args.read_buffer_kb)
         args.batch_size = cfg.get("benchmark", {}).get("batch_size", args.batch_size)
         args.compressed = str(cfg.get("benchmark", {}).get("compressed", args.compressed))
+        args.codec = cfg.get("benchmark", {}).get("codec", args.codec)
+        args.decode_workers = cfg.get("benchmark", {}).get("decode_workers", args.decode_workers)
+        args.transform_workers = cfg.get("benchmark", {}).get("transform_workers", args.transform_workers)
+        args.transform_cost = cfg.get("benchmark", {}).get("transform_cost", args.transform_cost)
+        args.queue_depth = cfg.get("benchmark", {}).get("queue_depth", args.queue_depth)
+        args.record_sizes_kb = str(cfg.get("random_range", {}).get("record_sizes_kb", args.record_sizes_kb))
+        args.record_layout = cfg.get("random_range", {}).get("layout", args.record_layout)
+        args.range_reads = cfg.get("random_range", {}).get("reads", args.range_reads)
+        args.compute_ms = cfg.get("consumer", {}).get("compute_ms", args.compute_ms)
+        args.compute_dist = cfg.get("consumer", {}).get("compute_dist", args.compute_dist)
+        args.compute_jitter = cfg.get("consumer", {}).get("compute_jitter", args.compute_jitter)
+        args.consumer_prefetch = cfg.get("consumer", {}).get("prefetch_batches", args.consumer_prefetch)
+        args.mmap_touch = cfg.get("mmap", {}).get("touch", args.mmap_touch)
+        args.mmap_advice = cfg.get("mmap", {}).get("advice", args.mmap_advice)
+        args.mmap_packed = str(cfg.get("mmap", {}).get("packed", args.mmap_packed))
+        args.token_reader = cfg.get("tokens", {}).get("reader", args.token_reader)
+        args.seq_len = cfg.get("tokens", {}).get("seq_len", args.seq_len)
+        args.token_dtype = cfg.get("tokens", {}).get("dtype", args.token_dtype)
+        args.token_count = cfg.get("tokens", {}).get("count", args.token_count)
+        args.mean_doc_tokens = cfg.get("tokens", {}).get("mean_doc_tokens", args.mean_doc_tokens)
+        args.resume_order = cfg.get("resume", {}).get("order", args.resume_order)
+        args.shuffle_buffer = cfg.get("resume", {}).get("shuffle_buffer", args.shuffle_buffer)
+        args.resume_trials = cfg.get("resume", {}).get("trials", args.resume_trials)
+        args.state_path = cfg.get("resume", {}).get("state_path", args.state_path)
+        args.autotune_window = cfg.get("autotune", {}).get("window", args.autotune_window)
+        args.autotune_max_workers = cfg.get("autotune", {}).get("max_workers", args.autotune_max_workers)
+        args.autotune_memory_mb = cfg.get("autotune", {}).get("memory_mb", args.autotune_memory_mb)
+        args.cache_memory_mb = cfg.get("cache", {}).get("memory_mb", args.cache_memory_mb)
+        args.cache_dir = cfg.get("cache", {}).get("dir", args.cache_dir)
+        args.cache_disk_mb = cfg.get("cache", {}).get("disk_mb", args.cache_disk_mb)
+        args.cache_policy = cfg.get("cache", {}).get("policy", args.cache_policy)
+        args.world_size = cfg.get("distributed", {}).get("world_size", args.world_size)
+        args.affinity = cfg.get("affinity", {}).get("mode", args.affinity)
+        args.cpu_list = str(cfg.get("affinity", {}).get("cpus", args.cpu_list))
+        args.numa_node = cfg.get("affinity", {}).get("numa_node", args.numa_node)
+        args.entropy = cfg.get("data", {}).get("entropy", args.entropy)
+        args.gen_workers = cfg.get("data", {}).get("gen_workers", args.gen_workers)
+        args.manifest = str(cfg.get("data", {}).get("manifest", args.manifest))
+        args.manifest_path = cfg.get("data", {}).get("manifest_path", args.manifest_path)
+        args.work_dir = cfg.get("data", {}).get("work_dir", args.work_dir)
         args.outdir = cfg.get("output", {}).get("dir", args.outdir)
 
+    if args.world_size > 1 and args.strategy not in READ_STRATEGIES:
+        parser.error(
+            f"--strategy {args.strategy} does not support --world-size > 1; "
+            f"multi-rank runs support: {', '.join(READ_STRATEGIES)}")
+
     compressed = parse_bool(args.compressed)
+    use_manifest = parse_bool(args.manifest)
 
-    # Auto-generate data if needed
-    from .loader import discover_samples
-    samples = discover_samples(args.data_root, compressed)
-    if not samples and parse_bool(args.auto_generate):
-        print(f"Auto-generating {args.sample_count} × {args.sample_size_kb} KiB "
-              f"samples in {args.data_root}...")
-        generate_dataset(args.data_root, args.sample_count,
-                         args.sample_size_kb, compress=compressed)
+    # Auto-generate data if needed. Enumeration is timed: a real job pays
+    # it before the first batch.
+    discovery = None
+    generation = None
+    if args.strategy == "tokens":
+        if (not os.path.exists(os.path.join(args.data_root, TOKEN_FILE))
+                and parse_bool(args.auto_generate)):
+            print(f"Auto-generating {args.token_count} {args.token_dtype} "
+                  f"tokens in {args.data_root}...")
+            generate_token_file(args.data_root, args.token_count,
+                                args.token_dtype, args.mean_doc_tokens)
+    else:
+        samples, discovery = discover_samples_report(
+            args.data_root, compressed, args.codec, use_manifest,
+            args.manifest_path)
+        if not samples and parse_bool(args.auto_generate):
+            print(f"Auto-generating {args.sample_count} × {args.sample_size_kb} KiB "
+                  f"samples in {args.data_root}...")
+            generation = generate_dataset_report(
+                args.data_root, args.sample_count, args.sample_size_kb,
+                compress=compressed, codec=args.codec, entropy=args.entropy,
+                workers=max(1, args.gen_workers))
+            samples, discovery = discover_samples_report(
+                args.data_root, compressed, args.codec, use_manifest,
+                args.manifest_path)
 
     params = LoaderParams(
         data_root=args.data_root,
@@ -68,9 +246,86 @@ def main() -> None:
         batch_size=max(1, args.batch_size),
         shuffle_seed=args.shuffle_seed,
         compressed=compressed,
+        codec=args.codec,
+        decode_workers=max(0, args.decode_workers),
+        transform_workers=max(1, args.transform_workers),
+        transform_cost=max(0, args.transform_cost),
+        queue_depth=max(1, args.queue_depth),
+        autotune_window=max(1, args.autotune_window),
+        autotune_max_workers=max(0, args.autotune_max_workers),
+        autotune_memory_mb=max(1, args.autotune_memory_mb),
+        cache_memory_mb=max(0.0, float(args.cache_memory_mb)),
+        cache_dir=args.cache_dir or "",
+        cache_disk_mb=max(0.0, float(args.cache_disk_mb)),
+        cache_policy=args.cache_policy,
+        use_manifest=use_manifest,
+        manifest_path=args.manifest_path or "",
+        work_dir=args.work_dir or "",
+        record_sizes_kb=_parse_sizes(args.record_sizes_kb),
+        record_layout=args.record_layout,
+        range_reads=max(1, args.range_reads),
+        compute_ms=max(0.0, float(args.compute_ms)),
+        compute_dist=args.compute_dist,
+        compute_jitter=max(0.0, float(args.compute_jitter)),
+        consumer_prefetch=max(1, args.consumer_prefetch),
+        mmap_touch=args.mmap_touch,
+        mmap_advice=args.mmap_advice,
+        mmap_packed=parse_bool(args.mmap_packed),
+        token_reader=args.token_reader,
+        seq_len=max(1, args.seq_len),
+        token_dtype=args.token_dtype,
+        token_count=max(2, args.token_count),
+        mean_doc_tokens=max(1, args.mean_doc_tokens),
+        resume_order=args.resume_order,
+        shuffle_buffer=max(1, args.shuffle_buffer),
+        resume_trials=max(1, args.resume_trials),
+        state_path=(args.state_path
+                    or os.path.join(args.outdir, args.run_name, STATE_FILE)),
+        affinity=args.affinity,
+        cpu_list=args.cpu_list or "",
+        numa_node=int(args.numa_node),
     )
+    plan = params_affinity(params)  # validate before starting workers
 
-    sample_records, epoch_records = run_loader(params)
+    # Multi-rank runs build one cache per rank inside each process.
+    cache = params_cache(params) if args.world_size <= 1 else None
+    stage_records: List[StageRecord] = []
+    autotune_steps: List[AutotuneStep] = []
+    autotune_final: Dict[str, int] = {}
+    rank_records: List[RankEpochRecord] = []
+    range_stats: List[RangeStat] = []
+    token_stats: List[TokenStat] = []
+    resume_records: List[ResumeRecord] = []
+    step_records: List[StepRecord] = []
+    if args.world_size > 1:
+        sample_records, epoch_records, rank_records = run_distributed(
+            params, args.world_size)
+    elif params.strategy == "pipeline":
+        sample_records, epoch_records, stage_records = run_pipeline(params, cache)
+    elif params.strategy == "autotune":
+        sample_records, epoch_records, autotune_steps, autotune_final = \
+            run_autotune(params, cache)
+    elif params.strategy == "random_range":
+        sample_records, epoch_records, range_stats = run_random_range(params)
+    elif params.strategy == "tokens":
+        sample_records, epoch_records, token_stats = run_tokens(params)
+    elif params.strategy == "resume":
+        sample_records, epoch_records, resume_records = run_resume(params)
+    else:
+        consumer = TrainingConsumer(params) if params.compute_ms > 0 else None
+        try:
+            sample_records, epoch_records = run_loader(params, cache, consumer)
+        finally:
+            if consumer is not None:
+                step_records = consumer.finish()
+    pinned = params.affinity != "os" and (
+        args.world_size > 1 or params.strategy in ("prefetch", "decode_pool"))
+    if params.affinity != "os" and not pinned:
+        print("--affinity applies to prefetch and decode_pool workers and to "
+              "ranks with --world-size > 1; this run was not pinned.")
+    if params.compute_ms > 0 and not step_records:
+        print("--compute-ms applies to sequential, random, mmap, prefetch "
+              "and decode_pool single-rank runs; no consumer was simulated.")
 
     # Output paths
     run_dir = os.path.join(args.outdir, args.run_name)
@@ -83,6 +338,70 @@ def main() -> None:
     write_csv(epochs_csv, _epoch_rows(epoch_records))
 
     summary = _build_summary(sample_records, epoch_records, params)
+    if discovery is not None:
+        summary["discovery"] = discovery.as_dict()
+        if epoch_records:
+            summary["discovery"]["ttfb_with_discovery_sec"] = round(
+                discovery.duration_sec + epoch_records[0].ttfb_sec, 6)
+    if generation is not None:
+        summary["generation"] = {
+            "samples": generation.generated,
+            "workers": generation.workers,
+            "total_bytes": generation.total_bytes,
+            "duration_sec": round(generation.duration_sec, 4),
+        }
+    if stage_records:
+        write_csv(os.path.join(run_dir, "loader_stages.csv"),
+                  _stage_rows(stage_records))
+        summary["pipeline"] = bottleneck(stage_records)
+    if autotune_steps:
+        write_csv(os.path.join(run_dir, "loader_autotune.csv"),
+                  _autotune_rows(autotune_steps))
+        summary["autotune"] = converged_settings(autotune_steps,
+                                                 autotune_final)
+    if range_stats:
+        write_csv(os.path.join(run_dir, "loader_ranges.csv"),
+                  _range_rows(range_stats))
+        summary["random_range"] = range_summary(range_stats, sample_records)
+    if step_records:
+        write_csv(os.path.join(run_dir, "loader_steps.csv"),
+                  _step_rows(step_records))
+        summary["consumer"] = consumer_summary(step_records, params)
+    if params.strategy == "mmap":
+        summary["mmap"] = {
+            "touch": params.mmap_touch,
+            "advice": params.mmap_advice,
+            # False if any mapping rejected the hint (e.g. no THP support).
+            "advice_applied": all(e.madvise_applied for e in epoch_records),
+            "packed": params.mmap_packed,
+        }
+    if token_stats:
+        write_csv(os.path.join(run_dir, "loader_tokens.csv"),
+                  _token_rows(token_stats))
+        summary["tokens"] = _token_summary(token_stats, params)
+    if resume_records:
+        write_csv(os.path.join(run_dir, "loader_resume.csv"),
+                  _resume_rows(resume_records))
+        summary["resume"] = resume_summary(resume_records, params)
+    if params.affinity != "os":
+        workers = (args.world_size if args.world_size > 1
+                   else params.prefetch_depth)
+        summary["affinity"] = plan.describe(workers)
+        summary["affinity"]["applied"] = pinned
+        summary["affinity"]["data_numa_node"] = path_numa_node(params.data_root)
+        summary["affinity"]["mean_epoch_throughput_mb_s"] = (
+            summary["mean_epoch_throughput_mb_s"])
+    if rank_records:
+        write_csv(os.path.join(run_dir, "loader_ranks.csv"),
+                  _rank_rows(rank_records))
+        summary["distributed"] = rank_summary(rank_records, epoch_records)
+    if params.cache_memory_mb > 0 or (params.cache_dir and params.cache_disk_mb > 0):
+        cache_rows = cache_epoch_stats(sample_records)
+        write_csv(os.path.join(run_dir, "loader_cache.csv"),
+                  [list(cache_rows[0])] + [list(r.values()) for r in cache_rows])
+        summary["cache"] = _cache_summary(
+            sample_records, cache_rows,
+            cache.evictions() if cache is not None else {}, params)
     write_yaml(summary_yaml, summary)
     write_yaml(meta_yaml, build_metadata(
         run_name=args.run_name,
@@ -95,38 +414,231 @@ def main() -> None:
             "read_buffer_kb": params.read_buffer_kb,
             "batch_size": params.batch_size,
             "compressed": params.compressed,
+            "codec": params.codec,
+            "decode_workers": params.decode_workers,
+            "entropy": args.entropy,
+            "transform_workers": params.transform_workers,
+            "transform_cost": params.transform_cost,
+            "queue_depth": params.queue_depth,
+            "autotune_window": params.autotune_window,
+            "autotune_max_workers": params.autotune_max_workers,
+            "autotune_memory_mb": params.autotune_memory_mb,
+            "cache_memory_mb": params.cache_memory_mb,
+            "cache_dir": params.cache_dir,
+            "cache_disk_mb": params.cache_disk_mb,
+            "cache_policy": params.cache_policy,
+            "world_size": args.world_size,
+            "gen_workers": args.gen_workers,
+            "manifest": use_manifest,
+            "record_sizes_kb": list(params.record_sizes_kb),
+            "record_layout": params.record_layout,
+            "range_reads": params.range_reads,
+            "compute_ms": params.compute_ms,
+            "compute_dist": params.compute_dist,
+            "compute_jitter": params.compute_jitter,
+            "consumer_prefetch": params.consumer_prefetch,
+            "mmap_touch": params.mmap_touch,
+            "mmap_advice": params.mmap_advice,
+            "mmap_packed": params.mmap_packed,
+            "token_reader": params.token_reader,
+            "seq_len": params.seq_len,
+            "token_dtype": params.token_dtype,
+            "token_count": params.token_count,
+            "mean_doc_tokens": params.mean_doc_tokens,
+            "resume_order": params.resume_order,
+            "shuffle_buffer": params.shuffle_buffer,
+            "resume_trials": params.resume_trials,
+            "state_path": params.state_path,
+            "affinity": params.affinity,
+            "cpu_list": params.cpu_list,
+            "numa_node": params.numa_node,
+            "manifest_path": params.manifest_path,
         },
         summary=summary,
     ))
 
 
+def _parse_sizes(value: Any) -> tuple:
+    if isinstance(value, (list, tuple)):
+        sizes = [int(v) for v in value]
+    else:
+        sizes = [int(v) for v in str(value).strip("[]").split(",") if v.strip()]
+    return tuple(s for s in sizes if s > 0) or (64,)
+
+
 def _sample_rows(records: List[SampleRecord]) -> List[List[Any]]:
     header = ["epoch", "sample_idx", "path", "bytes_read",
-              "duration_sec", "throughput_mb_s"]
+              "duration_sec", "throughput_mb_s", "io_sec", "decode_sec", "tier",
+              "rank"]
     rows = [header]
     for r in records:
         rows.append([
             r.epoch, r.sample_idx, r.path, r.bytes_read,
             round(r.duration_sec, 6),
             round(r.throughput_mb_s, 2) if r.throughput_mb_s != float("inf") else "inf",
+            round(r.io_sec, 6), round(r.decode_sec, 6), r.tier, r.rank,
         ])
     return rows
 
 
 def _epoch_rows(records: List[EpochRecord]) -> List[List[Any]]:
     header = ["epoch", "strategy", "samples", "total_bytes",
-              "duration_sec", "throughput_mb_s", "ttfb_sec"]
+              "duration_sec", "throughput_mb_s", "ttfb_sec",
+              "major_faults", "minor_faults"]
     rows = [header]
     for r in records:
         rows.append([
             r.epoch, r.strategy, r.samples, r.total_bytes,
             round(r.duration_sec, 6),
             round(r.throughput_mb_s, 2) if r.throughput_mb_s != float("inf") else "inf",
-            round(r.ttfb_sec, 6),
+            round(r.ttfb_sec, 6), r.major_faults, r.minor_faults,
+        ])
+    return rows
+
+
+def _stage_rows(records: List[StageRecord]) -> List[List[Any]]:
+    header = ["epoch", "stage", "workers", "items", "busy_sec",
+              "idle_sec", "blocked_sec", "wall_sec", "utilization"]
+    rows = [header]
+    for r in records:
+        rows.append([
+            r.epoch, r.stage, r.workers, r.items,
+            round(r.busy_sec, 6), round(r.idle_sec, 6),
+            round(r.blocked_sec, 6), round(r.wall_sec, 6),
+            round(r.utilization, 4),
+        ])
+    return rows
+
+
+def _range_rows(stats: List[RangeStat]) -> List[List[Any]]:
+    header = ["epoch", "record_size_kb", "reads", "total_bytes",
+              "duration_sec", "iops", "throughput_mb_s", "p50_sec",
+              "p95_sec", "p99_sec"]
+    rows = [header]
+    for s in stats:
+        rows.append([
+            s.epoch, s.record_size_kb, s.reads, s.total_bytes,
+            round(s.duration_sec, 6), round(s.iops, 1),
+            round(s.throughput_mb_s, 2), round(s.p50_sec, 6),
+            round(s.p95_sec, 6), round(s.p99_sec, 6),
+        ])
+    return rows
+
+
+def _step_rows(steps: List[StepRecord]) -> List[List[Any]]:
+    header = ["epoch", "step", "samples", "batch_bytes", "wait_sec",
+              "compute_sec", "step_sec"]
+    rows = [header]
+    for s in steps:
+        rows.append([
+            s.epoch, s.step, s.samples, s.batch_bytes, round(s.wait_sec, 6),
+            round(s.compute_sec, 6), round(s.step_sec, 6),
+        ])
+    return rows
+
+
+def _token_rows(stats: List[TokenStat]) -> List[List[Any]]:
+    header = ["epoch", "reader", "sequences", "tokens", "duration_sec",
+              "sequences_per_sec", "tokens_per_sec", "major_faults",
+              "minor_faults"]
+    rows = [header]
+    for s in stats:
+        rows.append([
+            s.epoch, s.reader, s.sequences, s.tokens, round(s.duration_sec, 6),
+            round(s.sequences_per_sec, 2), round(s.tokens_per_sec, 1),
+            s.major_faults, s.minor_faults,
+        ])
+    return rows
+
+
+def _token_summary(stats: List[TokenStat],
+                   params: LoaderParams) -> Dict[str, Any]:
+    return {
+        "reader": params.token_reader,
+        "seq_len": params.seq_len,
+        "mean_sequences_per_sec": round(
+            safe_mean([s.sequences_per_sec for s in stats]), 2),
+        "mean_tokens_per_sec": round(
+            safe_mean([s.tokens_per_sec for s in stats]), 1),
+        "major_faults": sum(s.major_faults for s in stats),
+        "minor_faults": sum(s.minor_faults for s in stats),
+    }
+
+
+def _resume_rows(records: List[ResumeRecord]) -> List[List[Any]]:
+    header = ["trial", "mode", "epoch", "position", "ttfb_sec",
+              "samples_reread", "bytes_reread", "state_bytes", "consistent"]
+    rows = [header]
+    for r in records:
+        rows.append([
+            r.trial, r.mode, r.epoch, r.position, round(r.ttfb_sec, 6),
+            r.samples_reread, r.bytes_reread, r.state_bytes, r.consistent,
+        ])
+    return rows
+
+
+def _autotune_rows(steps: List[AutotuneStep]) -> List[List[Any]]:
+    header = ["window", "epoch", "samples_done", "workers", "queue_depth",
+              "read_buffer_kb", "throughput_mb_s", "stall_fraction", "action",
+              "converged"]
+    rows = [header]
+    for s in steps:
+        rows.append([
+            s.window, s.epoch, s.samples_done, s.workers, s.queue_depth,
+            s.read_buffer_kb,
+            round(s.throughput_mb_s, 2) if s.throughput_mb_s != float("inf") else "inf",
+            round(s.stall_fraction, 4), s.action, s.converged,
+        ])
+    return rows
+
+
+def _rank_rows(records: List[RankEpochRecord]) -> List[List[Any]]:
+    header = ["epoch", "rank", "samples", "total_bytes", "start_ts",
+              "end_ts", "duration_sec", "throughput_mb_s", "ttfb_sec",
+              "node"]
+    rows = [header]
+    for r in records:
+        rows.append([
+            r.epoch, r.rank, r.samples, r.total_bytes,
+            f"{r.start_ts:.6f}", f"{r.end_ts:.6f}", round(r.duration_sec, 6),
+            round(r.throughput_mb_s, 2) if r.throughput_mb_s != float("inf") else "inf",
+            round(r.ttfb_sec, 6), r.node,
         ])
     return rows
 
 
+def _cache_summary(
+    sample_records: List[SampleRecord],
+    cache_rows: List[Dict[str, Any]],
+    evictions: Dict[str, int],
+    params: LoaderParams,
+) -> Dict[str, Any]:
+    # Caches hold stored (possibly compressed) bytes, so size the dataset
+    # the same way rather than by decoded bytes_read.
+    dataset_bytes = sum(os.path.getsize(p)
+                        for p in {r.path for r in sample_records})
+    # Tiers are inclusive (memory holds a subset of disk), so the larger
+    # tier bounds how much of the dataset can be cached.
+    budget_mb = max(params.cache_memory_mb, params.cache_disk_mb)
+    steady = cache_rows[1:] or cache_rows
+    return {
+        "memory_mb": params.cache_memory_mb,
+        "disk_mb": params.cache_disk_mb,
+        "policy": params.cache_policy,
+        # >1 means the dataset does not fit in the cache
+        "dataset_to_cache_ratio": round(
+            dataset_bytes / 1024 / 1024 / budget_mb, 3) if budget_mb else None,
+        "hit_rate_by_epoch": [r["hit_rate"] for r in cache_rows],
+        "steady_state_hit_rate": round(
+            safe_mean([r["hit_rate"] for r in steady]), 4),
+        "bytes_by_tier": {
+            tier: sum(r[f"{tier}_bytes"] for r in cache_rows)
+            for tier in ("memory", "disk", "storage")
+        },
+        "evictions": evictions,
+    }
+
+
 def _build_summary(
     sample_records: List[SampleRecord],
     epoch_records: List[EpochRecord],
@@ -136,7 +648,7 @@ def _build_summary(
     throughputs = [r.throughput_mb_s for r in epoch_records]
     ttfbs = [r.ttfb_sec for r in epoch_records]
 
-    return {
+    summary = {
         "strategy": params.strategy,
         "epochs": params.epochs,
         "total_samples_read": len(sample_records),
@@ -145,11 +657,38 @@ def _build_summary(
         "sample_p99_sec": round(percentile(durations, 0.99), 6),
         "mean_epoch_throughput_mb_s": round(safe_mean(throughputs), 2),
         "mean_ttfb_sec": round(safe_mean(ttfbs), 6),
+        "mean_major_faults_per_epoch": round(
+            safe_mean([r.major_faults for r in epoch_records]), 1),
+        "mean_minor_faults_per_epoch": round(
+            safe_mean([r.minor_faults for r in epoch_records]), 1),
         "prefetch_depth": params.prefetch_depth,
         "read_buffer_kb": params.read_buffer_kb,
         "compressed": params.compressed,
     }
 
+    if params.compressed:
+        io_times = [r.io_sec for r in sample_records]
+        decode_times = [r.decode_sec for r in sample_records]
+        total_io = sum(io_times)
+        total_decode = sum(decode_times)
+        summary.update({
+            "codec": params.codec,
+            "io_p50_sec": round(safe_median(io_times), 6),
+            "io_p95_sec": round(percentile(io_times, 0.95), 6),
+            "decode_p50_sec": round(safe_median(decode_times), 6),
+            "decode_p95_sec": round(percentile(decode_times, 0.95), 6),
+            "mean_io_sec": round(safe_mean(io_times), 6),
+            "mean_decode_sec": round(safe_mean(decode_times), 6),
+            "decode_fraction": round(
+                total_decode / max(total_io + total_decode, 1e-9), 4),
+            # Per-sample time dominated by decode → CPU-bound on this node.
+            "bound": "cpu" if total_decode > total_io else "io",
+        })
+        if params.strategy == "decode_pool":
+            summary["decode_workers"] = params.decode_workers
+
+    return summary
+
 
 if __name__ == "__main__":
     main()
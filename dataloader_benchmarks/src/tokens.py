@@ -0,0 +1,240 @@
+"""Sequence packing over a memory-mapped token array.
+
+LLM pretraining data is usually one large token file plus an index of
+document boundaries (Megatron ``.bin`` / ``.idx``). The loader shuffles
+documents, concatenates them into one stream and cuts fixed-length
+training sequences of ``seq_len + 1`` tokens (inputs plus shifted labels)
+that freely span document boundaries. Consecutive sequences overlap by
+one token.
+
+The ``tokens`` strategy streams such sequences with one of two readers:
+
+- ``mmap``: one long-lived mapping; each piece of a sequence is sliced
+  out through a ``memoryview`` and copied once into the sequence buffer,
+- ``pread``: ``os.preadv`` straight into the sequence buffer.
+
+Both fill the same preallocated buffer, so the comparison is between
+page-fault-driven and syscall-driven I/O. Page faults per epoch come from
+``resource.getrusage``.
+
+File format (``tokens.tok`` / ``tokens.idx`` in the data root):
+
+- ``.tok``: raw little-endian token ids, ``uint16`` or ``uint32``,
+- ``.idx``: 8-byte magic, the token item size as ``uint64``, then
+  ``num_docs + 1`` ``uint64`` token offsets of the document boundaries.
+"""
+
+import mmap
+import os
+import random
+import struct
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+from benchmarks_common.stats import throughput_mb_s
+from benchmarks_common.sysinfo import page_faults
+
+from .loader import EpochRecord, LoaderParams, SampleRecord
+
+TOKEN_FILE = "tokens.tok"
+INDEX_FILE = "tokens.idx"
+DTYPES = {"uint16": 2, "uint32": 4}
+READERS = ("mmap", "pread")
+
+_MAGIC = b"TOKIDX1\0"
+_CHUNK_TOKENS = 1 << 20
+
+
+@dataclass
+class TokenStat:
+    epoch: int
+    reader: str
+    sequences: int
+    tokens: int
+    duration_sec: float
+    sequences_per_sec: float
+    tokens_per_sec: float
+    major_faults: int
+    minor_faults: int
+
+
+def generate_token_file(root: str, num_tokens: int, dtype: str = "uint16",
+                        mean_doc_tokens: int = 1024, seed: int = 42) -> str:
+    """Write a random token file and its document index under *root*.
+
+    Document lengths are exponentially distributed around
+    *mean_doc_tokens*. Returns the path of the token file.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(
+            f"Unknown token dtype '{dtype}'. Choose from: {', '.join(DTYPES)}")
+    itemsize = DTYPES[dtype]
+    os.makedirs(root, exist_ok=True)
+    rng = random.Random(seed)
+    tok_path = os.path.join(root, TOKEN_FILE)
+    with open(tok_path, "wb") as f:
+        # Token ids are random; their values do not affect I/O.
+        remaining = num_tokens
+        while remaining > 0:
+            n = min(remaining, _CHUNK_TOKENS)
+            f.write(rng.randbytes(n * itemsize))
+            remaining -= n
+
+    bounds = array("Q", [0])
+    while bounds[-1] < num_tokens:
+        length = max(1, int(rng.expovariate(1.0 / max(1, mean_doc_tokens))))
+        bounds.append(min(num_tokens, bounds[-1] + length))
+    with open(os.path.join(root, INDEX_FILE), "wb") as f:
+        f.write(_MAGIC + struct.pack("<Q", itemsize))
+        bounds.tofile(f)
+    return tok_path
+
+
+def load_index(root: str) -> Tuple[int, array]:
+    """Return ``(itemsize, document_bounds)`` from the index in *root*."""
+    with open(os.path.join(root, INDEX_FILE), "rb") as f:
+        header = f.read(16)
+        if len(header) != 16 or header[:8] != _MAGIC:
+            raise ValueError(f"Not a token index: {f.name}")
+        itemsize = struct.unpack("<Q", header[8:])[0]
+        bounds = array("Q")
+        bounds.frombytes(f.read())
+    return itemsize, bounds
+
+
+def pack_sequences(bounds: array, order: List[int],
+                   seq_len: int) -> Iterator[List[Tuple[int, int]]]:
+    """Yield each sequence as ``[(token_offset, num_tokens), ...]`` pieces.
+
+    Documents are concatenated in *order*; every sequence holds
+    ``seq_len + 1`` tokens and starts ``seq_len`` tokens after the
+    previous one. A trailing partial sequence is dropped.
+    """
+    need = seq_len + 1
+    pos, off = 0, 0  # cursor: index into order, token offset within doc
+    while True:
+        pieces: List[Tuple[int, int]] = []
+        remaining, p, o = need, pos, off
+        while remaining and p < len(order):
+            d = order[p]
+            start, end = bounds[d], bounds[d + 1]
+            take = min(end - start - o, remaining)
+            if take > 0:
+                pieces.append((start + o, take))
+                remaining -= take
+                o += take
+            if start + o >= end:
+                p, o = p + 1, 0
+        if remaining:
+            return
+        yield pieces
+        # Advance the cursor by seq_len tokens for the next sequence.
+        step = seq_len
+        while step:
+            d = order[pos]
+            avail = bounds[d + 1] - bounds[d] - off
+            if avail > step:
+                off += step
+                step = 0
+            else:
+                step -= avail
+                pos, off = pos + 1, 0
+
+
+def run_tokens(params: LoaderParams) -> tuple:
+    """Stream packed sequences from the token file in ``data_root``.
+
+    Returns ``(sample_records, epoch_records, token_stats)`` with one
+    sample record per sequence.
+    """
+    if params.token_reader not in READERS:
+        raise ValueError(
+            f"Unknown token reader '{params.token_reader}'. "
+            f"Choose from: {', '.join(READERS)}")
+    tok_path = os.path.join(params.data_root, TOKEN_FILE)
+    if not os.path.exists(tok_path):
+        raise FileNotFoundError(
+            f"No {TOKEN_FILE} in {params.data_root}. "
+            "Generate one with generate_token_file().")
+    itemsize, bounds = load_index(params.data_root)
+    num_docs = len(bounds) - 1
+    seq_bytes = (params.seq_len + 1) * itemsize
+    buf = bytearray(seq_bytes)
+    view = memoryview(buf)
+
+    fd = os.open(tok_path, os.O_RDONLY)
+    mm = None
+    try:
+        if params.token_reader == "mmap":
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            src = memoryview(mm)
+
+            def _fill(pieces: List[Tuple[int, int]]) -> None:
+                pos = 0
+                for offset, n in pieces:
+                    nbytes = n * itemsize
+                    view[pos:pos + nbytes] = src[offset * itemsize:
+                                                 offset * itemsize + nbytes]
+                    pos += nbytes
+        else:
+            def _fill(pieces: List[Tuple[int, int]]) -> None:
+                pos = 0
+                for offset, n in pieces:
+                    nbytes = n * itemsize
+                    os.preadv(fd, [view[pos:pos + nbytes]], offset * itemsize)
+                    pos += nbytes
+
+        records: List[SampleRecord] = []
+        epochs: List[EpochRecord] = []
+        stats: List[TokenStat] = []
+        for epoch in range(1, params.epochs + 1):
+            order = list(range(num_docs))
+            if params.shuffle_seed is not None:
+                random.Random(params.shuffle_seed + epoch).shuffle(order)
+            major0, minor0 = page_faults()
+            epoch_start = time.perf_counter()
+            ttfb = 0.0
+            count = 0
+            for idx, pieces in enumerate(pack_sequences(bounds, order,
+                                                        params.seq_len)):
+                t0 = time.perf_counter()
+                _fill(pieces)
+                dur = max(time.perf_counter() - t0, 1e-9)
+                records.append(SampleRecord(
+                    epoch=epoch, sample_idx=idx, path=tok_path,
+                    bytes_read=seq_bytes, duration_sec=dur,
+                    throughput_mb_s=throughput_mb_s(seq_bytes, dur),
+                    io_sec=dur,
+                ))
+                count += 1
+                if count == params.batch_size:
+                    ttfb = time.perf_counter() - epoch_start
+            epoch_dur = max(time.perf_counter() - epoch_start, 1e-9)
+            major1, minor1 = page_faults()
+            if count < params.batch_size:
+                ttfb = epoch_dur
+            total_bytes = count * seq_bytes
+            epochs.append(EpochRecord(
+                epoch=epoch, strategy="tokens", samples=count,
+                total_bytes=total_bytes, duration_sec=epoch_dur,
+                throughput_mb_s=throughput_mb_s(total_bytes, epoch_dur),
+                ttfb_sec=ttfb, major_faults=major1 - major0,
+                minor_faults=minor1 - minor0,
+            ))
+            tokens = count * params.seq_len
+            stats.append(TokenStat(
+                epoch=epoch, reader=params.token_reader, sequences=count,
+                tokens=tokens, duration_sec=epoch_dur,
+                sequences_per_sec=count / epoch_dur,
+                tokens_per_sec=tokens / epoch_dur,
+                major_faults=major1 - major0, minor_faults=minor1 - minor0,
+            ))
+        del view
+    finally:
+        if mm is not None:
+            src.release()
+            mm.close()
+        os.close(fd)
+    return records, epochs, stats
@@ -1,10 +1,24 @@
 """Filesystem listing benchmarks — real I/O with os.stat and os.scandir support."""
 
+import multiprocessing as mp
 import os
+import queue
+import threading
 import time
 import itertools
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, as_completed, wait)
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from .path_table import PathTable, RecordTable
+from .probes import OpLatencies, pick_op, run_probe
+
+EXECUTORS = ("thread", "process", "hybrid")
+
+# Entries per batch sent to a worker process.
+_BATCH_ENTRIES = 8192
 
 
 def _chunks(iterable, size):
@@ -17,7 +31,14 @@ def _chunks(iterable, size):
 
 
 def list_tree(root: str, page_size: int, concurrency: int,
-              use_stat: bool = False, use_scandir: bool = False):
+              use_stat: bool = False, use_scandir: bool = False,
+              parallel_walk: bool = False,
+              dirs: Optional[List[tuple]] = None,
+              stat_cache=None, negative_ratio: float = 0.0,
+              op_mix: Optional[List[Tuple[str, float]]] = None,
+              op_latencies: Optional[OpLatencies] = None,
+              compact: bool = False, executor: str = "thread",
+              processes: int = 0):
     """
     Enumerate a directory tree and return raw records for CSV:
     [start_ts, end_ts, entries_count, path]
@@ -34,33 +55,109 @@ def list_tree(root: str, page_size: int, concurrency: int,
         If True, call os.stat() on every entry to probe real metadata latency.
     use_scandir : bool
         If True, use os.scandir() instead of os.walk() for the initial
-        enumeration (faster on most systems, avoids double-stat).
+        enumeration (faster on most systems). ``use_stat`` then reuses
+        ``DirEntry.stat()`` instead of stat-ing each path again.
+    parallel_walk : bool
+        If True, enumerate with a :class:`ParallelWalker` of
+        ``concurrency`` threads and submit each directory's pages as soon
+        as it is found, instead of walking the whole tree first.
+    dirs : list of (path, [file paths]), optional
+        Pre-enumerated directories, e.g. from a tree manifest; skips the
+        walk entirely.
+    stat_cache : StatCache, optional
+        Attribute cache consulted instead of os.stat() when ``use_stat``.
+    negative_ratio : float
+        With ``use_stat``, also stat this many nonexistent sidecar names
+        (``<entry>.missing``) per entry, like probes for marker files.
+    op_mix : list of (probe, weight), optional
+        Apply one probe from :mod:`.probes` per entry, chosen by weight,
+        instead of ``use_stat``; see :func:`.probes.parse_op_mix`.
+    op_latencies : OpLatencies, optional
+        Collects per-op latencies and errors when ``op_mix`` is set.
+    compact : bool
+        Enumerate into a :class:`~.path_table.PathTable` (``dirs`` may
+        also be one), keep at most ``4 * concurrency`` pages in flight and
+        return a :class:`~.path_table.RecordTable` instead of a list.
+        ``use_scandir`` and ``parallel_walk`` are ignored.
+    executor : str
+        ``thread`` probes pages on ``concurrency`` threads. ``process``
+        sends batches of pages to ``processes`` worker processes (default:
+        one per CPU), each probing serially and returning compact arrays,
+        so the GIL is out of the picture; ``hybrid`` runs ``concurrency``
+        threads inside each process. Both support ``use_stat`` and
+        ``negative_ratio`` but not ``stat_cache`` or ``op_mix``.
+    processes : int
+        Worker processes for ``process`` and ``hybrid``.
     """
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"Unknown executor '{executor}'. Choose from: {', '.join(EXECUTORS)}")
+    if executor != "thread" and (stat_cache is not None or op_mix):
+        raise ValueError(
+            f"stat_cache and op_mix need executor 'thread', not '{executor}'")
     records: List[List[str]] = []
 
-    if use_scandir:
-        dirs = _scandir_walk(root)
+    if compact:
+        if isinstance(dirs, PathTable):
+            table = dirs
+        elif dirs is not None:
+            table = PathTable.from_dirs(dirs)
+        else:
+            table = PathTable.from_walk(root)
+    elif dirs is not None:
+        pass
+    elif parallel_walk:
+        dirs = ParallelWalker(root, concurrency)
+    elif use_scandir:
+        dirs = _scandir_walk(root, keep_entries=True)
     else:
         dirs = []
         for p, subdirs, files in os.walk(root):
             entries = [os.path.join(p, f) for f in files]
             dirs.append((p, entries))
 
+    stat = stat_cache.stat if stat_cache is not None else os.stat
+
     def _list_chunk(path: str, entries: List[str]):
         start = time.time()
-        if use_stat:
-            # Real metadata probing — exercises the filesystem stat path
+        if op_mix:
+            samples: dict = {}
+            errors: dict = {}
             for entry in entries:
+                name = (entry.name if isinstance(entry, os.DirEntry)
+                        else os.path.basename(entry))
+                op = pick_op(op_mix, name)
+                t0 = time.perf_counter()
                 try:
-                    os.stat(entry)
+                    run_probe(op, entry)
                 except OSError:
-                    pass
+                    errors[op] = errors.get(op, 0) + 1
+                samples.setdefault(op, []).append(time.perf_counter() - t0)
+            if op_latencies is not None:
+                op_latencies.merge(samples, errors)
         else:
-            # Lightweight enumeration — still validates path existence
-            for entry in entries:
-                os.path.exists(entry)
+            _probe_paths(entries, use_stat, negative_ratio, stat)
         end = time.time()
-        return [f"{start:.6f}", f"{end:.6f}", str(len(entries)), path]
+        return start, end, len(entries), path
+
+    if executor != "thread":
+        step = max(1, page_size)
+        if compact:
+            pages = ((path, [table.name(i)
+                             for i in range(first, min(first + step, hi))])
+                     for path, lo, hi in table.ranges()
+                     for first in range(lo, hi, step))
+        else:
+            pages = ((path, [os.path.basename(os.fspath(e)) for e in chunk])
+                     for path, entries in dirs
+                     for chunk in _chunks(entries, step))
+        threads = max(1, concurrency) if executor == "hybrid" else 1
+        out = _list_processes(pages, _processes(processes),
+                              threads, use_stat, negative_ratio)
+        return out if compact else list(out)
+
+    if compact:
+        return _list_compact(table, page_size, concurrency, _list_chunk)
 
     with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
         futures = []
@@ -68,13 +165,128 @@ def list_tree(root: str, page_size: int, concurrency: int,
             for chunk in _chunks(entries, max(1, page_size)):
                 futures.append(ex.submit(_list_chunk, path, chunk))
         for fut in as_completed(futures):
-            records.append(fut.result())
+            start, end, count, path = fut.result()
+            records.append([f"{start:.6f}", f"{end:.6f}", str(count), path])
 
     return sorted(records, key=lambda r: float(r[0]))
 
 
-def _scandir_walk(root: str) -> List[tuple]:
-    """Walk a tree using os.scandir() for faster enumeration with DirEntry."""
+def _processes(processes: int) -> int:
+    return processes or os.cpu_count() or 1
+
+
+def executor_parallelism(executor: str, concurrency: int,
+                         processes: int = 0) -> int:
+    """Probes that :func:`list_tree` can run at once with *executor*."""
+    if executor == "thread":
+        return max(1, concurrency)
+    threads = max(1, concurrency) if executor == "hybrid" else 1
+    return _processes(processes) * threads
+
+
+def _list_compact(table: PathTable, page_size: int, concurrency: int,
+                  list_chunk) -> RecordTable:
+    """Probe *table* page by page with a bounded number of pages in flight."""
+    out = RecordTable()
+    page_size = max(1, page_size)
+    window = max(1, concurrency) * 4
+    pending: set = set()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        for path, lo, hi in table.ranges():
+            for first in range(lo, hi, page_size):
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        out.append(*fut.result())
+                chunk = table.paths(first, min(first + page_size, hi))
+                pending.add(ex.submit(list_chunk, path, chunk))
+        for fut in as_completed(pending):
+            out.append(*fut.result())
+    out.sort()
+    return out
+
+
+def _probe_paths(entries: Sequence, use_stat: bool, negative_ratio: float,
+                 stat: Callable = os.stat) -> None:
+    """The ``use_stat`` / existence probe of :func:`list_tree`.
+
+    *entries* are paths or ``os.DirEntry`` objects; with the default *stat*
+    a ``DirEntry`` reuses the result cached by ``scandir``.
+    """
+    if use_stat:
+        # Real metadata probing — exercises the filesystem stat path
+        for entry in entries:
+            try:
+                if stat is os.stat and isinstance(entry, os.DirEntry):
+                    entry.stat()
+                else:
+                    stat(os.fspath(entry))
+            except OSError:
+                pass
+        for entry in entries[:round(len(entries) * negative_ratio)]:
+            try:
+                stat(os.fspath(entry) + ".missing")
+            except OSError:
+                pass
+    else:
+        # Lightweight enumeration — still validates path existence
+        for entry in entries:
+            os.path.exists(entry)
+
+
+def _list_batch(pages: List[Tuple[str, List[str]]], threads: int,
+                use_stat: bool, negative_ratio: float) -> RecordTable:
+    """Probe a batch of ``(dir, names)`` pages inside a worker process."""
+    def _one(page):
+        path, names = page
+        paths = [os.path.join(path, n) for n in names]
+        start = time.time()
+        _probe_paths(paths, use_stat, negative_ratio)
+        return start, time.time(), len(paths), path
+
+    out = RecordTable()
+    if threads <= 1:
+        for page in pages:
+            out.append(*_one(page))
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as ex:
+            for row in ex.map(_one, pages):
+                out.append(*row)
+    return out
+
+
+def _list_processes(pages, processes: int, threads: int, use_stat: bool,
+                    negative_ratio: float) -> RecordTable:
+    """Spread *pages* over a process pool in batches; merged and sorted."""
+    out = RecordTable()
+    ctx = mp.get_context()
+    with ProcessPoolExecutor(max_workers=max(1, processes),
+                             mp_context=ctx) as pool:
+        futures = []
+        batch: List[Tuple[str, List[str]]] = []
+        size = 0
+        for page in pages:
+            batch.append(page)
+            size += len(page[1])
+            if size >= _BATCH_ENTRIES:
+                futures.append(pool.submit(_list_batch, batch, threads,
+                                           use_stat, negative_ratio))
+                batch, size = [], 0
+        if batch:
+            futures.append(pool.submit(_list_batch, batch, threads, use_stat,
+                                       negative_ratio))
+        for fut in as_completed(futures):
+            out.extend(fut.result())
+    out.sort()
+    return out
+
+
+def _scandir_walk(root: str, keep_entries: bool = False) -> List[tuple]:
+    """Walk a tree using os.scandir() for faster enumeration with DirEntry.
+
+    With *keep_entries*, files are returned as ``os.DirEntry`` objects so
+    later probes can reuse their cached type and stat results.
+    """
     results = []
     stack = [root]
     while stack:
@@ -85,7 +297,7 @@ def _scandir_walk(root: str) -> List[tuple]:
             with os.scandir(current) as it:
                 for entry in it:
                     if entry.is_file(follow_symlinks=False):
-                        entries.append(entry.path)
+                        entries.append(entry if keep_entries else entry.path)
                     elif entry.is_dir(follow_symlinks=False):
                         subdirs.append(entry.path)
         except PermissionError:
@@ -93,3 +305,285 @@ def _scandir_walk(root: str) -> List[tuple]:
         results.append((current, entries))
         stack.extend(subdirs)
     return results
+
+
+def _scan_dir(path: str) -> Tuple[List[str], List[str]]:
+    """Return (files, subdirs) of one directory; empty if it is unreadable.
+
+    Any ``OSError`` counts as unreadable: besides permissions, a directory
+    can vanish or be replaced by a file mid-walk, or fail with EIO.
+    """
+    files: List[str] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False):
+                    files.append(entry.path)
+                elif entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+    except OSError:
+        pass
+    return files, subdirs
+
+
+@dataclass
+class WalkStats:
+    workers: int
+    dirs: int
+    entries: int
+    first_entry_sec: float  # start to the first file delivered
+    duration_sec: float
+    dirs_per_sec: float
+    entries_per_sec: float
+    steals: int             # directories taken from another worker's deque
+
+
+_DONE = object()
+
+
+class _Failed:
+    """An exception raised by a walker thread, on its way to the iterator."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class ParallelWalker:
+    """Work-stealing parallel tree walk that streams ``(dir, files)``.
+
+    Each worker thread owns a deque of directories. It pops its own newest
+    directory (depth-first, like the serial walk), scandirs it, pushes the
+    subdirectories back onto its deque and hands the files downstream. An
+    idle worker steals the oldest directory from another worker's deque,
+    which tends to be the root of a large unexplored subtree.
+
+    Iterating yields directories as they are scanned, so consumers start
+    before enumeration finishes. A bounded output queue applies
+    backpressure; closing the iterator early stops the workers. An
+    unexpected error in a worker stops the walk and is raised from the
+    iterator. ``stats`` is filled in once iteration ends.
+    """
+
+    def __init__(self, root: str, workers: int = 8):
+        self.root = root
+        self.workers = max(1, workers)
+        self.stats: Optional[WalkStats] = None
+        self._deques = [deque() for _ in range(self.workers)]
+        self._pending = 0  # directories queued or being scanned
+        self._cond = threading.Condition()
+        self._out: "queue.Queue" = queue.Queue(maxsize=self.workers * 4)
+        self._stop = threading.Event()
+        self._steals = 0
+
+    def _take(self, i: int) -> Optional[str]:
+        try:
+            return self._deques[i].pop()
+        except IndexError:
+            pass
+        for k in range(1, self.workers):
+            try:
+                path = self._deques[(i + k) % self.workers].popleft()
+            except IndexError:
+                continue
+            with self._cond:
+                self._steals += 1
+            return path
+        return None
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._out.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _work(self, i: int) -> None:
+        try:
+            while not self._stop.is_set():
+                path = self._take(i)
+                if path is None:
+                    with self._cond:
+                        if self._pending == 0:
+                            return
+                        self._cond.wait(0.01)
+                    continue
+                files: List[str] = []
+                try:
+                    files, subdirs = _scan_dir(path)
+                    with self._cond:
+                        self._pending += len(subdirs)
+                    self._deques[i].extend(subdirs)
+                finally:
+                    # Retire *path* even if scanning failed, or idle workers
+                    # wait for it forever.
+                    with self._cond:
+                        self._pending -= 1
+                        self._cond.notify_all()
+                if not self._put((path, files)):
+                    return
+        except Exception as exc:
+            # Hand the error to the iterator before stopping everyone, or
+            # the walk would end quietly with directories missing.
+            self._put(_Failed(exc))
+            self._stop.set()
+        finally:
+            self._put(_DONE)
+
+    def __iter__(self) -> Iterator[Tuple[str, List[str]]]:
+        start = time.perf_counter()
+        first: Optional[float] = None
+        dirs = entries = 0
+        self._deques[0].append(self.root)
+        self._pending = 1
+        threads = [threading.Thread(target=self._work, args=(i,), daemon=True,
+                                    name=f"walker-{i}")
+                   for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        finished = 0
+        try:
+            while finished < self.workers:
+                item = self._out.get()
+                if item is _DONE:
+                    finished += 1
+                    continue
+                if isinstance(item, _Failed):
+                    raise item.exc
+                dirs += 1
+                entries += len(item[1])
+                if first is None and item[1]:
+                    first = time.perf_counter() - start
+                yield item
+        finally:
+            self._stop.set()
+            for t in threads:
+                t.join()
+            dur = max(time.perf_counter() - start, 1e-9)
+            self.stats = WalkStats(
+                workers=self.workers, dirs=dirs, entries=entries,
+                first_entry_sec=first if first is not None else dur,
+                duration_sec=dur, dirs_per_sec=dirs / dur,
+                entries_per_sec=entries / dur, steals=self._steals,
+            )
+
+
+def walk_scaling(root: str, worker_counts: List[int]) -> List[WalkStats]:
+    """Enumerate *root* once per worker count; return one stats row each."""
+    stats: List[WalkStats] = []
+    for workers in worker_counts:
+        walker = ParallelWalker(root, workers)
+        for _ in walker:
+            pass
+        stats.append(walker.stats)
+    return stats
+
+
+@dataclass
+class ExecutorStats:
+    executor: str
+    workers: int             # threads for thread, processes otherwise
+    threads_per_worker: int
+    entries: int
+    duration_sec: float
+    entries_per_sec: float
+
+
+def executor_scaling(root: str, page_size: int, worker_counts: List[int],
+                     use_stat: bool = True,
+                     hybrid_threads: int = 4) -> List[ExecutorStats]:
+    """Probe *root* with every executor at each worker count.
+
+    The tree is enumerated once up front, so only the probe phase (and
+    pool start-up) is timed.
+    """
+    dirs = _scandir_walk(root)
+    stats: List[ExecutorStats] = []
+    for workers in worker_counts:
+        for executor in EXECUTORS:
+            threads = {"thread": workers, "process": 1,
+                       "hybrid": max(1, hybrid_threads)}[executor]
+            start = time.perf_counter()
+            records = list_tree(root, page_size, threads, use_stat=use_stat,
+                                dirs=dirs, executor=executor,
+                                processes=workers)
+            dur = max(time.perf_counter() - start, 1e-9)
+            entries = sum(int(r[2]) for r in records)
+            stats.append(ExecutorStats(
+                executor=executor, workers=workers,
+                threads_per_worker=1 if executor == "thread" else threads,
+                entries=entries, duration_sec=dur,
+                entries_per_sec=entries / dur,
+            ))
+    return stats
+
+
+@dataclass
+class Page:
+    index: int
+    path: str             # directory of the page's first entry
+    entries: List[str]
+    started_sec: float    # first entry of the page seen, relative to start
+    delivered_sec: float  # page handed to the consumer, relative to start
+
+
+def iter_pages(root: str, page_size: int, use_stat: bool = False,
+               start: Optional[float] = None) -> Iterator[Page]:
+    """Stream the files under *root* as pages of *page_size* entries.
+
+    Pages are yielded while ``os.scandir`` is still iterating, and may span
+    directories, like paginated object-store listings of a prefix. Only
+    one open scandir iterator per tree level and the current page are held,
+    so memory does not grow with the tree. Stop consuming to stop listing.
+
+    *start* is a ``time.perf_counter()`` value the page timestamps are
+    relative to (default: the first call to ``next``).
+    """
+    if start is None:
+        start = time.perf_counter()
+    page_size = max(1, page_size)
+    page: List[str] = []
+    page_path = root
+    page_start = 0.0
+    index = 0
+    stack = [os.scandir(root)]
+    try:
+        while stack:
+            try:
+                entry = next(stack[-1])
+            except StopIteration:
+                stack.pop().close()
+                continue
+            except (PermissionError, FileNotFoundError):
+                stack.pop().close()
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                try:
+                    stack.append(os.scandir(entry.path))
+                except (PermissionError, FileNotFoundError):
+                    pass
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            if not page:
+                page_start = time.perf_counter() - start
+                page_path = os.path.dirname(entry.path)
+            if use_stat:
+                try:
+                    os.stat(entry.path)
+                except OSError:
+                    pass
+            page.append(entry.path)
+            if len(page) == page_size:
+                yield Page(index, page_path, page, page_start,
+                           time.perf_counter() - start)
+                index += 1
+                page = []
+        if page:
+            yield Page(index, page_path, page, page_start,
+                       time.perf_counter() - start)
+    finally:
+        for it in stack:
+            it.close()
@@ -0,0 +1,102 @@
+"""Listing from a persisted tree manifest, and its cost under churn.
+
+The first run saves a snapshot of the tree (directory -> entries, with
+directory mtimes and inodes, see :func:`benchmarks_common.manifest.
+refresh_tree`). Later runs revalidate with one ``stat`` per directory and
+rescan only the directories that changed.
+
+:func:`run_churn` measures what that buys: for each churn rate it builds
+a fresh manifest, modifies that percentage of directories (one new file
+each) and times a full scan against an incremental refresh. Churn files
+are removed afterwards.
+
+Directory mtimes within the racy window of a scan are not trusted, so
+the benchmark waits for the window to pass after modifying the tree.
+"""
+
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from benchmarks_common.manifest import (_RACY_NS, TreeRefreshReport,
+                                        refresh_tree)
+
+
+@dataclass
+class ChurnResult:
+    churn_pct: float
+    dirs: int
+    changed_dirs: int
+    full_scan_sec: float
+    refresh_sec: float
+    rescanned_dirs: int
+    stat_calls: int
+    consistent: bool  # refresh saw the same files as the full scan
+
+
+def manifest_dirs(root: str, manifest_path: str = "",
+                  use_manifest: bool = True
+                  ) -> Tuple[List[tuple], TreeRefreshReport]:
+    """``(path, [file paths])`` per directory, as :func:`list_tree` uses."""
+    dirs, report = refresh_tree(root, manifest_path, use_manifest)
+    out = []
+    for rel, d in dirs.items():
+        full = os.path.join(root, rel) if rel else root
+        out.append((full, [os.path.join(full, f) for f in d.files]))
+    return out, report
+
+
+def _settle(since: float, racy_ns: int) -> None:
+    """Sleep until changes made at *since* are outside the racy window."""
+    wait = since + racy_ns / 1e9 - time.time()
+    if wait > 0:
+        time.sleep(wait + 0.01)
+
+
+def run_churn(root: str, churn_pcts: List[float], manifest_path: str = "",
+              seed: int = 42, racy_ns: int = _RACY_NS) -> List[ChurnResult]:
+    """Full scan vs. incremental refresh after modifying *churn_pcts* % of dirs."""
+    # Beside the tree, like the listing manifest, so creating and removing
+    # it neither changes the root's mtime nor shows up in other listings.
+    path = manifest_path or root.rstrip(os.sep) + ".churn.manifest"
+    rng = random.Random(seed)
+    results: List[ChurnResult] = []
+    open(path, "a").close()
+    try:
+        changed_at = time.time()
+        for pct in churn_pcts:
+            # Baseline: every directory recorded with a trusted mtime.
+            _settle(changed_at, racy_ns)
+            dirs, _ = refresh_tree(root, path, racy_ns=racy_ns)
+            names = sorted(dirs)
+            changed = rng.sample(names,
+                                 max(1, round(len(names) * pct / 100.0)))
+            created = []
+            for rel in changed:
+                target = os.path.join(root, rel,
+                                      f"churn_{len(created):06d}.dat")
+                open(target, "wb").close()
+                created.append(target)
+            try:
+                full, full_rep = refresh_tree(root, path, use_manifest=False,
+                                              racy_ns=racy_ns)
+                inc, inc_rep = refresh_tree(root, path, racy_ns=racy_ns)
+            finally:
+                for target in created:
+                    os.remove(target)
+                changed_at = time.time()
+            results.append(ChurnResult(
+                churn_pct=pct, dirs=len(names), changed_dirs=len(changed),
+                full_scan_sec=full_rep.duration_sec,
+                refresh_sec=inc_rep.duration_sec,
+                rescanned_dirs=inc_rep.rescanned,
+                stat_calls=inc_rep.stat_calls,
+                consistent=({k: v.files for k, v in full.items()}
+                            == {k: v.files for k, v in inc.items()}),
+            ))
+    finally:
+        if not manifest_path:
+            os.remove(path)
+    return results
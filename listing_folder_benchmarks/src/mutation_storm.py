@@ -0,0 +1,142 @@
+"""Metadata mutation storms: concurrent create, write, rename, unlink.
+
+Checkpoint writers create a temp file and rename it into place, data
+staging creates and deletes thousands of small files, and cleanup jobs
+unlink whole trees. Shared filesystems often saturate on these
+namespace operations (directory locks, journal commits, MDS round trips)
+long before they run out of bandwidth.
+
+A storm spreads ``fanout * files_per_dir`` files over ``fanout``
+directories and runs four phases, each a barrier apart and each timed on
+its own with ``threads`` workers:
+
+- ``create``: ``open(O_CREAT | O_EXCL)`` + close of ``<name>.tmp``,
+- ``write``: reopen, write zero bytes, close (the write-empty step),
+- ``rename``: ``<name>.tmp`` -> ``<name>``, the atomic rename-into-place,
+- ``unlink``: remove ``<name>``.
+
+Files are dealt to workers round-robin, so every directory is mutated by
+all workers at once, as in a real storm. The storm directory is removed
+afterwards.
+"""
+
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from benchmarks_common.stats import percentile
+
+STORM_OPS = ("create", "write", "rename", "unlink")
+
+
+@dataclass
+class StormResult:
+    op: str
+    threads: int
+    ops: int
+    errors: int
+    duration_sec: float   # phase wall time
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    max_us: float
+
+
+def _create(path: str) -> None:
+    os.close(os.open(path + ".tmp", os.O_CREAT | os.O_EXCL | os.O_WRONLY,
+                     0o644))
+
+
+def _write(path: str) -> None:
+    fd = os.open(path + ".tmp", os.O_WRONLY | os.O_TRUNC)
+    try:
+        os.write(fd, b"")
+    finally:
+        os.close(fd)
+
+
+def _rename(path: str) -> None:
+    os.replace(path + ".tmp", path)
+
+
+def _unlink(path: str) -> None:
+    os.unlink(path)
+
+
+_OPS: Dict[str, Callable[[str], None]] = {
+    "create": _create, "write": _write, "rename": _rename, "unlink": _unlink,
+}
+
+
+def _phase(op: str, paths: List[str], threads: int) -> StormResult:
+    fn = _OPS[op]
+
+    def _worker(mine: List[str]):
+        lat: List[float] = []
+        errors = 0
+        for path in mine:
+            t0 = time.perf_counter()
+            try:
+                fn(path)
+            except OSError:
+                errors += 1
+            lat.append(time.perf_counter() - t0)
+        return lat, errors
+
+    slices = [paths[i::threads] for i in range(threads)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        results = list(ex.map(_worker, slices))
+    dur = max(time.perf_counter() - start, 1e-9)
+    lat = [v for r in results for v in r[0]]
+    return StormResult(
+        op=op, threads=threads, ops=len(lat),
+        errors=sum(r[1] for r in results), duration_sec=dur,
+        ops_per_sec=len(lat) / dur,
+        p50_us=percentile(lat, 0.50) * 1e6,
+        p99_us=percentile(lat, 0.99) * 1e6,
+        max_us=max(lat, default=0.0) * 1e6,
+    )
+
+
+def run_storm(storm_dir: str, threads: int = 8, fanout: int = 16,
+              files_per_dir: int = 256) -> List[StormResult]:
+    """Run one create/write/rename/unlink storm; one result per op."""
+    threads = max(1, threads)
+    if os.path.exists(storm_dir):
+        raise ValueError(f"Storm directory '{storm_dir}' already exists")
+    dirs = [os.path.join(storm_dir, f"d{d:04d}") for d in range(max(1, fanout))]
+    for d in dirs:
+        os.makedirs(d)
+    # Interleave directories so consecutive files (and workers) collide.
+    paths = [os.path.join(d, f"f{i:06d}")
+             for i in range(max(1, files_per_dir)) for d in dirs]
+    try:
+        return [_phase(op, paths, threads) for op in STORM_OPS]
+    finally:
+        shutil.rmtree(storm_dir, ignore_errors=True)
+
+
+def storm_scaling(storm_dir: str, thread_counts: List[int], fanout: int = 16,
+                  files_per_dir: int = 256) -> List[StormResult]:
+    """:func:`run_storm` once per thread count."""
+    results: List[StormResult] = []
+    for threads in thread_counts:
+        results.extend(run_storm(storm_dir, threads, fanout, files_per_dir))
+    return results
+
+
+def storm_summary(results: List[StormResult]) -> Dict[Any, Dict[str, Any]]:
+    """``{threads: {op: {ops_per_sec, p50_us, p99_us, errors}}}``."""
+    out: Dict[Any, Dict[str, Any]] = {}
+    for r in results:
+        out.setdefault(r.threads, {})[r.op] = {
+            "ops_per_sec": round(r.ops_per_sec, 1),
+            "p50_us": round(r.p50_us, 2),
+            "p99_us": round(r.p99_us, 2),
+            "errors": r.errors,
+        }
+    return out
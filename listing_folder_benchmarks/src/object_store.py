@@ -0,0 +1,255 @@
+"""In-process object-store namespace and listing strategies.
+
+Object stores list a bucket with paginated requests (S3 ListObjectsV2):
+at most ``page_size`` keys per response, in lexicographic order, with a
+continuation token for the next page, optionally grouping keys under
+``delimiter``-terminated common prefixes. Every request pays a round
+trip, so the number of requests and how many can be in flight decide how
+long enumerating a dataset takes. :class:`ObjectNamespace` emulates that
+API over a sorted key list, with configurable per-request latency and
+page size, and counts requests.
+
+Strategies, all returning every key exactly once:
+
+- ``flat``: one sequential chain of pages over the whole prefix,
+- ``delimiter``: hierarchical listing with ``delimiter="/"``; each common
+  prefix found is listed by a pool of ``concurrency`` threads, like a
+  parallel directory walk,
+- ``partitioned``: the keyspace is cut at ``split_depth``-character
+  boundaries over ``alphabet``; each partition is listed from its lower
+  boundary (``start_after``) until it passes the next one, in parallel.
+  Boundaries only affect balance, not completeness.
+"""
+
+import bisect
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from .tree_builder import TreeSpec, file_name, plan_tree
+
+STRATEGIES = ("flat", "delimiter", "partitioned")
+DEFAULT_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+@dataclass
+class ListPage:
+    keys: List[str]
+    common_prefixes: List[str] = field(default_factory=list)
+    next_token: Optional[str] = None  # None when the listing is complete
+
+    @property
+    def is_truncated(self) -> bool:
+        return self.next_token is not None
+
+
+def _past_prefix(prefix: str) -> str:
+    """Smallest string greater than every string starting with *prefix*."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class ObjectNamespace:
+    """Sorted keys behind a ListObjectsV2-style paginated API."""
+
+    def __init__(self, keys: Iterable[str], page_size: int = 1000,
+                 latency_ms: float = 10.0, per_key_us: float = 0.0):
+        self.keys = sorted(keys)
+        self.page_size = max(1, page_size)
+        self.latency_ms = latency_ms
+        self.per_key_us = per_key_us
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def reset_requests(self) -> None:
+        with self._lock:
+            self.requests = 0
+
+    def list_objects(self, prefix: str = "", delimiter: str = "",
+                     start_after: str = "", token: Optional[str] = None,
+                     max_keys: int = 0) -> ListPage:
+        """One listing request; keys and common prefixes share the page."""
+        limit = min(max_keys, self.page_size) if max_keys > 0 else self.page_size
+        if token is not None:
+            kind, _, last = token.partition(":")
+            i = bisect.bisect_left(self.keys, _past_prefix(last)) \
+                if kind == "p" else bisect.bisect_right(self.keys, last)
+        else:
+            i = bisect.bisect_left(self.keys, prefix)
+            if start_after:
+                i = max(i, bisect.bisect_right(self.keys, start_after))
+        keys: List[str] = []
+        prefixes: List[str] = []
+        last_token: Optional[str] = None
+        n = len(self.keys)
+        while i < n and len(keys) + len(prefixes) < limit:
+            key = self.keys[i]
+            if not key.startswith(prefix):
+                break
+            cut = key.find(delimiter, len(prefix)) if delimiter else -1
+            if cut >= 0:
+                common = key[:cut + len(delimiter)]
+                prefixes.append(common)
+                last_token = "p:" + common
+                i = bisect.bisect_left(self.keys, _past_prefix(common), i)
+            else:
+                keys.append(key)
+                last_token = "k:" + key
+                i += 1
+        more = i < n and self.keys[i].startswith(prefix)
+        with self._lock:
+            self.requests += 1
+        delay = self.latency_ms / 1e3 + (len(keys) + len(prefixes)) * self.per_key_us / 1e6
+        if delay > 0:
+            time.sleep(delay)
+        return ListPage(keys, prefixes, last_token if more else None)
+
+
+def keys_from_tree(root: str) -> List[str]:
+    """Relative ``/``-separated paths of the files under *root*."""
+    keys: List[str] = []
+    for path, _, files in os.walk(root):
+        rel = os.path.relpath(path, root)
+        base = "" if rel == "." else rel.replace(os.sep, "/") + "/"
+        keys.extend(base + f for f in files)
+    return keys
+
+
+def keys_from_spec(spec: TreeSpec) -> List[str]:
+    """Keys of the tree *spec* describes, without creating it on disk."""
+    keys: List[str] = []
+    for rel, files in plan_tree(spec):
+        base = rel.replace(os.sep, "/") + "/" if rel else ""
+        keys.extend(base + file_name(spec.seed, rel, i) for i in range(files))
+    return keys
+
+
+@dataclass
+class StrategyResult:
+    strategy: str
+    concurrency: int
+    keys: int
+    requests: int
+    duration_sec: float
+    first_page_sec: float   # start to the first keys returned
+    keys_per_sec: float
+    complete: bool          # every key exactly once
+
+
+class _Clock:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def saw(self, page: ListPage) -> None:
+        if page.keys and self.first is None:
+            with self._lock:
+                if self.first is None:
+                    self.first = time.perf_counter() - self.start
+
+
+def _drain(ns: ObjectNamespace, clock: _Clock, prefix: str = "",
+           delimiter: str = "", start_after: str = "",
+           stop_after: Optional[str] = None) -> tuple:
+    """Follow one pagination chain; ``(keys, common prefixes)``."""
+    keys: List[str] = []
+    prefixes: List[str] = []
+    token = None
+    while True:
+        page = ns.list_objects(prefix, delimiter, start_after, token)
+        clock.saw(page)
+        if stop_after is not None and page.keys and page.keys[-1] > stop_after:
+            keys.extend(k for k in page.keys if k <= stop_after)
+            break
+        keys.extend(page.keys)
+        prefixes.extend(page.common_prefixes)
+        if not page.is_truncated:
+            break
+        token = page.next_token
+    return keys, prefixes
+
+
+def _flat(ns: ObjectNamespace, clock: _Clock, concurrency: int,
+          alphabet: str, split_depth: int) -> List[str]:
+    return _drain(ns, clock)[0]
+
+
+def _delimiter(ns: ObjectNamespace, clock: _Clock, concurrency: int,
+               alphabet: str, split_depth: int) -> List[str]:
+    found: List[str] = []
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        pending = {ex.submit(_drain, ns, clock, "", "/")}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                keys, prefixes = fut.result()
+                found.extend(keys)
+                pending.update(ex.submit(_drain, ns, clock, p, "/")
+                               for p in prefixes)
+    return found
+
+
+def split_points(alphabet: str, depth: int) -> List[str]:
+    """Sorted partition boundaries: every *depth*-character string."""
+    chars = sorted(set(alphabet))
+    return ["".join(p) for p in itertools.product(chars, repeat=max(1, depth))]
+
+
+def _partitioned(ns: ObjectNamespace, clock: _Clock, concurrency: int,
+                 alphabet: str, split_depth: int) -> List[str]:
+    # Partition i holds keys in (bounds[i], bounds[i + 1]].
+    bounds = [""] + split_points(alphabet, split_depth) + [None]
+    found: List[str] = []
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        futures = [ex.submit(_drain, ns, clock, "", "", lo, hi)
+                   for lo, hi in zip(bounds, bounds[1:])]
+        for fut in futures:
+            found.extend(fut.result()[0])
+    return found
+
+
+_STRATEGY_FNS = {"flat": _flat, "delimiter": _delimiter,
+                 "partitioned": _partitioned}
+
+
+def run_strategy(ns: ObjectNamespace, strategy: str, concurrency: int = 8,
+                 alphabet: str = DEFAULT_ALPHABET,
+                 split_depth: int = 1) -> StrategyResult:
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"Unknown listing strategy '{strategy}'. "
+            f"Choose from: {', '.join(STRATEGIES)}")
+    concurrency = max(1, concurrency)
+    ns.reset_requests()
+    clock = _Clock()
+    found = _STRATEGY_FNS[strategy](ns, clock, concurrency, alphabet,
+                                    split_depth)
+    dur = max(time.perf_counter() - clock.start, 1e-9)
+    return StrategyResult(
+        strategy=strategy,
+        concurrency=1 if strategy == "flat" else concurrency,
+        keys=len(found), requests=ns.requests, duration_sec=dur,
+        first_page_sec=clock.first if clock.first is not None else dur,
+        keys_per_sec=len(found) / dur,
+        complete=len(found) == len(ns) and sorted(found) == ns.keys,
+    )
+
+
+def strategy_summary(results: List[StrategyResult]) -> Dict[str, Dict[str, Any]]:
+    return {
+        r.strategy: {
+            "requests": r.requests,
+            "duration_sec": round(r.duration_sec, 6),
+            "first_page_sec": round(r.first_page_sec, 6),
+            "keys_per_sec": round(r.keys_per_sec, 1),
+            "complete": r.complete,
+        }
+        for r in results
+    }
@@ -0,0 +1,232 @@
+"""Compact, array-backed listing state for very large trees.
+
+The default :func:`~.fs_lister.list_tree` keeps every file path as its own
+``str`` and every page record as a list of formatted strings, then sorts
+the records by parsing those strings. At tens of millions of entries that
+is gigabytes of small objects. The compact representation keeps:
+
+- :class:`PathTable`: each directory path once (interned), file names
+  NUL-terminated in one ``bytearray`` with ``array('Q')`` offsets, and an
+  ``array('I')`` directory id per entry. Full paths are only built for
+  the page being probed.
+- :class:`RecordTable`: page records as ``array('d')`` start/end columns,
+  ``array('I')`` counts and interned directory ids, sorted numerically.
+  Iterating yields the usual string rows one at a time, so CSV output
+  streams; :meth:`RecordTable.write_binary` dumps the columns as is.
+
+:func:`memory_compare` lists the same tree both ways, each in a fresh
+process, and reports peak RSS.
+"""
+
+import json
+import os
+import struct
+import time
+from array import array
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from benchmarks_common.sysinfo import peak_rss_mb, run_isolated
+
+_BINARY_MAGIC = b"LSTREC1\n"
+
+
+class _Interner:
+    def __init__(self):
+        self.dirs: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, path: str) -> int:
+        i = self._ids.get(path)
+        if i is None:
+            i = self._ids[path] = len(self.dirs)
+            self.dirs.append(path)
+        return i
+
+
+class PathTable(_Interner):
+    """File paths as interned directories plus one blob of names."""
+
+    def __init__(self):
+        super().__init__()
+        self.dir_of = array("I")
+        self._names = bytearray()
+        self._offsets = array("Q", [0])
+
+    def add_dir(self, path: str, names: Sequence[str]) -> None:
+        d = self.intern(path)
+        for name in names:
+            self._names += os.fsencode(name) + b"\0"
+            self._offsets.append(len(self._names))
+            self.dir_of.append(d)
+
+    def __len__(self) -> int:
+        return len(self.dir_of)
+
+    def name(self, i: int) -> str:
+        return os.fsdecode(bytes(self._names[self._offsets[i]:self._offsets[i + 1] - 1]))
+
+    def path(self, i: int) -> str:
+        return os.path.join(self.dirs[self.dir_of[i]], self.name(i))
+
+    def paths(self, lo: int, hi: int) -> List[str]:
+        if hi <= lo:
+            return []
+        if self.dir_of[lo] != self.dir_of[hi - 1]:
+            return [self.path(i) for i in range(lo, hi)]
+        # One directory: split the blob slice instead of decoding per entry.
+        prefix = os.path.join(self.dirs[self.dir_of[lo]], "")
+        blob = bytes(self._names[self._offsets[lo]:self._offsets[hi] - 1])
+        return [prefix + os.fsdecode(n) for n in blob.split(b"\0")]
+
+    def ranges(self) -> Iterator[Tuple[str, int, int]]:
+        """``(directory, first, end)`` runs of entries of one directory."""
+        lo = 0
+        n = len(self.dir_of)
+        while lo < n:
+            d = self.dir_of[lo]
+            hi = lo + 1
+            while hi < n and self.dir_of[hi] == d:
+                hi += 1
+            yield self.dirs[d], lo, hi
+            lo = hi
+
+    def nbytes(self) -> int:
+        """Approximate memory held, excluding the directory strings."""
+        return (len(self._names) + self._offsets.itemsize * len(self._offsets)
+                + self.dir_of.itemsize * len(self.dir_of))
+
+    @classmethod
+    def from_walk(cls, root: str) -> "PathTable":
+        """Enumerate *root* with ``os.scandir``, keeping only names."""
+        table = cls()
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            names: List[str] = []
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_file(follow_symlinks=False):
+                            names.append(entry.name)
+                        elif entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+            except (PermissionError, FileNotFoundError):
+                continue
+            table.add_dir(current, names)
+        return table
+
+    @classmethod
+    def from_dirs(cls, dirs: Sequence[tuple]) -> "PathTable":
+        """From ``(path, [file paths])`` pairs, e.g. a tree manifest."""
+        table = cls()
+        for path, files in dirs:
+            table.add_dir(path, [os.path.basename(os.fspath(f)) for f in files])
+        return table
+
+
+class RecordTable(_Interner):
+    """Columnar page records; iterates as the legacy string rows."""
+
+    def __init__(self):
+        super().__init__()
+        self.start = array("d")
+        self.end = array("d")
+        self.count = array("I")
+        self.dir_id = array("I")
+
+    def append(self, start: float, end: float, count: int, path: str) -> None:
+        self.start.append(start)
+        self.end.append(end)
+        self.count.append(count)
+        self.dir_id.append(self.intern(path))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def extend(self, other: "RecordTable") -> None:
+        """Append *other*'s rows, re-interning its directories."""
+        ids = array("I", (self.intern(d) for d in other.dirs))
+        self.start.extend(other.start)
+        self.end.extend(other.end)
+        self.count.extend(other.count)
+        self.dir_id.extend(ids[d] for d in other.dir_id)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for s, e, c, d in zip(self.start, self.end, self.count, self.dir_id):
+            yield [f"{s:.6f}", f"{e:.6f}", str(c), self.dirs[d]]
+
+    def sort(self) -> None:
+        """Sort by start time in place, comparing floats, not strings."""
+        order = sorted(range(len(self.start)), key=self.start.__getitem__)
+        for name in ("start", "end", "count", "dir_id"):
+            col = getattr(self, name)
+            setattr(self, name, array(col.typecode, (col[i] for i in order)))
+
+    def durations(self) -> List[float]:
+        return [e - s for s, e in zip(self.start, self.end)]
+
+    def write_binary(self, path: str) -> None:
+        """Magic, JSON directory list, row count, then the raw columns."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        header = json.dumps(self.dirs).encode("utf-8")
+        with open(path, "wb") as fh:
+            fh.write(_BINARY_MAGIC)
+            fh.write(struct.pack("<QQ", len(header), len(self.start)))
+            fh.write(header)
+            for col in (self.start, self.end, self.count, self.dir_id):
+                col.tofile(fh)
+
+    @classmethod
+    def read_binary(cls, path: str) -> "RecordTable":
+        table = cls()
+        with open(path, "rb") as fh:
+            if fh.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+                raise ValueError(f"'{path}' is not a listing record file")
+            hlen, n = struct.unpack("<QQ", fh.read(16))
+            for d in json.loads(fh.read(hlen).decode("utf-8")):
+                table.intern(d)
+            for name in ("start", "end", "count", "dir_id"):
+                getattr(table, name).fromfile(fh, n)
+        return table
+
+    @classmethod
+    def from_rows(cls, rows) -> "RecordTable":
+        table = cls()
+        for r in rows:
+            table.append(float(r[0]), float(r[1]), int(r[2]), r[3])
+        return table
+
+
+def _measure(root: str, page_size: int, concurrency: int, use_stat: bool,
+             use_scandir: bool, compact: bool, out: Any) -> None:
+    # Runs in a fresh process so each mode's peak RSS is its own.
+    from .fs_lister import list_tree
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    records = list_tree(root, page_size, concurrency, use_stat=use_stat,
+                        use_scandir=use_scandir, compact=compact)
+    duration = time.perf_counter() - start
+    out.put({
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "listing_rss_mb": round(peak_rss_mb() - baseline, 1),
+        "records": len(records),
+        "duration_sec": round(duration, 6),
+    })
+
+
+def memory_compare(root: str, page_size: int, concurrency: int,
+                   use_stat: bool = False,
+                   use_scandir: bool = False) -> Dict[str, Any]:
+    """Peak RSS of a default and a compact listing of *root*.
+
+    ``listing_rss_mb`` is the growth over the peak right after imports;
+    ``rss_ratio`` compares whole-process peaks.
+    """
+    out: Dict[str, Any] = {}
+    for mode, compact in (("default", False), ("compact", True)):
+        out[mode] = run_isolated(_measure, (root, page_size, concurrency,
+                                            use_stat, use_scandir, compact),
+                                 f"{mode} listing")
+    default, compact = out["default"]["peak_rss_mb"], out["compact"]["peak_rss_mb"]
+    out["rss_ratio"] = round(default / compact, 2) if compact > 0 else None
+    return out
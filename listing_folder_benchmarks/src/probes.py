@@ -0,0 +1,131 @@
+"""Per-entry metadata probes and weighted op mixes for listing.
+
+Real workloads do not only ``stat``: loaders open files, permission checks
+call ``access``, security labels and checksums live in xattrs. Lumping all
+of these into one "stat" latency hides which call is slow, so each probe
+is timed on its own:
+
+- ``dirent``: use what ``scandir`` already returned (no syscall),
+- ``dirent_stat``: ``DirEntry.stat()``, cached on the entry after the
+  first call (falls back to ``os.stat`` for plain paths),
+- ``stat`` / ``lstat``: a fresh ``os.stat`` / ``os.lstat``,
+- ``open``: ``os.open`` + ``os.close``, read-only,
+- ``access``: ``os.access(path, R_OK)``,
+- ``xattr``: ``os.listxattr`` (Linux only).
+
+An op mix such as ``stat:0.7,open:0.2,xattr:0.1`` assigns one op per entry
+by weight. The choice hashes the entry name, so it is deterministic and
+the same entries get the same ops across runs and passes.
+"""
+
+import os
+import threading
+import zlib
+from typing import Any, Dict, List, Tuple
+
+from benchmarks_common.stats import percentile, safe_mean
+
+PROBES = ("dirent", "dirent_stat", "stat", "lstat", "open", "access", "xattr")
+
+
+def xattr_supported() -> bool:
+    return hasattr(os, "listxattr")
+
+
+def parse_op_mix(spec: str) -> List[Tuple[str, float]]:
+    """Parse ``"stat:0.7,open:0.3"`` (or a bare ``"stat"``) into weights.
+
+    Weights are normalized to sum to 1; an empty spec gives ``[]``.
+    """
+    mix: List[Tuple[str, float]] = []
+    for part in spec.strip("[]").split(","):
+        if not part.strip():
+            continue
+        op, _, weight = part.strip().partition(":")
+        op = op.strip()
+        if op not in PROBES:
+            raise ValueError(
+                f"Unknown probe '{op}'. Choose from: {', '.join(PROBES)}")
+        if op == "xattr" and not xattr_supported():
+            raise ValueError("Probe 'xattr' needs os.listxattr (Linux only)")
+        w = float(weight) if weight.strip() else 1.0
+        if w < 0:
+            raise ValueError(f"Probe weight must be >= 0, got {w}")
+        mix.append((op, w))
+    total = sum(w for _, w in mix)
+    if mix and total <= 0:
+        raise ValueError(f"Op mix '{spec}' has no positive weight")
+    return [(op, w / total) for op, w in mix if w > 0]
+
+
+def pick_op(mix: List[Tuple[str, float]], name: str) -> str:
+    """Op for the entry called *name*, chosen by weight from its hash."""
+    if len(mix) == 1:
+        return mix[0][0]
+    u = zlib.crc32(name.encode("utf-8", "surrogateescape")) / 2 ** 32
+    acc = 0.0
+    for op, weight in mix:
+        acc += weight
+        if u < acc:
+            return op
+    return mix[-1][0]
+
+
+def run_probe(op: str, entry: Any) -> None:
+    """Apply *op* to *entry*, a ``DirEntry`` or a path; may raise OSError."""
+    is_dirent = isinstance(entry, os.DirEntry)
+    if op == "dirent":
+        if is_dirent:
+            entry.is_file(follow_symlinks=False)
+        return
+    if op == "dirent_stat" and is_dirent:
+        entry.stat()
+        return
+    path = os.fspath(entry)
+    if op in ("stat", "dirent_stat"):
+        os.stat(path)
+    elif op == "lstat":
+        os.lstat(path)
+    elif op == "open":
+        os.close(os.open(path, os.O_RDONLY))
+    elif op == "access":
+        os.access(path, os.R_OK)
+    elif op == "xattr":
+        os.listxattr(path)
+    else:
+        raise ValueError(f"Unknown probe '{op}'. Choose from: {', '.join(PROBES)}")
+
+
+class OpLatencies:
+    """Thread-safe per-op latency samples and error counts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def merge(self, samples: Dict[str, List[float]],
+              errors: Dict[str, int]) -> None:
+        with self._lock:
+            for op, values in samples.items():
+                self.samples.setdefault(op, []).extend(values)
+            for op, n in errors.items():
+                self.errors[op] = self.errors.get(op, 0) + n
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Count, errors and latency percentiles (microseconds) per op."""
+        out: Dict[str, Dict[str, Any]] = {}
+        for op in PROBES:
+            values = self.samples.get(op)
+            if not values:
+                continue
+            out[op] = {
+                "count": len(values),
+                "errors": self.errors.get(op, 0),
+                "mean_us": round(safe_mean(values) * 1e6, 2),
+                "p50_us": round(percentile(values, 0.50) * 1e6, 2),
+                "p95_us": round(percentile(values, 0.95) * 1e6, 2),
+                "p99_us": round(percentile(values, 0.99) * 1e6, 2),
+                "max_us": round(max(values) * 1e6, 2),
+            }
+        return out
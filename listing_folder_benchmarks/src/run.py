@@ -1,14 +1,29 @@
 import os
 import argparse
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List
 
 from benchmarks_common.cli import load_yaml_config, parse_bool
 from benchmarks_common.metadata import build_metadata
 from benchmarks_common.outputs import write_csv, write_yaml
 from benchmarks_common.stats import percentile, safe_median
+from benchmarks_common.sysinfo import peak_rss_mb
 
 from .synthetic_tree import make_tree
-from .fs_lister import list_tree
+from .timeline import TimelineBin, concurrency_sweep, littles_law, spans, timeline
+from .tree_builder import TreeSpec, build_finished, build_tree, journal_path_for
+from .fs_lister import (EXECUTORS, ExecutorStats, WalkStats,
+                        executor_parallelism, executor_scaling, iter_pages,
+                        list_tree, walk_scaling)
+from .manifest_cache import ChurnResult, manifest_dirs, run_churn
+from .object_store import (DEFAULT_ALPHABET, ObjectNamespace,
+                           StrategyResult, keys_from_spec, keys_from_tree,
+                           run_strategy, strategy_summary)
+from .shard_plan import PlanResult, plan_benchmark
+from .path_table import RecordTable, memory_compare
+from .mutation_storm import StormResult, storm_scaling, storm_summary
+from .probes import OpLatencies, parse_op_mix
+from .stat_cache import PassStats, StatCache, pass_summary, run_passes
 
 
 def main():
@@ -19,13 +34,114 @@ def main():
     p.add_argument("--root", type=str, default="./data/emulated_tree")
     p.add_argument("--entries-per-dir", type=int, default=2000)
     p.add_argument("--depth", type=int, default=3)
+    p.add_argument("--tree-profile", type=str, default="",
+                   help="Build the tree with the parallel builder: flat, "
+                        "balanced or skewed (empty = simple make_tree)")
+    p.add_argument("--fanout", type=int, default=8,
+                   help="Subdirectories per directory for --tree-profile")
+    p.add_argument("--file-size", type=int, default=0,
+                   help="Bytes per file for --tree-profile")
+    p.add_argument("--skew-alpha", type=float, default=1.2,
+                   help="Pareto shape of directory sizes (skewed profile)")
+    p.add_argument("--build-workers", type=int, default=1,
+                   help="Processes building the tree (--tree-profile)")
     p.add_argument("--concurrency", type=int, default=8)
     p.add_argument("--page-size", type=int, default=1000)
-    p.add_argument("--warm-cache", type=str, default="false")
+    p.add_argument("--warm-cache", type=str, default="false",
+                   help="Run one unmeasured listing pass first")
+    p.add_argument("--passes", type=int, default=1,
+                   help="Listing passes; pass 1 is reported as cold, the "
+                        "rest as steady state")
+    p.add_argument("--stat-cache-ttl", type=str, default="",
+                   help="Comma-separated stat cache TTLs in seconds to "
+                        "compare, e.g. 1,30 (empty = no cache)")
+    p.add_argument("--negative-ttl", type=float, default=-1.0,
+                   help="TTL for cached missing entries (-1 = same as TTL)")
+    p.add_argument("--negative-ratio", type=float, default=0.0,
+                   help="Fraction of entries also probed for a missing "
+                        "sidecar file (0..1)")
     p.add_argument("--use-stat", type=str, default="true",
                    help="Call os.stat() on every entry for real metadata I/O")
     p.add_argument("--use-scandir", type=str, default="false",
                    help="Use os.scandir() instead of os.walk()")
+    p.add_argument("--compact", type=str, default="false",
+                   help="Keep paths and records in compact array-backed "
+                        "tables instead of lists of strings")
+    p.add_argument("--memory-compare", type=str, default="false",
+                   help="Also list the tree default and compact, each in a "
+                        "fresh process, and report peak RSS")
+    p.add_argument("--raw-format", type=str, default="csv",
+                   choices=["csv", "binary"],
+                   help="Raw records as listing_raw.csv or listing_raw.bin")
+    p.add_argument("--executor", type=str, default="thread",
+                   choices=list(EXECUTORS),
+                   help="Probe pages on threads, worker processes, or "
+                        "threads inside worker processes")
+    p.add_argument("--processes", type=int, default=0,
+                   help="Worker processes for process/hybrid (0 = CPUs)")
+    p.add_argument("--executor-scaling", type=str, default="",
+                   help="Comma-separated worker counts; compares thread, "
+                        "process and hybrid entries/s at each")
+    p.add_argument("--hybrid-threads", type=int, default=4,
+                   help="Threads per process in --executor-scaling hybrid runs")
+    p.add_argument("--op-mix", type=str, default="",
+                   help="Weighted per-entry probes instead of --use-stat, "
+                        "e.g. stat:0.7,open:0.2,xattr:0.1 or dirent_stat")
+    p.add_argument("--parallel-walk", type=str, default="false",
+                   help="Enumerate with a work-stealing walker of "
+                        "--concurrency threads, streaming pages as found")
+    p.add_argument("--streaming", type=str, default="false",
+                   help="Yield pages while scandir is still iterating and "
+                        "report true time-to-first-page")
+    p.add_argument("--max-pages", type=int, default=0,
+                   help="Streaming: stop after this many pages (0 = all)")
+    p.add_argument("--manifest", type=str, default="false",
+                   help="Enumerate from a persisted tree manifest, "
+                        "rescanning only directories that changed")
+    p.add_argument("--manifest-path", type=str, default="",
+                   help="Tree manifest file (default: <root>.listing.manifest)")
+    p.add_argument("--churn", type=str, default="",
+                   help="Comma-separated %% of directories to modify, timing "
+                        "full scan vs. manifest refresh, e.g. 1,10")
+    p.add_argument("--storm-threads", type=str, default="",
+                   help="Comma-separated thread counts for a create/write/"
+                        "rename/unlink storm, e.g. 1,8,32 (empty = off)")
+    p.add_argument("--storm-fanout", type=int, default=16,
+                   help="Directories the storm spreads files over")
+    p.add_argument("--storm-files-per-dir", type=int, default=256)
+    p.add_argument("--storm-dir", type=str, default="",
+                   help="Scratch directory for the storm "
+                        "(default: <root>.storm, removed afterwards)")
+    p.add_argument("--object-strategies", type=str, default="",
+                   help="Object-store listing strategies to compare: "
+                        "flat,delimiter,partitioned (empty = off)")
+    p.add_argument("--object-latency-ms", type=float, default=10.0,
+                   help="Emulated latency per list request")
+    p.add_argument("--object-page-size", type=int, default=1000,
+                   help="Max keys per list response")
+    p.add_argument("--object-concurrency", type=int, default=0,
+                   help="Parallel list requests (0 = --concurrency)")
+    p.add_argument("--split-alphabet", type=str, default=DEFAULT_ALPHABET,
+                   help="Characters the partitioned strategy splits on")
+    p.add_argument("--split-depth", type=int, default=1,
+                   help="Boundary length for the partitioned strategy")
+    p.add_argument("--plan-planners", type=str, default="",
+                   help="Shard planners to time after listing: round_robin,"
+                        "hash,greedy (empty = off)")
+    p.add_argument("--plan-ranks", type=int, default=8)
+    p.add_argument("--plan-workers", type=int, default=4,
+                   help="Loader workers per rank")
+    p.add_argument("--plan-scale", type=str, default="",
+                   help="Comma-separated synthetic entry counts to plan, "
+                        "e.g. 1000000,10000000 (empty = the listed tree)")
+    p.add_argument("--timeline-interval", type=float, default=0.0,
+                   help="Timeline bin width in seconds (0 = 1/100 of the run)")
+    p.add_argument("--concurrency-sweep", type=str, default="",
+                   help="Comma-separated thread counts; wall-clock entries/s "
+                        "and Little's law at each (e.g. 1,2,4,8,16)")
+    p.add_argument("--walk-scaling", type=str, default="",
+                   help="Comma-separated walker thread counts to compare "
+                        "(enumeration only), e.g. 1,2,4,8")
     p.add_argument("--outdir", type=str, default="metrics")
     args = p.parse_args()
 
@@ -36,15 +152,84 @@ def main():
         args.root = cfg.get("data", {}).get("root", args.root)
         args.entries_per_dir = cfg.get("data", {}).get("entries_per_dir", args.entries_per_dir)
         args.depth = cfg.get("data", {}).get("depth", args.depth)
+        args.tree_profile = cfg.get("data", {}).get("profile", args.tree_profile)
+        args.fanout = cfg.get("data", {}).get("fanout", args.fanout)
+        args.file_size = cfg.get("data", {}).get("file_size", args.file_size)
+        args.skew_alpha = cfg.get("data", {}).get("skew_alpha", args.skew_alpha)
+        args.build_workers = cfg.get("data", {}).get("build_workers", args.build_workers)
         args.concurrency = cfg.get("benchmark", {}).get("concurrency", args.concurrency)
         args.page_size = cfg.get("benchmark", {}).get("page_size", args.page_size)
         args.warm_cache = str(cfg.get("benchmark", {}).get("warm_cache", args.warm_cache)).lower()
+        args.passes = cfg.get("benchmark", {}).get("passes", args.passes)
+        args.stat_cache_ttl = str(cfg.get("stat_cache", {}).get("ttl", args.stat_cache_ttl))
+        args.negative_ttl = cfg.get("stat_cache", {}).get("negative_ttl", args.negative_ttl)
+        args.negative_ratio = cfg.get("stat_cache", {}).get("negative_ratio", args.negative_ratio)
         args.use_stat = str(cfg.get("benchmark", {}).get("use_stat", args.use_stat))
         args.use_scandir = str(cfg.get("benchmark", {}).get("use_scandir", args.use_scandir))
+        args.compact = str(cfg.get("benchmark", {}).get("compact", args.compact))
+        args.memory_compare = str(cfg.get("benchmark", {}).get("memory_compare", args.memory_compare))
+        args.raw_format = cfg.get("output", {}).get("raw_format", args.raw_format)
+        args.executor = cfg.get("benchmark", {}).get("executor", args.executor)
+        args.processes = cfg.get("benchmark", {}).get("processes", args.processes)
+        args.executor_scaling = str(cfg.get("benchmark", {}).get("executor_scaling", args.executor_scaling))
+        args.hybrid_threads = cfg.get("benchmark", {}).get("hybrid_threads", args.hybrid_threads)
+        args.op_mix = str(cfg.get("benchmark", {}).get("op_mix", args.op_mix))
+        args.parallel_walk = str(cfg.get("benchmark", {}).get("parallel_walk", args.parallel_walk))
+        args.streaming = str(cfg.get("benchmark", {}).get("streaming", args.streaming))
+        args.max_pages = cfg.get("benchmark", {}).get("max_pages", args.max_pages)
+        args.manifest = str(cfg.get("manifest", {}).get("enabled", args.manifest))
+        args.manifest_path = cfg.get("manifest", {}).get("path", args.manifest_path)
+        args.churn = str(cfg.get("manifest", {}).get("churn", args.churn))
+        args.storm_threads = str(cfg.get("storm", {}).get("threads", args.storm_threads))
+        args.storm_fanout = cfg.get("storm", {}).get("fanout", args.storm_fanout)
+        args.storm_files_per_dir = cfg.get("storm", {}).get("files_per_dir", args.storm_files_per_dir)
+        args.storm_dir = cfg.get("storm", {}).get("dir", args.storm_dir)
+        args.object_strategies = str(cfg.get("object_store", {}).get("strategies", args.object_strategies))
+        args.object_latency_ms = cfg.get("object_store", {}).get("latency_ms", args.object_latency_ms)
+        args.object_page_size = cfg.get("object_store", {}).get("page_size", args.object_page_size)
+        args.object_concurrency = cfg.get("object_store", {}).get("concurrency", args.object_concurrency)
+        args.split_alphabet = cfg.get("object_store", {}).get("split_alphabet", args.split_alphabet)
+        args.split_depth = cfg.get("object_store", {}).get("split_depth", args.split_depth)
+        args.plan_planners = str(cfg.get("plan", {}).get("planners", args.plan_planners))
+        args.plan_ranks = cfg.get("plan", {}).get("ranks", args.plan_ranks)
+        args.plan_workers = cfg.get("plan", {}).get("workers", args.plan_workers)
+        args.plan_scale = str(cfg.get("plan", {}).get("scale", args.plan_scale))
+        args.timeline_interval = cfg.get("benchmark", {}).get("timeline_interval", args.timeline_interval)
+        args.concurrency_sweep = str(cfg.get("benchmark", {}).get("concurrency_sweep", args.concurrency_sweep))
+        args.walk_scaling = str(cfg.get("benchmark", {}).get("walk_scaling", args.walk_scaling))
         args.outdir = cfg.get("output", {}).get("dir", args.outdir)
 
     use_stat = parse_bool(args.use_stat)
     use_scandir = parse_bool(args.use_scandir)
+    parallel_walk = parse_bool(args.parallel_walk)
+    streaming = parse_bool(args.streaming)
+    use_manifest = parse_bool(args.manifest)
+    if streaming and use_manifest:
+        # Streaming pages come straight from scandir; nothing would read
+        # the manifest, so the run would silently measure something else.
+        p.error("--streaming true lists with scandir and cannot use "
+                "--manifest true; enable one of them")
+    compact = parse_bool(args.compact)
+    op_mix = parse_op_mix(args.op_mix)
+    op_latencies = OpLatencies()
+    churn = [float(v) for v in args.churn.strip("[]").split(",")
+             if v.strip() and float(v) > 0]
+    ttls = [float(v) for v in args.stat_cache_ttl.strip("[]").split(",")
+            if v.strip() and float(v) >= 0]
+    storm_threads = [int(v) for v in args.storm_threads.strip("[]").split(",")
+                     if v.strip() and int(v) > 0]
+    strategies = [v.strip() for v in args.object_strategies.strip("[]").split(",")
+                  if v.strip()]
+    planners = [v.strip() for v in args.plan_planners.strip("[]").split(",")
+                if v.strip()]
+    plan_scale = [int(float(v)) for v in args.plan_scale.strip("[]").split(",")
+                  if v.strip() and float(v) > 0]
+    executor_counts = [int(v) for v in args.executor_scaling.strip("[]").split(",")
+                       if v.strip() and int(v) > 0]
+    sweep = [int(v) for v in args.concurrency_sweep.strip("[]").split(",")
+             if v.strip() and int(v) > 0]
+    scaling = [int(v) for v in args.walk_scaling.strip("[]").split(",")
+               if v.strip() and int(v) > 0]
 
     # Prepare output dirs
     run_dir = os.path.join(args.outdir, args.run_name)
@@ -52,37 +237,226 @@ def main():
     summary_yaml = os.path.join(run_dir, "listing_summary.yaml")
     meta_yaml = os.path.join(run_dir, "metadata.yaml")
 
-    # Build synthetic tree if missing
-    if not os.path.exists(args.root):
+    # Build synthetic tree if missing; the parallel builder also resumes
+    # an interrupted build and leaves a finished one alone.
+    build = None
+    if args.tree_profile:
+        if (not os.path.exists(args.root)
+                or (os.path.exists(journal_path_for(args.root))
+                    and not build_finished(args.root))):
+            spec = TreeSpec(args.tree_profile, args.entries_per_dir,
+                            args.fanout, args.depth, args.file_size,
+                            args.skew_alpha)
+            build = build_tree(args.root, spec, args.build_workers)
+    elif not os.path.exists(args.root):
         make_tree(args.root, args.entries_per_dir, args.depth)
 
-    records = list_tree(
-        args.root, args.page_size, args.concurrency,
-        use_stat=use_stat, use_scandir=use_scandir,
-    )
-    durations = [float(r[1]) - float(r[0]) for r in records]
-    total_entries = sum(int(r[2]) for r in records)
+    if parse_bool(args.warm_cache):
+        list_tree(args.root, args.page_size, args.concurrency,
+                  use_stat=use_stat, use_scandir=use_scandir)
+
+    wall_start = time.time()
+    run_start = time.perf_counter()
+    page_rows = []
+    discovery = None
+    if use_manifest:
+        dirs, discovery = manifest_dirs(args.root, args.manifest_path)
+        records = list_tree(args.root, args.page_size, args.concurrency,
+                            use_stat=use_stat, dirs=dirs, op_mix=op_mix,
+                            op_latencies=op_latencies, compact=compact,
+                            executor=args.executor, processes=args.processes)
+    elif streaming:
+        # Only page metadata is kept, so memory stays bounded.
+        records = []
+        for page in iter_pages(args.root, args.page_size, use_stat,
+                               start=run_start):
+            page_rows.append([page.index, len(page.entries),
+                              round(page.started_sec, 6),
+                              round(page.delivered_sec, 6), page.path])
+            records.append([f"{wall_start + page.started_sec:.6f}",
+                            f"{wall_start + page.delivered_sec:.6f}",
+                            str(len(page.entries)), page.path])
+            if args.max_pages and len(page_rows) >= args.max_pages:
+                break
+    else:
+        records = list_tree(
+            args.root, args.page_size, args.concurrency,
+            use_stat=use_stat, use_scandir=use_scandir,
+            parallel_walk=parallel_walk, op_mix=op_mix,
+            op_latencies=op_latencies, compact=compact,
+            executor=args.executor, processes=args.processes,
+        )
+    elapsed = time.perf_counter() - run_start
+    # (start, end, entries) per call; a RecordTable yields its columns
+    # directly instead of formatting rows and parsing them back.
+    calls = spans(records)
+    durations = (records.durations() if isinstance(records, RecordTable)
+                 else [end - start for start, end, _ in calls])
+    total_entries = sum(n for _, _, n in calls)
     total_time = sum(durations) if durations else 0.0
 
     ttfb = durations[0] if durations else 0.0
-    entries_per_sec = (total_entries / total_time) if total_time > 0 else 0.0
+    # Start of the run to the first page completed, not one chunk's duration.
+    first_page = (min(end for _, end, _ in calls) - wall_start
+                  if calls else elapsed)
+    # Calls overlap under concurrency: throughput is over wall-clock time,
+    # entries / sum(durations) is per-call speed.
+    law = littles_law(calls, executor_parallelism(
+        args.executor, args.concurrency, args.processes))
 
     summary: Dict[str, Any] = {
         "entries": total_entries,
-        "entries_per_sec": round(entries_per_sec, 2),
+        "entries_per_sec": law["entries_per_sec"],
+        "serial_entries_per_sec": (round(total_entries / total_time, 2)
+                                   if total_time > 0 else 0.0),
         "p50_call_sec": round(safe_median(durations), 6),
         "p95_call_sec": round(percentile(durations, 0.95), 6),
         "p99_call_sec": round(percentile(durations, 0.99), 6),
         "ttfb_sec": round(ttfb, 6),
+        "time_to_first_page_sec": round(max(first_page, 0.0), 6),
+        "elapsed_sec": round(elapsed, 6),
         "amplification": round(len(records) / max(1, (total_entries / max(1, args.page_size))), 4),
         "concurrency": args.concurrency,
         "page_size": args.page_size,
         "warm_cache": args.warm_cache,
         "use_stat": use_stat,
         "use_scandir": use_scandir,
+        "parallel_walk": parallel_walk,
+        "streaming": streaming,
+        "compact": compact,
+        "executor": args.executor,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "littles_law": law,
     }
+    write_csv(os.path.join(run_dir, "listing_timeline.csv"),
+              _timeline_rows(timeline(calls, args.timeline_interval)))
+    if streaming:
+        gaps = [b[3] - a[3] for a, b in zip(page_rows, page_rows[1:])]
+        summary["pages"] = len(page_rows)
+        summary["stopped_early"] = bool(
+            args.max_pages and len(page_rows) >= args.max_pages)
+        summary["p50_page_gap_sec"] = round(safe_median(gaps), 6)
+        summary["p99_page_gap_sec"] = round(percentile(gaps, 0.99), 6)
+        write_csv(os.path.join(run_dir, "listing_pages.csv"),
+                  [["page", "entries", "started_sec", "delivered_sec",
+                    "path"]] + page_rows)
+
+    if op_latencies.samples:
+        summary["op_mix"] = {op: round(w, 4) for op, w in op_mix}
+        summary["ops"] = op_latencies.summary()
+        write_csv(os.path.join(run_dir, "listing_ops.csv"),
+                  _op_rows(summary["ops"]))
+
+    if parse_bool(args.memory_compare):
+        summary["memory"] = memory_compare(args.root, args.page_size,
+                                           args.concurrency, use_stat,
+                                           use_scandir)
+
+    if build is not None:
+        summary["build"] = {
+            "profile": build.profile, "dirs": build.dirs,
+            "files": build.files, "built_files": build.built_files,
+            "skipped_tasks": build.skipped_tasks,
+            "duration_sec": round(build.duration_sec, 6),
+            "entries_per_sec": round(build.entries_per_sec, 1),
+            "workers": build.workers,
+        }
+
+    if discovery is not None:
+        summary["manifest"] = discovery.as_dict()
+    if churn:
+        churn_results = run_churn(args.root, churn)
+        write_csv(os.path.join(run_dir, "listing_churn.csv"),
+                  _churn_rows(churn_results))
+        summary["churn"] = _churn_summary(churn_results)
+
+    if args.passes > 1 or ttls:
+        pass_stats = run_passes(args.root, args.page_size, args.concurrency,
+                                max(args.passes, 2),
+                                negative_ratio=args.negative_ratio)
+        summary["passes"] = pass_summary(pass_stats)
+        baseline = summary["passes"]["steady_pass_sec"]
+        for ttl in ttls:
+            neg = ttl if args.negative_ttl < 0 else args.negative_ttl
+            cached = run_passes(args.root, args.page_size, args.concurrency,
+                                max(args.passes, 2), StatCache(ttl, neg),
+                                negative_ratio=args.negative_ratio)
+            pass_stats.extend(cached)
+            row = pass_summary(cached)
+            row["speedup"] = round(baseline / max(row["steady_pass_sec"], 1e-9), 2)
+            summary.setdefault("stat_cache", {})[ttl] = row
+        write_csv(os.path.join(run_dir, "listing_passes.csv"),
+                  _pass_rows(pass_stats))
+
+    if storm_threads:
+        storm = storm_scaling(
+            args.storm_dir or args.root.rstrip(os.sep) + ".storm",
+            storm_threads, args.storm_fanout, args.storm_files_per_dir)
+        write_csv(os.path.join(run_dir, "listing_storm.csv"),
+                  _storm_rows(storm))
+        summary["storm"] = storm_summary(storm)
+
+    if planners:
+        plans = plan_benchmark(plan_scale or [args.root], planners,
+                               args.plan_ranks, args.plan_workers)
+        write_csv(os.path.join(run_dir, "listing_plan.csv"), _plan_rows(plans))
+        summary["plan"] = _plan_summary(plans)
+
+    if strategies:
+        # The namespace mirrors the tree: the planned keys when a profile
+        # is set (no disk walk), the files under --root otherwise.
+        keys = (keys_from_spec(TreeSpec(
+                    args.tree_profile, args.entries_per_dir, args.fanout,
+                    args.depth, args.file_size, args.skew_alpha))
+                if args.tree_profile else keys_from_tree(args.root))
+        ns = ObjectNamespace(keys, args.object_page_size,
+                             args.object_latency_ms)
+        object_results = [
+            run_strategy(ns, s, args.object_concurrency or args.concurrency,
+                         args.split_alphabet, args.split_depth)
+            for s in strategies
+        ]
+        write_csv(os.path.join(run_dir, "listing_object_store.csv"),
+                  _object_rows(object_results))
+        summary["object_store"] = {
+            "keys": len(ns), "latency_ms": args.object_latency_ms,
+            "page_size": ns.page_size,
+            "strategies": strategy_summary(object_results),
+        }
+
+    if executor_counts:
+        executor_stats = executor_scaling(args.root, args.page_size,
+                                          executor_counts, use_stat,
+                                          args.hybrid_threads)
+        write_csv(os.path.join(run_dir, "listing_executors.csv"),
+                  _executor_rows(executor_stats))
+        summary["executors"] = _executor_summary(executor_stats)
+
+    if sweep:
+        swept = concurrency_sweep(args.root, args.page_size, sweep, use_stat,
+                                  use_scandir)
+        write_csv(os.path.join(run_dir, "listing_sweep.csv"),
+                  _sweep_rows(swept))
+        summary["sweep"] = {
+            n: {k: r[k] for k in ("entries_per_sec", "serial_entries_per_sec",
+                                  "mean_latency_sec", "mean_in_flight",
+                                  "utilization")}
+            for n, r in swept.items()
+        }
+
+    if scaling:
+        walk_stats = walk_scaling(args.root, scaling)
+        write_csv(os.path.join(run_dir, "listing_walk.csv"),
+                  _walk_rows(walk_stats))
+        summary["walk"] = _walk_summary(walk_stats)
 
-    write_csv(raw_csv, records)
+    if args.raw_format == "binary":
+        if not isinstance(records, RecordTable):
+            records = RecordTable.from_rows(records)
+        records.write_binary(os.path.join(run_dir, "listing_raw.bin"))
+    else:
+        # A RecordTable formats its rows lazily, so this streams.
+        write_csv(raw_csv, records)
     write_yaml(summary_yaml, summary)
     write_yaml(meta_yaml, build_metadata(
         run_name=args.run_name,
@@ -92,5 +466,155 @@ def main():
     ))
 
 
+_PLAN_COLS = ["planner", "source", "entries", "ranks", "workers", "plan_sec",
+              "input_rss_mb", "plan_rss_mb", "rank_count_imbalance",
+              "rank_byte_imbalance", "worker_count_imbalance",
+              "worker_byte_imbalance"]
+
+
+def _timeline_rows(bins: List[TimelineBin]):
+    rows = [["t_sec", "in_flight", "completed_calls", "completed_entries",
+             "entries_per_sec"]]
+    for b in bins:
+        rows.append([round(b.t_sec, 6), round(b.in_flight, 3),
+                     b.completed_calls, b.completed_entries,
+                     round(b.entries_per_sec, 1)])
+    return rows
+
+
+_SWEEP_COLS = ["wall_sec", "entries_per_sec", "serial_entries_per_sec",
+               "calls_per_sec", "mean_latency_sec", "mean_in_flight",
+               "utilization"]
+
+
+def _sweep_rows(swept: Dict[int, Dict[str, Any]]):
+    return [["concurrency"] + _SWEEP_COLS] + [
+        [n] + [law[c] for c in _SWEEP_COLS] for n, law in swept.items()]
+
+
+def _executor_rows(stats: List[ExecutorStats]):
+    rows = [["executor", "workers", "threads_per_worker", "entries",
+             "duration_sec", "entries_per_sec"]]
+    for s in stats:
+        rows.append([s.executor, s.workers, s.threads_per_worker, s.entries,
+                     round(s.duration_sec, 6), round(s.entries_per_sec, 1)])
+    return rows
+
+
+def _executor_summary(stats: List[ExecutorStats]) -> Dict[str, Any]:
+    out: Dict[Any, Dict[str, Any]] = {}
+    for s in stats:
+        out.setdefault(s.workers, {})[s.executor] = round(s.entries_per_sec, 1)
+    for row in out.values():
+        thread = row.get("thread", 0.0)
+        row["process_over_thread"] = (
+            round(row.get("process", 0.0) / thread, 2) if thread else None)
+    return out
+
+
+def _plan_rows(results: List[PlanResult]):
+    rows = [list(_PLAN_COLS)]
+    for r in results:
+        rows.append([round(v, 6) if isinstance(v, float) else v
+                     for v in (getattr(r, c) for c in _PLAN_COLS)])
+    return rows
+
+
+def _plan_summary(results: List[PlanResult]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for r in results:
+        out.setdefault(r.source, {"entries": r.entries})[r.planner] = {
+            "plan_sec": round(r.plan_sec, 6),
+            "plan_rss_mb": r.plan_rss_mb,
+            "rank_byte_imbalance": r.rank_byte_imbalance,
+            "worker_count_imbalance": r.worker_count_imbalance,
+            "worker_byte_imbalance": r.worker_byte_imbalance,
+        }
+    return out
+
+
+def _object_rows(results: List[StrategyResult]):
+    rows = [["strategy", "concurrency", "keys", "requests", "duration_sec",
+             "first_page_sec", "keys_per_sec", "complete"]]
+    for r in results:
+        rows.append([r.strategy, r.concurrency, r.keys, r.requests,
+                     round(r.duration_sec, 6), round(r.first_page_sec, 6),
+                     round(r.keys_per_sec, 1), r.complete])
+    return rows
+
+
+def _storm_rows(results: List[StormResult]):
+    rows = [["threads", "op", "ops", "errors", "duration_sec", "ops_per_sec",
+             "p50_us", "p99_us", "max_us"]]
+    for r in results:
+        rows.append([r.threads, r.op, r.ops, r.errors, round(r.duration_sec, 6),
+                     round(r.ops_per_sec, 1), round(r.p50_us, 2),
+                     round(r.p99_us, 2), round(r.max_us, 2)])
+    return rows
+
+
+def _op_rows(ops: Dict[str, Dict[str, Any]]):
+    cols = ["count", "errors", "mean_us", "p50_us", "p95_us", "p99_us",
+            "max_us"]
+    return [["op"] + cols] + [[op] + [row[c] for c in cols]
+                              for op, row in ops.items()]
+
+
+def _pass_rows(stats: List[PassStats]):
+    rows = [["ttl_sec", "pass", "entries", "duration_sec", "entries_per_sec",
+             "hits", "negative_hits", "misses", "hit_rate"]]
+    for s in stats:
+        rows.append([s.ttl_sec, s.pass_no, s.entries, round(s.duration_sec, 6),
+                     round(s.entries_per_sec, 1), s.hits, s.negative_hits,
+                     s.misses, round(s.hit_rate, 4)])
+    return rows
+
+
+def _churn_rows(results: List[ChurnResult]):
+    rows = [["churn_pct", "dirs", "changed_dirs", "full_scan_sec",
+             "refresh_sec", "rescanned_dirs", "stat_calls", "consistent"]]
+    for r in results:
+        rows.append([r.churn_pct, r.dirs, r.changed_dirs,
+                     round(r.full_scan_sec, 6), round(r.refresh_sec, 6),
+                     r.rescanned_dirs, r.stat_calls, r.consistent])
+    return rows
+
+
+def _churn_summary(results: List[ChurnResult]) -> Dict[str, Any]:
+    return {
+        r.churn_pct: {
+            "full_scan_sec": round(r.full_scan_sec, 6),
+            "refresh_sec": round(r.refresh_sec, 6),
+            "speedup": round(r.full_scan_sec / max(r.refresh_sec, 1e-9), 2),
+            "rescanned_dirs": r.rescanned_dirs,
+            "consistent": r.consistent,
+        }
+        for r in results
+    }
+
+
+def _walk_rows(stats: List[WalkStats]):
+    rows = [["workers", "dirs", "entries", "first_entry_sec", "duration_sec",
+             "dirs_per_sec", "entries_per_sec", "steals"]]
+    for s in stats:
+        rows.append([s.workers, s.dirs, s.entries, round(s.first_entry_sec, 6),
+                     round(s.duration_sec, 6), round(s.dirs_per_sec, 1),
+                     round(s.entries_per_sec, 1), s.steals])
+    return rows
+
+
+def _walk_summary(stats: List[WalkStats]) -> Dict[str, Any]:
+    base = stats[0].dirs_per_sec
+    return {
+        s.workers: {
+            "first_entry_sec": round(s.first_entry_sec, 6),
+            "dirs_per_sec": round(s.dirs_per_sec, 1),
+            "entries_per_sec": round(s.entries_per_sec, 1),
+            "speedup": round(s.dirs_per_sec / max(base, 1e-9), 2),
+        }
+        for s in stats
+    }
+
+
 if __name__ == "__main__":
     main()
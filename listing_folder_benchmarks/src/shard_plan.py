@@ -0,0 +1,184 @@
+"""Shard planning after enumeration: assigning files to ranks and workers.
+
+Once a job has listed its files, every rank derives the same assignment of
+files to ``ranks * workers`` shards (shard ``s`` is worker ``s % workers``
+of rank ``s // workers``). With millions of files the sort, hash or
+packing step is a visible slice of startup. Planners:
+
+- ``round_robin``: sort by file key, deal shards in turn (balances counts),
+- ``hash``: shard = key mod shards, no sort (balances counts on average),
+- ``greedy``: largest file first onto the least-loaded shard (LPT bin
+  packing; balances bytes).
+
+Files are identified by a 64-bit key (a hash of the relative path) and
+sized from their ``stat`` results, both held in ``array`` columns, so
+inputs of tens of millions of entries fit in memory. Each run plans in a
+fresh process so its peak RSS is its own; imbalance is the largest
+shard (or rank) over the mean, by count and by bytes.
+
+The listing's page records carry no per-file sizes, so a tree source is
+enumerated again inside the planning process (one streaming scandir pass
+using ``DirEntry.stat()``). That pass shows up in ``input_rss_mb`` only;
+``plan_sec`` times the planner alone, as if it ran right after listing.
+"""
+
+import hashlib
+import heapq
+import math
+import os
+import random
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Tuple
+
+from benchmarks_common.sysinfo import peak_rss_mb, run_isolated
+
+PLANNERS = ("round_robin", "hash", "greedy")
+
+
+@dataclass
+class PlanInput:
+    keys: array    # 'Q': 64-bit hash of the relative path
+    sizes: array   # 'Q': bytes
+
+
+def path_key(rel: str) -> int:
+    return int.from_bytes(hashlib.blake2b(rel.encode("utf-8", "surrogateescape"),
+                                          digest_size=8).digest(), "little")
+
+
+def input_from_tree(root: str) -> PlanInput:
+    """Keys and ``DirEntry.stat()`` sizes of the files under *root*."""
+    inp = PlanInput(array("Q"), array("Q"))
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_file(follow_symlinks=False):
+                        inp.keys.append(path_key(os.path.relpath(entry.path, root)))
+                        inp.sizes.append(entry.stat(follow_symlinks=False).st_size)
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        except OSError:
+            continue
+    return inp
+
+
+def synthetic_input(entries: int, seed: int = 42, mean_kb: float = 128.0,
+                    sigma: float = 1.0) -> PlanInput:
+    """*entries* random keys with lognormal sizes of mean *mean_kb*."""
+    rng = random.Random(seed)
+    mu = math.log(max(mean_kb, 1e-3) * 1024) - sigma ** 2 / 2
+    keys = array("Q", (rng.getrandbits(64) for _ in range(entries)))
+    sizes = array("Q", (int(rng.lognormvariate(mu, sigma))
+                        for _ in range(entries)))
+    return PlanInput(keys, sizes)
+
+
+def plan_shards(inp: PlanInput, planner: str, shards: int) -> array:
+    """Shard index per entry (``array('I')``)."""
+    if planner not in PLANNERS:
+        raise ValueError(
+            f"Unknown planner '{planner}'. Choose from: {', '.join(PLANNERS)}")
+    shards = max(1, shards)
+    n = len(inp.keys)
+    if planner == "hash":
+        return array("I", (k % shards for k in inp.keys))
+    assign = array("I", bytes(4 * n))
+    if planner == "round_robin":
+        for rank, i in enumerate(sorted(range(n), key=inp.keys.__getitem__)):
+            assign[i] = rank % shards
+        return assign
+    # (bytes, files, shard): ties in bytes, e.g. empty files, go by count.
+    heap: List[Tuple[int, int, int]] = [(0, 0, s) for s in range(shards)]
+    for i in sorted(range(n), key=inp.sizes.__getitem__, reverse=True):
+        load, files, s = heap[0]
+        assign[i] = s
+        heapq.heapreplace(heap, (load + inp.sizes[i], files + 1, s))
+    return assign
+
+
+def _imbalance(values: List[int]) -> float:
+    mean = sum(values) / len(values) if values else 0
+    return round(max(values) / mean, 4) if mean > 0 else 1.0
+
+
+def imbalance(inp: PlanInput, assign: array, ranks: int,
+              workers: int) -> Dict[str, float]:
+    """Max over mean files and bytes, per shard (worker) and per rank."""
+    shards = ranks * workers
+    counts = [0] * shards
+    nbytes = [0] * shards
+    for s, size in zip(assign, inp.sizes):
+        counts[s] += 1
+        nbytes[s] += size
+    rank_counts = [sum(counts[r * workers:(r + 1) * workers]) for r in range(ranks)]
+    rank_bytes = [sum(nbytes[r * workers:(r + 1) * workers]) for r in range(ranks)]
+    return {
+        "rank_count_imbalance": _imbalance(rank_counts),
+        "rank_byte_imbalance": _imbalance(rank_bytes),
+        "worker_count_imbalance": _imbalance(counts),
+        "worker_byte_imbalance": _imbalance(nbytes),
+    }
+
+
+@dataclass
+class PlanResult:
+    planner: str
+    source: str           # "tree" or the synthetic entry count
+    entries: int
+    ranks: int
+    workers: int
+    plan_sec: float
+    input_rss_mb: float   # RSS growth while collecting the input
+    plan_rss_mb: float    # further RSS growth while planning
+    rank_count_imbalance: float
+    rank_byte_imbalance: float
+    worker_count_imbalance: float
+    worker_byte_imbalance: float
+
+
+def run_plan(source: Any, planner: str, ranks: int,
+             workers: int) -> PlanResult:
+    """Plan once in this process; *source* is a tree root or an entry count."""
+    ranks, workers = max(1, ranks), max(1, workers)
+    base = peak_rss_mb()
+    inp = (synthetic_input(source) if isinstance(source, int)
+           else input_from_tree(source))
+    loaded = peak_rss_mb()
+    start = time.perf_counter()
+    assign = plan_shards(inp, planner, ranks * workers)
+    plan_sec = time.perf_counter() - start
+    planned = peak_rss_mb()
+    return PlanResult(
+        planner=planner,
+        source=str(source) if isinstance(source, int) else "tree",
+        entries=len(inp.keys), ranks=ranks, workers=workers,
+        plan_sec=plan_sec, input_rss_mb=round(loaded - base, 1),
+        plan_rss_mb=round(planned - loaded, 1),
+        **imbalance(inp, assign, ranks, workers),
+    )
+
+
+def _plan_worker(source: Any, planner: str, ranks: int, workers: int,
+                 out: Any) -> None:
+    out.put(asdict(run_plan(source, planner, ranks, workers)))
+
+
+def plan_benchmark(sources: List[Any], planners: List[str], ranks: int,
+                   workers: int) -> List[PlanResult]:
+    """:func:`run_plan` for every source and planner, each in a fresh process."""
+    for planner in planners:
+        if planner not in PLANNERS:
+            raise ValueError(f"Unknown planner '{planner}'. "
+                             f"Choose from: {', '.join(PLANNERS)}")
+    results: List[PlanResult] = []
+    for source in sources:
+        for planner in planners:
+            row = run_isolated(_plan_worker, (source, planner, ranks, workers),
+                               f"{planner} planning")
+            results.append(PlanResult(**row))
+    return results
@@ -0,0 +1,125 @@
+"""Userspace attribute cache in front of ``os.stat`` and multi-pass runs.
+
+FUSE and network filesystems (gcsfuse, NFS ``actimeo``) cache attributes
+for a TTL so repeated ``stat`` calls skip the round trip, and cache
+"no such file" answers so repeated probes for missing files do too.
+:class:`StatCache` emulates that in-process: positive entries live for
+``ttl_sec``, negative entries for ``negative_ttl_sec``.
+
+:func:`run_passes` lists the tree several times. Pass 1 is reported as
+cold (it pays for dentry/inode cache and stat-cache misses) and later
+passes as steady state, with the stat cache's hit rates per pass.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks_common.stats import safe_mean
+
+from .fs_lister import list_tree
+
+
+class StatCache:
+    """TTL cache of ``os.stat`` results, including misses."""
+
+    def __init__(self, ttl_sec: float, negative_ttl_sec: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_sec = ttl_sec
+        self.negative_ttl_sec = (ttl_sec if negative_ttl_sec is None
+                                 else negative_ttl_sec)
+        self._clock = clock
+        # path -> (expires_at, stat_result or None for "does not exist")
+        self._entries: Dict[str, Tuple[float, Optional[os.stat_result]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def stat(self, path: str) -> os.stat_result:
+        now = self._clock()
+        cached = self._entries.get(path)
+        if cached is not None and cached[0] > now:
+            with self._lock:
+                if cached[1] is None:
+                    self.negative_hits += 1
+                else:
+                    self.hits += 1
+            if cached[1] is None:
+                raise FileNotFoundError(2, "No such file or directory (cached)",
+                                        path)
+            return cached[1]
+        with self._lock:
+            self.misses += 1
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            if self.negative_ttl_sec > 0:
+                self._entries[path] = (now + self.negative_ttl_sec, None)
+            raise
+        if self.ttl_sec > 0:
+            self._entries[path] = (now + self.ttl_sec, st)
+        return st
+
+    def counters(self) -> Tuple[int, int, int]:
+        """``(hits, negative_hits, misses)`` so far."""
+        with self._lock:
+            return self.hits, self.negative_hits, self.misses
+
+
+@dataclass
+class PassStats:
+    ttl_sec: float  # -1 = no stat cache
+    pass_no: int
+    entries: int
+    duration_sec: float
+    entries_per_sec: float
+    hits: int
+    negative_hits: int
+    misses: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / total if total else 0.0
+
+
+def run_passes(root: str, page_size: int, concurrency: int, passes: int,
+               cache: Optional[StatCache] = None,
+               negative_ratio: float = 0.0,
+               dirs: Optional[List[tuple]] = None) -> List[PassStats]:
+    """List *root* *passes* times with ``use_stat`` through *cache*."""
+    stats: List[PassStats] = []
+    before = (0, 0, 0)
+    for n in range(1, max(1, passes) + 1):
+        start = time.perf_counter()
+        records = list_tree(root, page_size, concurrency, use_stat=True,
+                            dirs=dirs, stat_cache=cache,
+                            negative_ratio=negative_ratio)
+        dur = max(time.perf_counter() - start, 1e-9)
+        entries = sum(int(r[2]) for r in records)
+        now = cache.counters() if cache is not None else (0, 0, 0)
+        hits, neg, misses = (a - b for a, b in zip(now, before))
+        before = now
+        stats.append(PassStats(
+            ttl_sec=cache.ttl_sec if cache is not None else -1, pass_no=n,
+            entries=entries, duration_sec=dur, entries_per_sec=entries / dur,
+            hits=hits, negative_hits=neg, misses=misses,
+        ))
+    return stats
+
+
+def pass_summary(stats: List[PassStats]) -> Dict[str, float]:
+    """Cold (pass 1) against steady state (mean of later passes)."""
+    cold = stats[0].duration_sec
+    steady = safe_mean([s.duration_sec for s in stats[1:]]) or cold
+    return {
+        "passes": len(stats),
+        "cold_pass_sec": round(cold, 6),
+        "steady_pass_sec": round(steady, 6),
+        "cold_over_steady": round(cold / max(steady, 1e-9), 2),
+        "steady_hit_rate": round(
+            safe_mean([s.hit_rate for s in stats[1:]]), 4),
+    }
@@ -0,0 +1,113 @@
+"""Wall-clock throughput, in-flight timeline and Little's law for listing.
+
+Raw records are ``[start_ts, end_ts, entries, path]`` per listing call.
+With concurrency above one the calls overlap, so ``entries / sum(call
+durations)`` is per-call speed, not throughput: it falls as concurrency
+rises even when the run finishes sooner. Throughput here is entries over
+wall-clock time, from the first call's start to the last call's end.
+
+Little's law ties the three together: mean calls in flight ``L`` equals
+call rate ``lambda`` times mean call latency ``W``. Comparing ``L`` with
+the configured concurrency shows whether the pool was kept busy (the
+filesystem or Python is the limit) or starved (enumeration could not
+feed it). The timeline bins the wall-clock window and reports, per bin,
+time-weighted calls in flight and entries completed.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .fs_lister import list_tree
+from .path_table import RecordTable
+
+# Default timeline resolution when no interval is given.
+_DEFAULT_BINS = 100
+
+
+def spans(records: Iterable) -> List[Tuple[float, float, int]]:
+    """``(start, end, entries)`` per call from raw records or a RecordTable."""
+    if isinstance(records, RecordTable):
+        return list(zip(records.start, records.end, records.count))
+    return [(float(r[0]), float(r[1]), int(r[2])) for r in records]
+
+
+def littles_law(calls: List[Tuple[float, float, int]],
+                concurrency: int) -> Dict[str, Any]:
+    """Wall-clock throughput and ``L = lambda * W`` for one run."""
+    if not calls:
+        return {"wall_sec": 0.0, "entries_per_sec": 0.0,
+                "serial_entries_per_sec": 0.0, "calls_per_sec": 0.0,
+                "mean_latency_sec": 0.0, "mean_in_flight": 0.0,
+                "concurrency": concurrency, "utilization": 0.0}
+    first = min(c[0] for c in calls)
+    last = max(c[1] for c in calls)
+    wall = max(last - first, 1e-9)
+    busy = sum(c[1] - c[0] for c in calls)
+    entries = sum(c[2] for c in calls)
+    rate = len(calls) / wall
+    latency = busy / len(calls)
+    in_flight = rate * latency
+    return {
+        "wall_sec": round(wall, 6),
+        "entries_per_sec": round(entries / wall, 2),
+        "serial_entries_per_sec": round(entries / max(busy, 1e-9), 2),
+        "calls_per_sec": round(rate, 2),
+        "mean_latency_sec": round(latency, 6),
+        "mean_in_flight": round(in_flight, 3),
+        "concurrency": concurrency,
+        "utilization": round(in_flight / max(1, concurrency), 3),
+    }
+
+
+@dataclass
+class TimelineBin:
+    t_sec: float          # bin start, relative to the first call
+    in_flight: float      # time-weighted mean calls in flight
+    completed_calls: int
+    completed_entries: int
+    entries_per_sec: float
+
+
+def timeline(calls: List[Tuple[float, float, int]],
+             interval_sec: float = 0.0) -> List[TimelineBin]:
+    """Bin the run into *interval_sec* slices (default: 100 bins)."""
+    if not calls:
+        return []
+    first = min(c[0] for c in calls)
+    wall = max(max(c[1] for c in calls) - first, 1e-9)
+    if interval_sec <= 0:
+        interval_sec = wall / _DEFAULT_BINS
+    n = max(1, math.ceil(wall / interval_sec - 1e-9))
+    busy = [0.0] * n
+    done_calls = [0] * n
+    done_entries = [0] * n
+    for start, end, count in calls:
+        s, e = start - first, end - first
+        for b in range(int(s / interval_sec), min(int(e / interval_sec), n - 1) + 1):
+            lo, hi = b * interval_sec, (b + 1) * interval_sec
+            busy[b] += max(0.0, min(e, hi) - max(s, lo))
+        b = min(int(e / interval_sec), n - 1)
+        done_calls[b] += 1
+        done_entries[b] += count
+    bins: List[TimelineBin] = []
+    for b in range(n):
+        # The last bin ends with the run, not a full interval later.
+        width = max(min(interval_sec, wall - b * interval_sec), 1e-9)
+        bins.append(TimelineBin(
+            t_sec=b * interval_sec, in_flight=busy[b] / width,
+            completed_calls=done_calls[b], completed_entries=done_entries[b],
+            entries_per_sec=done_entries[b] / width,
+        ))
+    return bins
+
+
+def concurrency_sweep(root: str, page_size: int, counts: List[int],
+                      use_stat: bool = True,
+                      use_scandir: bool = False) -> Dict[int, Dict[str, Any]]:
+    """:func:`littles_law` of a full listing at each thread count."""
+    return {
+        n: littles_law(spans(list_tree(root, page_size, n, use_stat=use_stat,
+                                       use_scandir=use_scandir)), n)
+        for n in counts
+    }
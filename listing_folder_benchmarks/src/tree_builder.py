@@ -0,0 +1,232 @@
+"""Parallel, deterministic synthetic trees at production scale.
+
+:func:`~.synthetic_tree.make_tree` is fine for demos but builds one file
+at a time from a global RNG. :func:`build_tree` plans the whole tree from
+a :class:`TreeSpec` first, then creates it with a process pool:
+
+- ``flat``: every file in the root directory (huge single directories),
+- ``balanced``: ``fanout`` subdirectories per level down to ``depth``,
+  ``entries_per_dir`` files in every directory,
+- ``skewed``: the balanced shape with power-law (Pareto) file counts per
+  directory, mean ``entries_per_dir``, so a few directories are huge.
+
+Names and per-directory sizes derive from ``(seed, relative path, index)``
+only, so a spec always produces the same tree regardless of the number of
+workers. The plan is cut into tasks of about ``chunk_files`` files (large
+directories are split across tasks); finished tasks are appended to a
+journal next to the tree (``<root>.build``) and ``resume=True`` skips
+them after an interruption. A completed build ends the journal with a
+``done`` line; :func:`build_finished` checks for it.
+"""
+
+import hashlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import List, Tuple
+
+PROFILES = ("flat", "balanced", "skewed")
+
+# Cap for skewed directories, as a multiple of entries_per_dir.
+_SKEW_CAP = 100
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    profile: str = "balanced"
+    entries_per_dir: int = 2000   # files per directory (mean when skewed)
+    fanout: int = 8               # subdirectories per non-leaf directory
+    depth: int = 3                # directory levels including the root
+    file_size: int = 0            # bytes written to every file
+    skew_alpha: float = 1.2       # Pareto shape; closer to 1 = heavier tail
+    seed: int = 42
+
+    def __post_init__(self) -> None:
+        if self.profile not in PROFILES:
+            raise ValueError(
+                f"Unknown tree profile '{self.profile}'. "
+                f"Choose from: {', '.join(PROFILES)}")
+        if self.profile == "skewed" and self.skew_alpha <= 1:
+            raise ValueError("skewed tree profile needs skew_alpha > 1")
+        if min(self.entries_per_dir, self.fanout, self.file_size) < 0:
+            raise ValueError("entries_per_dir, fanout and file_size must be >= 0")
+
+    @property
+    def levels(self) -> int:
+        return 1 if self.profile == "flat" else max(1, self.depth)
+
+    def files_in(self, rel: str) -> int:
+        if self.profile != "skewed":
+            return self.entries_per_dir
+        rng = random.Random(f"{self.seed}:{rel}")
+        scale = self.entries_per_dir * (self.skew_alpha - 1) / self.skew_alpha
+        return min(int(scale * rng.paretovariate(self.skew_alpha)),
+                   self.entries_per_dir * _SKEW_CAP)
+
+
+@dataclass
+class BuildReport:
+    root: str
+    profile: str
+    dirs: int
+    files: int
+    total_bytes: int
+    tasks: int
+    skipped_tasks: int   # already done according to the journal
+    built_files: int     # files created by this call
+    duration_sec: float
+    entries_per_sec: float  # built_files / duration_sec
+    workers: int
+
+
+def file_name(seed: int, rel: str, index: int) -> str:
+    token = hashlib.blake2b(f"{seed}:{rel}:{index}".encode(),
+                            digest_size=6).hexdigest()
+    return f"{token}_{index}.dat"
+
+
+def plan_tree(spec: TreeSpec) -> List[Tuple[str, int]]:
+    """``(relative dir, files)`` for every directory, parents first."""
+    plan: List[Tuple[str, int]] = []
+    stack = [("", 1)]
+    while stack:
+        rel, level = stack.pop()
+        plan.append((rel, spec.files_in(rel)))
+        if level < spec.levels:
+            stack.extend((os.path.join(rel, f"d{j:04d}"), level + 1)
+                         for j in reversed(range(spec.fanout)))
+    return plan
+
+
+def _tasks(plan: List[Tuple[str, int]],
+           chunk_files: int) -> List[List[Tuple[str, int, int]]]:
+    """Group ``(dir, first, end)`` file ranges into tasks of ~chunk_files."""
+    tasks: List[List[Tuple[str, int, int]]] = []
+    current: List[Tuple[str, int, int]] = []
+    size = 0
+    for rel, files in plan:
+        lo = 0
+        while True:
+            hi = min(files, lo + chunk_files - size)
+            current.append((rel, lo, hi))
+            size += hi - lo
+            if size >= chunk_files:
+                tasks.append(current)
+                current, size = [], 0
+            lo = hi
+            if lo >= files:
+                break
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+def _build_task(root: str, spec: TreeSpec,
+                ranges: List[Tuple[str, int, int]]) -> None:
+    """Create the directories and files of one task."""
+    payload = b"\0" * spec.file_size
+    for rel, lo, hi in ranges:
+        path = os.path.join(root, rel) if rel else root
+        # Ranges of a split directory may run before the one creating it.
+        os.makedirs(path, exist_ok=True)
+        for i in range(lo, hi):
+            fd = os.open(os.path.join(path, file_name(spec.seed, rel, i)),
+                         os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+            try:
+                if payload:
+                    os.write(fd, payload)
+            finally:
+                os.close(fd)
+
+
+_DONE_MARK = "done"
+
+
+def journal_path_for(root: str) -> str:
+    return root.rstrip(os.sep) + ".build"
+
+
+def build_finished(root: str) -> bool:
+    """Whether the journal of *root* records a completed build."""
+    try:
+        with open(journal_path_for(root)) as f:
+            last = f.read().rstrip("\n").rsplit("\n", 1)[-1]
+    except OSError:
+        return False
+    return last == _DONE_MARK
+
+
+def _read_journal(path: str, header: str) -> set:
+    with open(path) as f:
+        if f.readline().rstrip("\n") != header:
+            raise ValueError(
+                f"Build journal '{path}' is for a different tree spec; "
+                "remove it or the tree to rebuild")
+        return {int(line) for line in f if line.strip().isdigit()}
+
+
+def build_tree(root: str, spec: TreeSpec, workers: int = 1,
+               resume: bool = True, chunk_files: int = 20000) -> BuildReport:
+    """Create the tree described by *spec* under *root*.
+
+    With *resume*, tasks recorded in the journal by an earlier, possibly
+    interrupted, build are skipped; a finished tree is not touched again.
+    """
+    workers = max(1, workers)
+    plan = plan_tree(spec)
+    tasks = _tasks(plan, max(1, chunk_files))
+    journal = journal_path_for(root)
+    header = json.dumps({"spec": asdict(spec), "chunk_files": chunk_files},
+                        sort_keys=True)
+    done = (_read_journal(journal, header)
+            if resume and os.path.exists(journal) else set())
+    finished = bool(done) and build_finished(root)
+    todo = [i for i in range(len(tasks)) if i not in done]
+
+    os.makedirs(root, exist_ok=True)
+    start = time.perf_counter()
+    with open(journal, "a" if done else "w") as log:
+        if not done:
+            log.write(header + "\n")
+            log.flush()
+        if workers == 1 or len(todo) < 2:
+            for i in todo:
+                _build_task(root, spec, tasks[i])
+                log.write(f"{i}\n")
+                log.flush()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = {pool.submit(_build_task, root, spec, tasks[i]): i
+                           for i in todo}
+                # On a failure, cancel tasks not yet started but journal
+                # every task that still completes, so resume skips it.
+                failure = None
+                for fut in as_completed(futures):
+                    if fut.cancelled():
+                        continue
+                    exc = fut.exception()
+                    if exc is not None:
+                        if failure is None:
+                            failure = exc
+                            for other in futures:
+                                other.cancel()
+                        continue
+                    log.write(f"{futures[fut]}\n")
+                    log.flush()
+                if failure is not None:
+                    raise failure
+        if not finished:
+            log.write(_DONE_MARK + "\n")
+    duration = max(time.perf_counter() - start, 1e-9)
+    files = sum(n for _, n in plan)
+    built = sum(hi - lo for i in todo for _, lo, hi in tasks[i])
+    return BuildReport(
+        root=os.path.abspath(root), profile=spec.profile, dirs=len(plan),
+        files=files, total_bytes=files * spec.file_size, tasks=len(tasks),
+        skipped_tasks=len(tasks) - len(todo), built_files=built,
+        duration_sec=duration, entries_per_sec=built / duration,
+        workers=workers,
+    )
@@ -1,32 +1,25 @@
 """Generate synthetic binary tensor files for serving benchmark data loading."""
 
-import os
-import random
-import pathlib
 import argparse
+from typing import Optional
+
+from benchmarks_common.datagen import (SIZE_DISTRIBUTIONS, SizeSpec,
+                                       generate_samples, size_spec)
 
 
 def generate_dataset(root: str, count: int, size_kb: int,
-                     seed: int = 42) -> str:
+                     seed: int = 42, workers: int = 1,
+                     sizes: Optional[SizeSpec] = None,
+                     resume: bool = False) -> str:
     """Create *count* binary files of *size_kb* KiB under *root*.
 
-    Files are named ``sample_XXXX.bin`` and contain random bytes to
-    prevent filesystem dedup or compression from skewing results.
+    Files are named ``sample_XXXXXX.bin`` and contain random bytes to
+    prevent filesystem dedup or compression from skewing results. Output
+    is identical for a given *seed* regardless of *workers*.
     """
-    random.seed(seed)
-    pathlib.Path(root).mkdir(parents=True, exist_ok=True)
-    chunk = os.urandom(min(size_kb * 1024, 1024 * 1024))  # 1 MiB max chunk
-
-    for i in range(count):
-        path = os.path.join(root, f"sample_{i:06d}.bin")
-        remaining = size_kb * 1024
-        with open(path, "wb") as f:
-            while remaining > 0:
-                to_write = chunk if remaining >= len(chunk) else chunk[:remaining]
-                f.write(to_write)
-                remaining -= len(to_write)
-
-    return os.path.abspath(root)
+    report = generate_samples(root, count, sizes or SizeSpec(size_kb=size_kb),
+                              seed=seed, workers=workers, resume=resume)
+    return report.root
 
 
 def main():
@@ -36,13 +29,29 @@ def main():
                         help="Output directory for generated files")
     parser.add_argument("--count", type=int, default=1000,
                         help="Number of sample files to generate")
-    parser.add_argument("--size-kb", type=int, default=256,
-                        help="Size of each sample file in KiB")
+    parser.add_argument("--size-kb", type=float, default=256,
+                        help="Size of each sample file in KiB (mean for lognormal)")
+    parser.add_argument("--size-dist", type=str, default="fixed",
+                        choices=list(SIZE_DISTRIBUTIONS))
+    parser.add_argument("--size-min-kb", type=float, default=0)
+    parser.add_argument("--size-max-kb", type=float, default=0)
+    parser.add_argument("--size-sigma", type=float, default=0.5)
+    parser.add_argument("--size-csv", type=str, default=None,
+                        help="CSV of sizes in bytes for --size-dist empirical")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Generator processes")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip files that already exist")
     parser.add_argument("--seed", type=int, default=42)
     args = parser.parse_args()
 
-    path = generate_dataset(args.out, args.count, args.size_kb, args.seed)
-    print(f"Generated {args.count} files ({args.size_kb} KiB each) in {path}")
+    sizes = size_spec(args.size_kb, args.size_dist, args.size_min_kb,
+                      args.size_max_kb, args.size_sigma, args.size_csv)
+    path = generate_dataset(args.out, args.count, args.size_kb, args.seed,
+                            workers=args.workers, sizes=sizes,
+                            resume=args.resume)
+    print(f"Generated {args.count} files ({args.size_dist} sizes, "
+          f"{args.size_kb} KiB) in {path}")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,9 @@ import os
 import time
 import random
 import argparse
-from typing import List
-from pathlib import Path
+from typing import List, Tuple
 
+from benchmarks_common.manifest import DiscoveryReport, discover
 from benchmarks_common.metadata import build_metadata
 from benchmarks_common.outputs import write_csv, write_yaml
 from benchmarks_common.stats import percentile, safe_mean
@@ -15,12 +15,10 @@ from .initialization import init_dist
 from .data_generator import generate_dataset
 
 
-def _discover_samples(data_root: str) -> List[str]:
-    """Find all .bin sample files under *data_root*."""
-    root = Path(data_root)
-    if not root.exists():
-        return []
-    return sorted(str(p) for p in root.glob("*.bin"))
+def _discover_samples(data_root: str, use_manifest: bool = True,
+                      manifest_path: str = "") -> Tuple[List[str], DiscoveryReport]:
+    """Find all .bin sample files under *data_root*, timing the enumeration."""
+    return discover(data_root, "*.bin", use_manifest, manifest_path)
 
 
 def _load_sample(path: str, buffer_kb: int = 256) -> float:
@@ -51,6 +49,10 @@ def main():
                         help="Number of samples to auto-generate")
     parser.add_argument("--sample-size-kb", type=int, default=256,
                         help="Size per sample in KiB for auto-generation")
+    parser.add_argument("--manifest", type=str, default="true",
+                        help="Discover samples via a persisted manifest")
+    parser.add_argument("--manifest-path", type=str, default="",
+                        help="Manifest file (default: inside --data-root)")
     parser.add_argument("--read-buffer-kb", type=int, default=256,
                         help="Read buffer size in KiB for data loading")
     parser.add_argument("--compute-ms", type=float, default=10.0,
@@ -62,13 +64,16 @@ def main():
     rank = dist["RANK"]
 
     # Discover or generate sample files
-    samples = _discover_samples(args.data_root)
+    use_manifest = args.manifest.lower() in {"true", "1", "yes"}
+    samples, discovery = _discover_samples(args.data_root, use_manifest,
+                                           args.manifest_path)
     if not samples and args.auto_generate.lower() in {"true", "1", "yes"}:
         print(f"No samples found in {args.data_root}, auto-generating "
               f"{args.sample_count} × {args.sample_size_kb} KiB...")
         generate_dataset(args.data_root, args.sample_count,
                          args.sample_size_kb)
-        samples = _discover_samples(args.data_root)
+        samples, discovery = _discover_samples(args.data_root, use_manifest,
+                                               args.manifest_path)
 
     if not samples:
         raise FileNotFoundError(
@@ -122,6 +127,8 @@ def main():
         "steps": args.steps,
         "microbatches_per_step": microbatches_per_step,
         "samples_available": len(samples),
+        "discovery_sec": round(discovery.duration_sec, 6),
+        "discovery_source": discovery.source,
         "data_root": os.path.abspath(args.data_root),
     }
 
@@ -137,6 +144,7 @@ def main():
             "data_root": args.data_root,
             "read_buffer_kb": args.read_buffer_kb,
             "compute_ms": args.compute_ms,
+            "manifest": use_manifest,
         },
         summary=summary,
     ))
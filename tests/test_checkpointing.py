@@ -60,6 +60,15 @@ class TestCheckpointingSync:
             remaining = [d for d in os.listdir(td) if os.path.isdir(os.path.join(td, d))]
             assert len(remaining) <= 2
 
+    def test_affinity(self):
+        with tempfile.TemporaryDirectory() as td:
+            params = _default_params(root=td, affinity="spread")
+            bench = CheckpointingBenchmark(params)
+            shards, iters = bench.run()
+            assert len(shards) == 8
+            assert bench.affinity.cpus_for(0)
+            assert bench.affinity.describe(2)["mode"] == "spread"
+
     def test_invalid_mode(self):
         import pytest
         with pytest.raises(ValueError, match="Unsupported mode"):
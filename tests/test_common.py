@@ -2,12 +2,24 @@
 
 import os
 import math
+import random
 import tempfile
 
+import pytest
+
+from benchmarks_common.affinity import make_plan, pin_current
 from benchmarks_common.cli import parse_bool, load_yaml_config
+from benchmarks_common.manifest import (MANIFEST_NAME, TREE_MANIFEST_SUFFIX,
+                                        discover, load_manifest,
+                                        load_tree_manifest, refresh_tree)
+from benchmarks_common.datagen import (SizeSpec, generate_samples,
+                                       load_empirical_sizes)
 from benchmarks_common.metadata import RunMetadata, build_metadata
 from benchmarks_common.outputs import write_csv, write_yaml
 from benchmarks_common.stats import percentile, throughput_mb_s, safe_mean, safe_median
+from benchmarks_common.sysinfo import (allowed_cpus, format_cpu_list,
+                                       numa_topology, parse_cpu_list,
+                                       peak_rss_mb)
 
 
 class TestParseBool:
@@ -81,6 +93,7 @@ class TestRunMetadata:
         d = m.to_dict()
         assert d["run_name"] == "r"
         assert d["benchmark"] == "b"
+        assert d["topology"]["cpu_count"] >= 1
 
 
 class TestOutputs:
@@ -108,3 +121,238 @@ class TestOutputs:
             path = os.path.join(td, "test.csv")
             write_csv(path, [["x"]], atomic=False)
             assert os.path.exists(path)
+
+
+def _tree_bytes(root):
+    out = {}
+    for name in sorted(os.listdir(root)):
+        with open(os.path.join(root, name), "rb") as f:
+            out[name] = f.read()
+    return out
+
+
+class TestDatagen:
+    def test_deterministic_across_workers(self):
+        sizes = SizeSpec(kind="uniform", min_kb=1, max_kb=8)
+        with tempfile.TemporaryDirectory() as td:
+            a, b = os.path.join(td, "a"), os.path.join(td, "b")
+            generate_samples(a, 12, sizes, seed=7, workers=1)
+            generate_samples(b, 12, sizes, seed=7, workers=3)
+            assert _tree_bytes(a) == _tree_bytes(b)
+
+    def test_resume_skips_existing(self):
+        with tempfile.TemporaryDirectory() as td:
+            generate_samples(td, 4, SizeSpec(size_kb=1))
+            os.unlink(os.path.join(td, "sample_000002.bin"))
+            report = generate_samples(td, 6, SizeSpec(size_kb=1), resume=True)
+            assert (report.generated, report.skipped) == (3, 3)
+            assert len(os.listdir(td)) == 6
+
+    def test_size_distributions(self):
+        rng = random.Random(0)
+        assert SizeSpec(size_kb=4).draw(rng) == 4096
+        uniform = [SizeSpec(kind="uniform", min_kb=2, max_kb=4).draw(rng)
+                   for _ in range(200)]
+        assert all(2048 <= s <= 4096 for s in uniform)
+        logn = [SizeSpec(kind="lognormal", size_kb=64, sigma=1.0,
+                         min_kb=1, max_kb=512).draw(rng) for _ in range(2000)]
+        assert all(1024 <= s <= 512 * 1024 for s in logn)
+        assert 32 * 1024 < sum(logn) / len(logn) < 96 * 1024
+
+    def test_empirical_csv(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "sizes.csv")
+            with open(path, "w") as f:
+                f.write("name,size_bytes\na,100\nb,300\n")
+            sizes = load_empirical_sizes(path)
+            assert sizes == (100, 300)
+            spec = SizeSpec(kind="empirical", empirical=sizes)
+            root = os.path.join(td, "data")
+            generate_samples(root, 10, spec)
+            assert {os.path.getsize(os.path.join(root, n))
+                    for n in os.listdir(root)} <= {100, 300}
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError):
+            SizeSpec(kind="pareto")
+
+    def test_uniform_needs_max(self):
+        with pytest.raises(ValueError, match="max_kb > 0"):
+            SizeSpec(kind="uniform")
+
+
+def _age_dir(root, seconds=60):
+    st = os.stat(root)
+    os.utime(root, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+
+
+class TestManifest:
+    def _make(self, root, names):
+        os.makedirs(root, exist_ok=True)
+        for n in names:
+            with open(os.path.join(root, n), "wb") as f:
+                f.write(b"x" * 10)
+
+    def test_scan_then_manifest(self):
+        with tempfile.TemporaryDirectory() as td:
+            self._make(td, ["b.bin", "a.bin", "c.txt"])
+            paths, report = discover(td, "*.bin")
+            assert report.source == "scan"
+            assert [os.path.basename(p) for p in paths] == ["a.bin", "b.bin"]
+            _age_dir(td)
+            discover(td, "*.bin")  # racy mtime: relist once, then trusted
+            paths2, report2 = discover(td, "*.bin")
+            assert report2.source == "manifest"
+            assert paths2 == paths
+
+    def test_refresh_on_directory_change(self):
+        with tempfile.TemporaryDirectory() as td:
+            self._make(td, ["a.bin", "b.bin"])
+            _age_dir(td)
+            discover(td, "*.bin")
+            self._make(td, ["c.bin"])
+            os.unlink(os.path.join(td, "a.bin"))
+            paths, report = discover(td, "*.bin")
+            assert report.source == "refresh"
+            assert (report.added, report.removed) == (1, 1)
+            assert [os.path.basename(p) for p in paths] == ["b.bin", "c.bin"]
+
+    def test_torn_manifest_rescans(self):
+        with tempfile.TemporaryDirectory() as td:
+            self._make(td, ["a.bin"])
+            discover(td, "*.bin")
+            path = os.path.join(td, MANIFEST_NAME)
+            with open(path) as f:
+                content = f.read()
+            with open(path, "w") as f:
+                f.write(content.rsplit("# end", 1)[0])
+            assert load_manifest(path) is None
+            assert discover(td, "*.bin")[1].source == "scan"
+
+    def test_generator_leaves_no_manifest(self):
+        with tempfile.TemporaryDirectory() as td:
+            generate_samples(td, 3, SizeSpec(size_kb=1))
+            assert not os.path.exists(os.path.join(td, MANIFEST_NAME))
+            assert discover(td, "*.bin")[1].source == "scan"
+
+
+class TestTreeManifest:
+    def _make_tree(self, root):
+        for rel in ("", "a", "a/b", "c"):
+            d = os.path.join(root, rel)
+            os.makedirs(d, exist_ok=True)
+            for i in range(3):
+                open(os.path.join(d, f"f{i}.dat"), "wb").close()
+        for rel in ("a/b", "a", "c", ""):
+            _age_dir(os.path.join(root, rel))
+
+    def test_scan_then_manifest(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            self._make_tree(root)
+            dirs, report = refresh_tree(root)
+            assert report.source == "scan"
+            assert sorted(dirs) == ["", "a", os.path.join("a", "b"), "c"]
+            assert report.files == 12
+            # The manifest lives beside the tree and leaves the root as is.
+            assert os.listdir(td) == ["tree", "tree" + TREE_MANIFEST_SUFFIX]
+            assert len(os.listdir(root)) == 5
+            dirs2, report2 = refresh_tree(root)
+            assert report2.source == "manifest"
+            assert (report2.rescanned, report2.stat_calls) == (0, 4)
+            assert {k: v.files for k, v in dirs2.items()} == \
+                {k: v.files for k, v in dirs.items()}
+
+    def test_rescans_changed_dirs_only(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            self._make_tree(root)
+            refresh_tree(root)
+            open(os.path.join(root, "a", "b", "new.dat"), "wb").close()
+            os.makedirs(os.path.join(root, "c", "d"))
+            dirs, report = refresh_tree(root)
+            assert report.source == "refresh"
+            assert report.rescanned == 3  # a/b, c and the new c/d
+            assert "new.dat" in dirs[os.path.join("a", "b")].files
+            assert os.path.join("c", "d") in dirs
+
+    def test_torn_manifest(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            self._make_tree(root)
+            refresh_tree(root)
+            path = root + TREE_MANIFEST_SUFFIX
+            with open(path) as f:
+                text = f.read()
+            with open(path, "w") as f:
+                f.write(text[:len(text) // 2])
+            assert load_tree_manifest(path) is None
+            assert refresh_tree(root)[1].source == "scan"
+
+
+def _fake_nodes(root, nodes):
+    for node, cpus in nodes.items():
+        d = os.path.join(root, f"node{node}")
+        os.makedirs(d)
+        with open(os.path.join(d, "cpulist"), "w") as f:
+            f.write(cpus + "\n")
+        with open(os.path.join(d, "meminfo"), "w") as f:
+            f.write(f"Node {node} MemTotal:       2097152 kB\n")
+
+
+class TestPeakRss:
+    def test_grows_with_allocation(self):
+        assert peak_rss_mb() > 0
+        block = bytearray(64 * 1024 * 1024)
+        block[::4096] = b"x" * len(block[::4096])  # touch every page
+        assert peak_rss_mb() >= 64
+        del block
+
+
+class TestAffinity:
+    def test_cpu_list_roundtrip(self):
+        assert parse_cpu_list("0-3,8,10-11") == [0, 1, 2, 3, 8, 10, 11]
+        assert format_cpu_list([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+        assert parse_cpu_list("") == []
+
+    def test_topology(self):
+        with tempfile.TemporaryDirectory() as td:
+            _fake_nodes(td, {0: "0-3", 1: "4-7"})
+            os.makedirs(os.path.join(td, "cpu"))  # not a node
+            topo = numa_topology(td)
+            assert topo["numa_nodes"] == 2
+            assert topo["nodes"][1] == {"cpus": "4-7", "memory_mb": 2048}
+        assert numa_topology("/nonexistent")["numa_nodes"] == 0
+
+    def test_plans(self):
+        cpus = allowed_cpus()
+        with tempfile.TemporaryDirectory() as td:
+            # Two nodes splitting this process's CPUs (both get CPU 0 on 1-CPU hosts).
+            half = max(1, len(cpus) // 2)
+            _fake_nodes(td, {0: format_cpu_list(cpus[:half]),
+                             1: format_cpu_list(cpus[half:] or cpus[:1])})
+            assert make_plan("os", node_root=td).cpus_for(0) is None
+            spread = make_plan("spread", node_root=td)
+            assert [spread.node_for(w) for w in range(4)] == [0, 1, 0, 1]
+            assert spread.cpus_for(0) == set(cpus[:half])
+            node = make_plan("node", numa_node=1, node_root=td)
+            assert node.node_for(3) == 1
+            pinned = make_plan("cpus", cpu_list=format_cpu_list(cpus),
+                               node_root=td)
+            assert pinned.cpus_for(len(cpus)) == {cpus[0]}
+            assert pinned.describe(2)["workers"][0]["node"] == 0
+            with pytest.raises(ValueError):
+                make_plan("node", numa_node=7, node_root=td)
+        with pytest.raises(ValueError):
+            make_plan("cpus", cpu_list="100000")
+        with pytest.raises(ValueError):
+            make_plan("interleave")
+
+    def test_pin_current(self):
+        before = os.sched_getaffinity(0)
+        try:
+            assert pin_current({allowed_cpus()[0]})
+            assert os.sched_getaffinity(0) == {allowed_cpus()[0]}
+        finally:
+            os.sched_setaffinity(0, before)
+        assert not pin_current(None)
@@ -1,11 +1,37 @@
 """Unit tests for the dataloader benchmark."""
 
 import os
+import random
 import tempfile
+import threading
+import time
+import zlib
 
-from dataloader_benchmarks.src.dataset_gen import generate_dataset
+from benchmarks_common.compression import available_codecs, get_codec
+from dataloader_benchmarks.src.dataset_gen import generate_dataset, make_payload
 from dataloader_benchmarks.src.loader import (
-    LoaderParams, discover_samples, run_loader,
+    LoaderParams, LoaderState, SampleIterator, discover_samples,
+    discover_samples_report, pack_samples, run_loader, strategy_function,
+)
+from dataloader_benchmarks.src.autotune import (
+    AutotuneStep, Autotuner, _ElasticQueue, converged_settings, run_autotune,
+)
+from dataloader_benchmarks.src.cache import (
+    DiskCache, MemoryLRU, cache_epoch_stats,
+)
+from dataloader_benchmarks.src.distributed import (
+    DistributedSampler, rank_summary, run_distributed,
+)
+from dataloader_benchmarks.src.pipeline import bottleneck, run_pipeline
+from dataloader_benchmarks.src.consumer import (
+    TrainingConsumer, consumer_summary,
+)
+from dataloader_benchmarks.src.tokens import (
+    generate_token_file, load_index, pack_sequences, run_tokens,
+)
+from dataloader_benchmarks.src.resume import resume_summary, run_resume
+from dataloader_benchmarks.src.random_range import (
+    RecordIndex, range_summary, run_random_range,
 )
 
 
@@ -32,6 +58,32 @@ class TestDatasetGen:
             files = os.listdir(root)
             assert all(f.endswith(".bin.gz") for f in files)
 
+    def test_codec_extension(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=2, size_kb=1, compress=True,
+                             codec="lzma")
+            assert all(f.endswith(".bin.xz") for f in os.listdir(root))
+
+    def test_entropy_controls_ratio(self):
+        low = make_payload(64 * 1024, 0.1, random.Random(0))
+        high = make_payload(64 * 1024, 1.0, random.Random(0))
+        assert len(low) == len(high) == 64 * 1024
+        assert len(zlib.compress(low)) < len(zlib.compress(high)) / 4
+
+
+class TestCodecs:
+    def test_roundtrip(self):
+        data = make_payload(8192, 0.5, random.Random(1))
+        for name in available_codecs():
+            codec = get_codec(name)
+            assert codec.decompress(codec.compress(data)) == data
+
+    def test_unknown(self):
+        import pytest
+        with pytest.raises(ValueError, match="Unknown codec"):
+            get_codec("bogus")
+
 
 class TestDiscoverSamples:
     def test_finds_bin_files(self):
@@ -44,6 +96,15 @@ class TestDiscoverSamples:
         with tempfile.TemporaryDirectory() as td:
             assert discover_samples(td) == []
 
+    def test_manifest_matches_glob(self):
+        with tempfile.TemporaryDirectory() as td:
+            generate_dataset(td, count=4, size_kb=1, compress=True)
+            via_manifest, report = discover_samples_report(td, compressed=True)
+            via_glob, _ = discover_samples_report(td, compressed=True,
+                                                  use_manifest=False)
+            assert via_manifest == via_glob and len(via_glob) == 4
+            assert report.source == "scan"
+
 
 class TestRunLoader:
     def _make_data(self, td, count=20, size_kb=1):
@@ -75,6 +136,38 @@ class TestRunLoader:
             samples, epochs = run_loader(params)
             assert len(samples) == 20
 
+    def test_mmap_modes(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = self._make_data(td, count=6, size_kb=16)
+            for touch, advice, packed in [("checksum", "sequential", False),
+                                          ("page", "willneed", True),
+                                          ("checksum", "hugepage", True)]:
+                params = LoaderParams(data_root=root, strategy="mmap",
+                                      epochs=2, mmap_touch=touch,
+                                      mmap_advice=advice, mmap_packed=packed)
+                samples, epochs = run_loader(params)
+                assert len(samples) == 12
+                assert all(r.bytes_read == 16 * 1024 for r in samples)
+                assert all(e.minor_faults >= 0 for e in epochs)
+                assert all(isinstance(e.madvise_applied, bool) for e in epochs)
+            # The packed file lives outside the dataset.
+            assert len(os.listdir(root)) == 6 + 1  # samples + manifest
+            (packed,) = os.listdir(root + ".work")
+            assert packed.startswith(f"packed-6-{6 * 16 * 1024}-")
+            # Another sample list of the same count and size gets its own file.
+            samples = discover_samples(root)
+            pack_samples(samples[::-1], LoaderParams(data_root=root))
+            assert len(os.listdir(root + ".work")) == 2
+
+    def test_mmap_unknown_advice(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            root = self._make_data(td, count=2)
+            params = LoaderParams(data_root=root, strategy="mmap", epochs=1,
+                                  mmap_advice="dontneed")
+            with pytest.raises(ValueError, match="madvise"):
+                run_loader(params)
+
     def test_prefetch(self):
         with tempfile.TemporaryDirectory() as td:
             root = self._make_data(td)
@@ -92,6 +185,45 @@ class TestRunLoader:
             assert len(epochs) == 3
             assert len(samples) == 15  # 5 samples × 3 epochs
 
+    def test_compressed_split_timing(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=4, size_kb=8, compress=True,
+                             codec="bz2", entropy=0.5)
+            params = LoaderParams(data_root=root, strategy="sequential",
+                                  epochs=1, compressed=True, codec="bz2")
+            samples, _ = run_loader(params)
+            assert len(samples) == 4
+            for r in samples:
+                assert r.bytes_read == 8 * 1024
+                assert r.decode_sec > 0
+                assert abs(r.duration_sec - (r.io_sec + r.decode_sec)) < 1e-9
+
+    def test_decode_pool(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=6, size_kb=4, compress=True,
+                             entropy=0.3)
+            params = LoaderParams(data_root=root, strategy="decode_pool",
+                                  epochs=1, compressed=True,
+                                  prefetch_depth=2, decode_workers=1)
+            samples, epochs = run_loader(params)
+            assert len(samples) == 6
+            assert epochs[0].strategy == "decode_pool"
+            assert all(r.bytes_read == 4 * 1024 for r in samples)
+            assert epochs[0].ttfb_sec > 0
+
+    def test_decode_pool_read_errors(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            # More failing reads than in-flight permits must still raise.
+            missing = [os.path.join(td, f"gone_{i}.bin.gz") for i in range(12)]
+            params = LoaderParams(data_root=td, strategy="decode_pool",
+                                  epochs=1, compressed=True,
+                                  prefetch_depth=2, decode_workers=1)
+            with pytest.raises(FileNotFoundError):
+                strategy_function("decode_pool")(missing, 1, params)
+
     def test_invalid_strategy(self):
         import pytest
         with tempfile.TemporaryDirectory() as td:
@@ -99,3 +231,493 @@ class TestRunLoader:
             params = LoaderParams(data_root=root, strategy="bogus", epochs=1)
             with pytest.raises(ValueError, match="Unknown strategy"):
                 run_loader(params)
+
+
+class TestPipeline:
+    def test_stages_and_bottleneck(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=10, size_kb=4, compress=True,
+                             entropy=0.5)
+            params = LoaderParams(data_root=root, strategy="pipeline",
+                                  epochs=2, batch_size=3, compressed=True,
+                                  prefetch_depth=2, decode_workers=1,
+                                  transform_cost=2, queue_depth=2)
+            samples, epochs, stages = run_pipeline(params)
+            assert len(samples) == 20
+            assert sorted(r.sample_idx for r in samples[:10]) == list(range(10))
+            assert all(r.bytes_read == 4 * 1024 for r in samples)
+            assert len(stages) == 8  # 4 stages × 2 epochs
+            assert {s.stage for s in stages} == {
+                "read", "decode", "transform", "collate"}
+            for s in stages:
+                assert s.items == 10
+                assert s.busy_sec >= 0 and s.idle_sec >= 0
+            report = bottleneck(stages)
+            assert report["bottleneck_stage"] in report["stages"]
+            assert report["bound"] in {"storage", "cpu"}
+
+    def test_uncompressed(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=5, size_kb=1)
+            params = LoaderParams(data_root=root, epochs=1, batch_size=2)
+            samples, epochs, _ = run_pipeline(params)
+            assert len(samples) == 5
+            assert epochs[0].strategy == "pipeline"
+            assert epochs[0].ttfb_sec > 0
+
+    def test_stage_error_is_raised(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=8, size_kb=4, compress=True,
+                             codec="zlib")
+            corrupt = sorted(discover_samples(root, True, "zlib"))[3]
+            with open(corrupt, "wb") as f:
+                f.write(b"not deflate")
+            params = LoaderParams(data_root=root, epochs=1, batch_size=2,
+                                  compressed=True, codec="zlib",
+                                  prefetch_depth=2, decode_workers=2,
+                                  queue_depth=1)
+            with pytest.raises(zlib.error):
+                run_pipeline(params)
+
+
+class TestAutotune:
+    def test_tuner_grows_keeps_and_reverts(self):
+        params = LoaderParams(data_root="", autotune_max_workers=8)
+        tuner = Autotuner(params, sample_bytes=1024)
+        assert tuner.observe(100.0, 0.9) == "grow workers"
+        assert tuner.settings["workers"] == 2
+        # 20% better → keep, then try the next knob
+        assert tuner.observe(120.0, 0.9) == "keep workers; grow queue_depth"
+        assert tuner.settings["queue_depth"] == 4
+        # no gain → revert and saturate that knob
+        assert tuner.observe(119.0, 0.9) == "revert queue_depth"
+        assert tuner.settings["queue_depth"] == 2
+        assert "queue_depth" in tuner.saturated
+        # low stall → converged
+        assert tuner.observe(130.0, 0.01) == "converged"
+        assert tuner.converged
+
+    def test_memory_budget_caps_growth(self):
+        params = LoaderParams(data_root="", autotune_memory_mb=1)
+        tuner = Autotuner(params, sample_bytes=256 * 1024)
+        actions = [tuner.observe(1.0, 1.0) for _ in range(10)]
+        assert tuner.memory_bytes(tuner.settings) <= 1024 * 1024
+        assert actions[-1] == "converged"
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=12, size_kb=4)
+            params = LoaderParams(data_root=root, strategy="autotune",
+                                  epochs=2, autotune_window=4,
+                                  autotune_max_workers=4)
+            samples, epochs, steps, settings = run_autotune(params)
+            assert len(samples) == 24
+            assert [e.epoch for e in epochs] == [1, 2]
+            assert all(e.samples == 12 for e in epochs)
+            assert len(steps) == 6
+            final = converged_settings(steps, settings)
+            assert final["windows"] == 6
+            assert 1 <= final["workers"] <= 4
+            assert final["workers"] == settings["workers"]
+
+    def test_converged_on_a_keep_window(self):
+        params = LoaderParams(data_root="", autotune_max_workers=8)
+        tuner = Autotuner(params, sample_bytes=1024)
+        steps = []
+        for window, (tp, stall) in enumerate([(100.0, 0.9), (120.0, 0.01)], 1):
+            action = tuner.observe(tp, stall)
+            steps.append(AutotuneStep(
+                window=window, epoch=1, samples_done=window,
+                throughput_mb_s=tp, stall_fraction=stall, action=action,
+                converged=tuner.converged, **tuner.settings))
+        assert steps[-1].action == "keep workers"
+        final = converged_settings(steps, tuner.settings)
+        assert final["converged"] and final["converged_at_window"] == 2
+        assert final["workers"] == 2
+
+    def test_close_wakes_blocked_producer(self):
+        buf = _ElasticQueue(1)
+        assert buf.put(1)
+        results = []
+        t = threading.Thread(target=lambda: results.append(buf.put(2)))
+        t.start()
+        buf.close()
+        t.join(timeout=5.0)
+        assert results == [False]
+
+    def test_codec_error_is_raised(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=6, size_kb=4, compress=True,
+                             codec="zlib")
+            with open(sorted(discover_samples(root, True, "zlib"))[2], "wb") as f:
+                f.write(b"not deflate")
+            params = LoaderParams(data_root=root, strategy="autotune",
+                                  epochs=1, compressed=True, codec="zlib",
+                                  autotune_max_workers=2)
+            with pytest.raises(zlib.error):
+                run_autotune(params)
+
+
+class TestCache:
+    def test_memory_lru_evicts_oldest(self):
+        lru = MemoryLRU(budget_bytes=30)
+        lru.put("a", b"x" * 10)
+        lru.put("b", b"x" * 10)
+        lru.put("c", b"x" * 10)
+        assert lru.get("a") is not None  # a is now most recent
+        lru.put("d", b"x" * 10)
+        assert lru.get("b") is None
+        assert lru.evictions == 1
+        lru.put("huge", b"x" * 100)  # larger than budget: not cached
+        assert lru.get("huge") is None
+
+    def _disk(self, td, policy):
+        disk = DiskCache(os.path.join(td, policy), budget_bytes=30,
+                         policy=policy)
+        for key in ("a", "b", "c"):
+            disk.put(key, key.encode() * 10)
+        assert disk.get("a", 64) == b"a" * 10
+        assert disk.get("a", 64) is not None
+        assert disk.get("b", 64) is not None
+        disk.put("d", b"d" * 10)
+        return disk
+
+    def test_disk_policies(self):
+        with tempfile.TemporaryDirectory() as td:
+            lru = self._disk(td, "lru")
+            assert lru.get("c", 64) is None  # least recently used
+            fifo = self._disk(td, "fifo")
+            assert fifo.get("a", 64) is None  # first in
+            lfu = self._disk(td, "lfu")
+            assert lfu.get("c", 64) is None  # never hit
+            assert lfu.get("a", 64) is not None
+            assert len([f for f in os.listdir(os.path.join(td, "lfu"))
+                        if f.endswith(".cache")]) == 3
+
+    def test_lfu_heap_stays_bounded(self):
+        with tempfile.TemporaryDirectory() as td:
+            lfu = self._disk(td, "lfu")
+            for _ in range(500):
+                assert lfu.get("a", 64) is not None
+            assert len(lfu._heap) <= 2 * 3 + 16
+            lfu.put("e", b"e" * 10)
+            assert lfu.get("a", 64) is not None  # most hits survive
+            assert lfu.get("d", 64) is None
+
+    def test_invalid_policy(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            with pytest.raises(ValueError, match="Unknown cache policy"):
+                DiskCache(td, 10, policy="mru")
+
+    def test_run_loader_hits_after_first_epoch(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=6, size_kb=4)
+            params = LoaderParams(data_root=root, strategy="prefetch",
+                                  epochs=3, cache_memory_mb=0.01,
+                                  cache_dir=os.path.join(td, "cache"),
+                                  cache_disk_mb=1)
+            samples, _ = run_loader(params)
+            rows = cache_epoch_stats(samples)
+            assert [r["hit_rate"] for r in rows] == [0.0, 1.0, 1.0]
+            assert rows[0]["storage_bytes"] == 6 * 4096
+            assert rows[1]["memory_samples"] + rows[1]["disk_samples"] == 6
+
+
+class TestDistributed:
+    def test_sampler_partitions(self):
+        shards = []
+        for rank in range(3):
+            sampler = DistributedSampler(10, 3, rank, seed=7)
+            sampler.set_epoch(1)
+            shards.append(sampler.indices())
+        assert all(len(s) == 4 for s in shards)  # padded to 12
+        assert set().union(*shards) == set(range(10))
+        again = DistributedSampler(10, 3, 0, seed=7)
+        again.set_epoch(1)
+        assert again.indices() == shards[0]
+        again.set_epoch(2)
+        assert again.indices() != shards[0]
+
+    def test_sampler_drop_last(self):
+        shards = [DistributedSampler(10, 3, r, drop_last=True).indices()
+                  for r in range(3)]
+        assert [len(s) for s in shards] == [3, 3, 3]
+        assert len(set().union(*shards)) == 9
+
+    def test_run_distributed(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=8, size_kb=1)
+            params = LoaderParams(data_root=root, strategy="sequential",
+                                  epochs=2)
+            samples, epochs, ranks = run_distributed(params, world_size=2)
+            assert len(samples) == 16
+            assert {r.rank for r in samples} == {0, 1}
+            assert len(ranks) == 4
+            assert [e.samples for e in epochs] == [8, 8]
+            summary = rank_summary(ranks, epochs)
+            assert summary["world_size"] == 2
+            assert summary["max_skew"] >= 1.0
+            assert summary["max_straggler_sec"] >= 0.0
+
+    def test_distributed_packed_mmap(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=8, size_kb=4)
+            params = LoaderParams(data_root=root, strategy="mmap", epochs=2,
+                                  mmap_packed=True)
+            samples, epochs, _ = run_distributed(params, world_size=4)
+            assert len(samples) == 16
+            assert all(r.bytes_read == 4 * 1024 for r in samples)
+            assert len(os.listdir(root + ".work")) == 1  # packed once
+
+    def test_rejects_non_epoch_strategies(self):
+        import pytest
+        params = LoaderParams(data_root="/nonexistent", strategy="pipeline")
+        with pytest.raises(ValueError, match="does not support world_size"):
+            run_distributed(params, world_size=2)
+
+
+class TestAffinity:
+    def test_pinned_workers(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=8, size_kb=4)
+            before = os.sched_getaffinity(0)
+            params = LoaderParams(data_root=root, strategy="prefetch",
+                                  epochs=1, affinity="spread")
+            samples, _ = run_loader(params)
+            assert len(samples) == 8
+            # Worker threads are pinned; the calling thread is not.
+            assert os.sched_getaffinity(0) == before
+
+    def test_rank_nodes(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=8, size_kb=4)
+            params = LoaderParams(data_root=root, strategy="sequential",
+                                  epochs=1, affinity="node", numa_node=0)
+            _, epochs, ranks = run_distributed(params, 2)
+            assert {r.node for r in ranks} == {0}
+            summary = rank_summary(ranks, epochs)
+            assert list(summary["throughput_by_node_mb_s"]) == [0]
+
+
+class TestRandomRange:
+    def test_fixed_index(self):
+        index = RecordIndex([10 * 4096, 3 * 4096 + 100], 4096)
+        assert index.records == 13
+        assert index.locate(0) == (0, 0, 4096)
+        assert index.locate(11) == (1, 4096, 4096)
+
+    def test_variable_index_within_files(self):
+        sizes = [64 * 1024, 32 * 1024]
+        index = RecordIndex(sizes, 4096, layout="variable", seed=1)
+        lengths = set()
+        for r in range(index.records):
+            f, offset, length = index.locate(r)
+            assert offset + length <= sizes[f]
+            assert 2048 <= length <= 6144
+            lengths.add(length)
+        assert len(lengths) > 1
+
+    def test_run(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=2, size_kb=256)
+            params = LoaderParams(data_root=root, strategy="random_range",
+                                  epochs=2, record_sizes_kb=(4, 64),
+                                  range_reads=50, queue_depth=4)
+            records, epochs, stats = run_random_range(params)
+            assert len(records) == 2 * 2 * 50
+            assert [e.samples for e in epochs] == [100, 100]
+            assert {s.record_size_kb for s in stats} == {4, 64}
+            assert all(r.bytes_read in (4096, 65536) for r in records)
+            # TTFB is the earliest completion, within the epoch.
+            assert all(0 < e.ttfb_sec <= e.duration_sec for e in epochs)
+            summary = range_summary(stats, records)
+            assert summary[4]["reads"] == 100
+            assert summary[64]["iops"] > 0
+
+    def test_record_larger_than_files(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=1, size_kb=8)
+            params = LoaderParams(data_root=root, record_sizes_kb=(64,))
+            with pytest.raises(ValueError):
+                run_random_range(params)
+            params = LoaderParams(data_root=root, epochs=1, range_reads=10,
+                                  record_sizes_kb=(4, 64))
+            with pytest.warns(UserWarning, match="Skipping record size 64"):
+                _, _, stats = run_random_range(params)
+            assert [s.record_size_kb for s in stats] == [4]
+
+
+class TestTokens:
+    def test_pack_spans_documents(self):
+        from array import array
+        bounds = array("Q", [0, 3, 4, 10, 12])
+        order = [2, 0, 3, 1]
+        stream = [t for d in order for t in range(bounds[d], bounds[d + 1])]
+        seqs = list(pack_sequences(bounds, order, seq_len=4))
+        assert len(seqs) == (len(stream) - 1) // 4
+        for k, pieces in enumerate(seqs):
+            tokens = [t for off, n in pieces for t in range(off, off + n)]
+            assert tokens == stream[k * 4:k * 4 + 5]
+
+    def test_generate_index(self):
+        with tempfile.TemporaryDirectory() as td:
+            generate_token_file(td, 5000, dtype="uint32", mean_doc_tokens=100)
+            itemsize, bounds = load_index(td)
+            assert itemsize == 4
+            assert bounds[0] == 0 and bounds[-1] == 5000
+            assert os.path.getsize(os.path.join(td, "tokens.tok")) == 20000
+
+    def test_readers_agree(self):
+        with tempfile.TemporaryDirectory() as td:
+            generate_token_file(td, 20000, mean_doc_tokens=300)
+            results = {}
+            for reader in ("mmap", "pread"):
+                params = LoaderParams(data_root=td, strategy="tokens",
+                                      token_reader=reader, seq_len=128,
+                                      epochs=2, batch_size=4)
+                records, epochs, stats = run_tokens(params)
+                results[reader] = [e.samples for e in epochs]
+                assert stats[0].tokens == stats[0].sequences * 128
+                assert stats[0].major_faults >= 0
+            assert results["mmap"] == results["pread"] == [156, 156]
+
+
+class TestConsumer:
+    def test_steps_and_stall(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=10, size_kb=4)
+            params = LoaderParams(data_root=root, strategy="sequential",
+                                  epochs=2, batch_size=4, compute_ms=2.0)
+            consumer = TrainingConsumer(params)
+            samples, epochs = run_loader(params, consumer=consumer)
+            steps = consumer.finish()
+            # 10 samples per epoch in batches of 4 → 3 steps per epoch
+            assert [s.samples for s in steps] == [4, 4, 2] * 2
+            assert all(s.compute_sec == 0.002 for s in steps)
+            summary = consumer_summary(steps, params)
+            assert 0.0 <= summary["data_stall_pct"] <= 100.0
+            assert summary["steady_state_step_sec"] >= 0.002
+            expected = (sum(s.batch_bytes for s in steps) / 6) / 0.002 / 2**20
+            assert abs(summary["zero_stall_throughput_mb_s"] - expected) < 1.0
+
+    def test_compute_distributions(self):
+        for dist in ("normal", "lognormal"):
+            params = LoaderParams(data_root=".", compute_ms=10.0,
+                                  compute_dist=dist, compute_jitter=0.5)
+            consumer = TrainingConsumer(params)
+            draws = [consumer.compute_time() for _ in range(2000)]
+            consumer.finish()
+            assert all(d >= 0 for d in draws)
+            assert 0.008 < sum(draws) / len(draws) < 0.012
+            assert len(set(draws)) > 100
+
+    def test_unknown_distribution(self):
+        import pytest
+        with pytest.raises(ValueError):
+            TrainingConsumer(LoaderParams(data_root=".", compute_dist="pareto"))
+
+    def test_blocked_sink_stops_prefetch(self, monkeypatch):
+        import dataloader_benchmarks.src.loader as loader
+        reads = []
+        real_read = loader._read_cached
+
+        def counting_read(*args):
+            reads.append(args[0])
+            return real_read(*args)
+
+        monkeypatch.setattr(loader, "_read_cached", counting_read)
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=40, size_kb=1)
+            params = LoaderParams(data_root=root, strategy="prefetch",
+                                  prefetch_depth=2)
+            seen = []
+
+            def slow_sink(record):
+                if not seen:
+                    time.sleep(0.2)
+                    seen.append(len(reads))
+                seen.append(record)
+
+            records, _ = strategy_function("prefetch")(
+                discover_samples(root), 1, params, sink=slow_sink)
+            # While the first sample sat in the sink, at most
+            # 2 * prefetch_depth reads had been submitted.
+            assert seen[0] <= 4
+            assert len(records) == len(seen) - 1 == 40
+
+
+class TestResume:
+    def test_state_roundtrip_continues_order(self):
+        for order in ("sequential", "random", "buffer"):
+            full = SampleIterator(50, order, seed=7, buffer_size=8)
+            full.start_epoch(2)
+            expected = list(full)
+            assert sorted(expected) == list(range(50))
+
+            it = SampleIterator(50, order, seed=7, buffer_size=8)
+            it.start_epoch(2)
+            head = [next(it) for _ in range(17)]
+            state = LoaderState.from_json(it.state().to_json())
+            resumed = SampleIterator.from_state(state)
+            assert head + list(resumed) == expected
+
+    def test_random_order_matches_strategy(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=12, size_kb=1)
+            params = LoaderParams(data_root=root, strategy="random",
+                                  epochs=1, shuffle_seed=3)
+            samples = discover_samples(root)
+            records, _ = run_loader(params)
+            it = SampleIterator(len(samples), "random", seed=3)
+            it.start_epoch(1)
+            assert [r.path for r in records] == [samples[i] for i in it]
+
+    def test_skip_vs_replay(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "data")
+            generate_dataset(root, count=20, size_kb=4)
+            params = LoaderParams(data_root=root, strategy="resume", epochs=2,
+                                  batch_size=4, resume_order="buffer",
+                                  shuffle_buffer=6, resume_trials=2,
+                                  state_path=os.path.join(td, "run", "s.json"))
+            discover_samples(root)  # writes the discovery manifest
+            before = (sorted(os.listdir(root)), os.stat(root).st_mtime_ns)
+            records, epochs, results = run_resume(params)
+            assert len(results) == 4 and len(epochs) == 4
+            assert all(r.consistent for r in results)
+            for r in results:
+                if r.mode == "skip":
+                    assert r.bytes_reread == 0
+                else:
+                    assert r.samples_reread == r.position
+                    assert r.bytes_reread == r.position * 4 * 1024
+            summary = resume_summary(results, params)
+            assert summary["skip"]["total_bytes_reread"] == 0
+            assert summary["state_bytes"] > 0
+            # State never lands in (or bumps the mtime of) the dataset.
+            assert (sorted(os.listdir(root)), os.stat(root).st_mtime_ns) == before
+            assert os.listdir(os.path.join(td, "run")) == []
+
+    def test_unknown_order(self):
+        import pytest
+        with pytest.raises(ValueError):
+            SampleIterator(10, "zigzag")
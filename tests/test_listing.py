@@ -4,7 +4,36 @@ import os
 import tempfile
 
 from listing_folder_benchmarks.src.synthetic_tree import make_tree
-from listing_folder_benchmarks.src.fs_lister import list_tree, _scandir_walk
+from listing_folder_benchmarks.src.manifest_cache import manifest_dirs, run_churn
+from listing_folder_benchmarks.src.mutation_storm import (
+    STORM_OPS, run_storm, storm_scaling, storm_summary,
+)
+from listing_folder_benchmarks.src.object_store import (
+    STRATEGIES, ObjectNamespace, keys_from_spec, keys_from_tree, run_strategy,
+)
+from listing_folder_benchmarks.src.shard_plan import (
+    PLANNERS, imbalance, plan_benchmark, plan_shards, synthetic_input,
+)
+from listing_folder_benchmarks.src.path_table import (
+    PathTable, RecordTable, memory_compare,
+)
+from listing_folder_benchmarks.src.probes import (
+    OpLatencies, parse_op_mix, pick_op,
+)
+from listing_folder_benchmarks.src.tree_builder import (
+    TreeSpec, build_finished, build_tree, file_name, journal_path_for,
+    plan_tree, _build_task, _tasks,
+)
+from listing_folder_benchmarks.src.stat_cache import (
+    StatCache, pass_summary, run_passes,
+)
+from listing_folder_benchmarks.src.timeline import (
+    concurrency_sweep, littles_law, spans, timeline,
+)
+from listing_folder_benchmarks.src.fs_lister import (
+    EXECUTORS, ParallelWalker, executor_parallelism, executor_scaling,
+    iter_pages, list_tree, walk_scaling, _scandir_walk,
+)
 
 
 class TestSyntheticTree:
@@ -60,6 +89,16 @@ class TestListTree:
                                 use_scandir=True)
             assert len(records) > 0
 
+    def test_parallel_walk_mode(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = self._make_small_tree(td)
+            serial = list_tree(root, page_size=10, concurrency=2,
+                               use_scandir=True)
+            parallel = list_tree(root, page_size=10, concurrency=2,
+                                 parallel_walk=True)
+            assert sum(int(r[2]) for r in parallel) == \
+                sum(int(r[2]) for r in serial)
+
 
 class TestScandirWalk:
     def test_finds_files(self):
@@ -69,3 +108,539 @@ class TestScandirWalk:
             results = _scandir_walk(root)
             total_files = sum(len(entries) for _, entries in results)
             assert total_files >= 5
+
+
+class TestIterPages:
+    def test_pages_cover_tree(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=3)
+            expected = sorted(f for _, files in _scandir_walk(root)
+                              for f in files)
+            pages = list(iter_pages(root, page_size=7, use_stat=True))
+            assert [p.index for p in pages] == list(range(len(pages)))
+            assert all(len(p.entries) == 7 for p in pages[:-1])
+            assert 0 < len(pages[-1].entries) <= 7
+            assert sorted(e for p in pages for e in p.entries) == expected
+            for a, b in zip(pages, pages[1:]):
+                assert a.started_sec <= a.delivered_sec <= b.delivered_sec
+
+    def test_early_stop(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=3)
+            pages = iter_pages(root, page_size=5)
+            first = next(pages)
+            pages.close()  # closes every open scandir iterator
+            assert len(first.entries) == 5
+
+
+class TestParallelWalker:
+    def test_matches_serial_walk(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=3)
+            expected = sorted((d, sorted(f)) for d, f in _scandir_walk(root))
+            for workers in (1, 4):
+                walker = ParallelWalker(root, workers)
+                got = sorted((d, sorted(f)) for d, f in walker)
+                assert got == expected
+                assert walker.stats.dirs == len(expected)
+                assert walker.stats.entries == sum(len(f) for _, f in expected)
+                assert walker.stats.first_entry_sec <= walker.stats.duration_sec
+
+    def test_early_stop(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=3)
+            walker = ParallelWalker(root, 4)
+            for i, _ in enumerate(walker):
+                if i == 1:
+                    break
+            assert walker.stats.dirs == 2
+
+    def test_scan_errors(self, monkeypatch):
+        import pytest
+        import listing_folder_benchmarks.src.fs_lister as fs_lister
+        with tempfile.TemporaryDirectory() as td:
+            # A "directory" that is really a file raises NotADirectoryError.
+            path = os.path.join(td, "file")
+            open(path, "w").close()
+            assert list(ParallelWalker(path, 2)) == [(path, [])]
+
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            bad = sorted(d for d, _ in _scandir_walk(root))[1]
+            real_scan = fs_lister._scan_dir
+
+            def failing_scan(p):
+                if p == bad:
+                    raise RuntimeError("scan failed")
+                return real_scan(p)
+
+            # Anything but an unreadable directory stops the walk and is
+            # raised, instead of ending with directories missing.
+            monkeypatch.setattr(fs_lister, "_scan_dir", failing_scan)
+            for workers in (1, 2):
+                walker = ParallelWalker(root, workers)
+                with pytest.raises(RuntimeError, match="scan failed"):
+                    list(walker)
+                assert walker.stats is not None
+
+    def test_scaling_rows(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            stats = walk_scaling(root, [1, 2])
+            assert [s.workers for s in stats] == [1, 2]
+            assert stats[0].entries == stats[1].entries
+
+
+class TestManifestCache:
+    def test_list_tree_from_manifest(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=2)
+            dirs, report = manifest_dirs(root)
+            assert report.source == "scan"
+            records = list_tree(root, page_size=10, concurrency=2, dirs=dirs)
+            assert sum(int(r[2]) for r in records) == report.files
+
+    def test_churn(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=3)
+            before = sorted(os.listdir(root))
+            results = run_churn(root, [10, 50], racy_ns=0)
+            assert [r.churn_pct for r in results] == [10, 50]
+            for r in results:
+                assert r.consistent
+                assert r.rescanned_dirs == r.changed_dirs
+                assert r.stat_calls == r.dirs
+            assert sorted(os.listdir(root)) == before
+            assert os.listdir(td) == ["tree"]  # churn manifest removed
+
+
+class TestStatCache:
+    def test_ttl_expiry(self):
+        now = [0.0]
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "f")
+            open(path, "w").close()
+            cache = StatCache(5.0, clock=lambda: now[0])
+            cache.stat(path)
+            cache.stat(path)
+            now[0] = 6.0
+            cache.stat(path)
+            assert cache.counters() == (1, 0, 2)
+
+    def test_negative_entries(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "missing")
+            cache = StatCache(5.0, negative_ttl_sec=5.0)
+            for _ in range(2):
+                with pytest.raises(FileNotFoundError):
+                    cache.stat(path)
+            open(path, "w").close()
+            with pytest.raises(FileNotFoundError):
+                cache.stat(path)  # still cached as missing
+            assert cache.counters() == (0, 2, 1)
+
+    def test_warm_passes_hit(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=2)
+            stats = run_passes(root, page_size=10, concurrency=2, passes=3,
+                               cache=StatCache(60.0), negative_ratio=0.5)
+            assert stats[0].hits == 0 and stats[0].misses > 0
+            assert stats[1].misses == 0 and stats[1].negative_hits > 0
+            assert stats[1].entries == stats[0].entries
+            summary = pass_summary(stats)
+            assert summary["passes"] == 3
+            assert summary["steady_hit_rate"] == 1.0
+
+    def test_uncached_passes(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            stats = run_passes(root, page_size=10, concurrency=2, passes=2)
+            assert [s.ttl_sec for s in stats] == [-1, -1]
+            assert stats[1].hit_rate == 0.0
+
+
+class TestOpMix:
+    def test_parse(self):
+        import pytest
+        assert parse_op_mix("") == []
+        assert parse_op_mix("stat") == [("stat", 1.0)]
+        mix = dict(parse_op_mix("stat:3,open:1"))
+        assert mix == {"stat": 0.75, "open": 0.25}
+        with pytest.raises(ValueError, match="Unknown probe"):
+            parse_op_mix("chmod:1")
+
+    def test_pick_is_weighted_and_stable(self):
+        mix = parse_op_mix("stat:0.8,open:0.2")
+        names = [f"f{i}.bin" for i in range(2000)]
+        ops = [pick_op(mix, n) for n in names]
+        assert ops == [pick_op(mix, n) for n in names]
+        assert 0.7 < ops.count("stat") / len(ops) < 0.9
+
+    def test_list_tree_op_latencies(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=30, depth=2)
+            lat = OpLatencies()
+            records = list_tree(root, page_size=10, concurrency=2,
+                                use_scandir=True,
+                                op_mix=parse_op_mix("dirent_stat:1,open:1,access:1"),
+                                op_latencies=lat)
+            summary = lat.summary()
+            assert set(summary) == {"dirent_stat", "open", "access"}
+            assert sum(r["count"] for r in summary.values()) == \
+                sum(int(r[2]) for r in records)
+            assert all(r["errors"] == 0 for r in summary.values())
+
+    def test_scandir_stat_reuses_entries(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            dirs = _scandir_walk(root, keep_entries=True)
+            assert all(isinstance(e, os.DirEntry) for _, es in dirs for e in es)
+            records = list_tree(root, page_size=5, concurrency=2,
+                                use_stat=True, use_scandir=True)
+            assert sum(int(r[2]) for r in records) == \
+                sum(len(es) for _, es in dirs)
+
+
+class TestMutationStorm:
+    def test_phases_and_cleanup(self):
+        with tempfile.TemporaryDirectory() as td:
+            storm_dir = os.path.join(td, "storm")
+            results = run_storm(storm_dir, threads=3, fanout=4, files_per_dir=5)
+            assert [r.op for r in results] == list(STORM_OPS)
+            for r in results:
+                assert r.ops == 20
+                assert r.errors == 0
+                assert r.ops_per_sec > 0
+            assert not os.path.exists(storm_dir)
+
+    def test_refuses_existing_dir(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            with pytest.raises(ValueError, match="already exists"):
+                run_storm(td, threads=1, fanout=1, files_per_dir=1)
+
+    def test_scaling_summary(self):
+        with tempfile.TemporaryDirectory() as td:
+            results = storm_scaling(os.path.join(td, "s"), [1, 2],
+                                    fanout=2, files_per_dir=3)
+            summary = storm_summary(results)
+            assert set(summary) == {1, 2}
+            assert set(summary[2]) == set(STORM_OPS)
+
+
+def _snapshot(root):
+    return sorted((os.path.relpath(p, root), sorted(files))
+                  for p, _, files in os.walk(root))
+
+
+class TestTreeBuilder:
+    def test_profiles(self):
+        flat = plan_tree(TreeSpec("flat", entries_per_dir=50, fanout=4, depth=3))
+        assert flat == [("", 50)]
+        balanced = plan_tree(TreeSpec("balanced", 10, fanout=3, depth=3))
+        assert len(balanced) == 1 + 3 + 9
+        skewed = [n for _, n in plan_tree(TreeSpec("skewed", 100, 4, 4))]
+        assert max(skewed) > 3 * min(skewed)
+
+    def test_rejects_unknown_profile(self):
+        import pytest
+        with pytest.raises(ValueError, match="Unknown tree profile"):
+            TreeSpec("random")
+
+    def test_deterministic_across_workers(self):
+        spec = TreeSpec("skewed", entries_per_dir=20, fanout=3, depth=3,
+                        file_size=16)
+        with tempfile.TemporaryDirectory() as td:
+            a, b = os.path.join(td, "a"), os.path.join(td, "b")
+            ra = build_tree(a, spec, workers=1, chunk_files=25)
+            rb = build_tree(b, spec, workers=2, chunk_files=25)
+            assert _snapshot(a) == _snapshot(b)
+            assert ra.files == rb.files == sum(n for _, n in plan_tree(spec))
+            sizes = {os.path.getsize(os.path.join(p, f))
+                     for p, _, fs in os.walk(a) for f in fs}
+            assert sizes == {16}
+
+    def test_resume(self):
+        spec = TreeSpec("balanced", entries_per_dir=10, fanout=2, depth=3)
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            tasks = _tasks(plan_tree(spec), 15)
+            # An interrupted build: header plus the first task journaled.
+            first = build_tree(root, spec, chunk_files=15)
+            with open(journal_path_for(root)) as f:
+                header = f.readline()
+            with open(journal_path_for(root), "w") as f:
+                f.write(header + "0\n")
+            assert not build_finished(root)
+            report = build_tree(root, spec, chunk_files=15)
+            assert build_finished(root)
+            assert report.skipped_tasks == 1
+            assert report.built_files == first.files - sum(
+                hi - lo for _, lo, hi in tasks[0])
+            again = build_tree(root, spec, chunk_files=15)
+            assert again.skipped_tasks == again.tasks
+            assert again.built_files == 0
+            with open(journal_path_for(root)) as f:
+                assert f.read().count("done") == 1
+
+    def test_failed_task_journals_the_rest(self):
+        import pytest
+        spec = TreeSpec("balanced", entries_per_dir=5, fanout=3, depth=3)
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            tasks = _tasks(plan_tree(spec), 5)
+            # A file where one task's directory should go makes it fail.
+            (bad_rel, _, _), = tasks[1]
+            os.makedirs(os.path.dirname(os.path.join(root, bad_rel)))
+            open(os.path.join(root, bad_rel), "w").close()
+            with pytest.raises(OSError):
+                build_tree(root, spec, workers=2, chunk_files=5)
+            assert not build_finished(root)
+            with open(journal_path_for(root)) as f:
+                journaled = {int(line) for line in f.readlines()[1:]}
+            # Every task that ran to completion is in the journal.
+            for i, task in enumerate(tasks):
+                built = all(os.path.exists(os.path.join(
+                                root, rel, file_name(spec.seed, rel, k)))
+                            for rel, lo, hi in task for k in range(lo, hi))
+                assert built == (i in journaled)
+
+    def test_journal_spec_mismatch(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            build_tree(root, TreeSpec("flat", entries_per_dir=5))
+            with pytest.raises(ValueError, match="different tree spec"):
+                build_tree(root, TreeSpec("flat", entries_per_dir=6))
+
+    def test_split_directory(self):
+        spec = TreeSpec("flat", entries_per_dir=25)
+        tasks = _tasks(plan_tree(spec), 10)
+        assert [sum(hi - lo for _, lo, hi in t) for t in tasks] == [10, 10, 5]
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            _build_task(root, spec, tasks[2])  # later chunk first
+            assert len(os.listdir(root)) == 5
+
+
+class TestPathTable:
+    def test_roundtrip_paths(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=2)
+            table = PathTable.from_walk(root)
+            expected = sorted(p for _, es in _scandir_walk(root) for p in es)
+            assert sorted(table.path(i) for i in range(len(table))) == expected
+            got = [p for d, lo, hi in table.ranges() for p in table.paths(lo, hi)]
+            assert sorted(got) == expected
+            assert len(table.dirs) == len(_scandir_walk(root))
+
+    def test_compact_matches_default(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=30, depth=2)
+            default = list_tree(root, page_size=7, concurrency=3, use_stat=True)
+            compact = list_tree(root, page_size=7, concurrency=3,
+                                use_stat=True, compact=True)
+            assert isinstance(compact, RecordTable)
+            assert len(compact) == len(default)
+            assert sorted((r[3], r[2]) for r in compact) == \
+                sorted((r[3], r[2]) for r in default)
+            starts = list(compact.start)
+            assert starts == sorted(starts)
+
+    def test_binary_roundtrip(self):
+        table = RecordTable()
+        table.append(2.5, 3.0, 10, "/b")
+        table.append(1.0, 1.5, 4, "/a")
+        table.append(4.0, 4.25, 1, "/b")
+        table.sort()
+        with tempfile.TemporaryDirectory() as td:
+            path = os.path.join(td, "raw.bin")
+            table.write_binary(path)
+            back = RecordTable.read_binary(path)
+        assert list(back) == list(table)
+        assert list(back)[0] == ["1.000000", "1.500000", "4", "/a"]
+        assert back.durations() == [0.5, 0.5, 0.25]
+
+    def test_memory_compare(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            out = memory_compare(root, page_size=5, concurrency=2)
+            assert out["default"]["records"] == out["compact"]["records"]
+            assert out["compact"]["peak_rss_mb"] > 0
+
+
+_KEYS = ["a.txt", "b/1", "b/2", "b/c/3", "b/c/4", "c/5", "z"]
+
+
+class TestObjectStore:
+    def test_pagination(self):
+        ns = ObjectNamespace(_KEYS, page_size=3, latency_ms=0)
+        page = ns.list_objects()
+        assert page.keys == ["a.txt", "b/1", "b/2"] and page.is_truncated
+        page = ns.list_objects(token=page.next_token)
+        assert page.keys == ["b/c/3", "b/c/4", "c/5"]
+        page = ns.list_objects(token=page.next_token)
+        assert page.keys == ["z"] and not page.is_truncated
+        assert ns.requests == 3
+
+    def test_delimiter_and_start_after(self):
+        ns = ObjectNamespace(_KEYS, page_size=2, latency_ms=0)
+        page = ns.list_objects(delimiter="/")
+        assert page.keys == ["a.txt"] and page.common_prefixes == ["b/"]
+        page = ns.list_objects(delimiter="/", token=page.next_token)
+        assert page.common_prefixes == ["c/"] and page.keys == ["z"]
+        assert not page.is_truncated
+        page = ns.list_objects(prefix="b/", delimiter="/")
+        assert page.keys == ["b/1", "b/2"]
+        assert ns.list_objects(start_after="b/c/4").keys == ["c/5", "z"]
+
+    def test_strategies_complete(self):
+        import pytest
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=40, depth=3)
+            ns = ObjectNamespace(keys_from_tree(root), page_size=25,
+                                 latency_ms=0)
+            results = [run_strategy(ns, s, concurrency=4) for s in STRATEGIES]
+            assert all(r.complete and r.keys == len(ns) for r in results)
+            flat = results[0]
+            assert flat.requests == -(-len(ns) // 25)
+            with pytest.raises(ValueError, match="Unknown listing strategy"):
+                run_strategy(ns, "random")
+
+    def test_partition_depth(self):
+        ns = ObjectNamespace(keys_from_spec(TreeSpec("skewed", 30, 4, 3)),
+                             page_size=10, latency_ms=0)
+        r = run_strategy(ns, "partitioned", concurrency=4,
+                         alphabet="0123456789abcdef", split_depth=2)
+        assert r.complete
+        assert r.requests >= 16 * 16 + 1
+
+
+class TestShardPlan:
+    def test_planners_balance(self):
+        inp = synthetic_input(4000, seed=1)
+        stats = {}
+        for planner in PLANNERS:
+            assign = plan_shards(inp, planner, 8)
+            assert len(assign) == 4000 and max(assign) < 8
+            assert plan_shards(inp, planner, 8) == assign  # deterministic
+            stats[planner] = imbalance(inp, assign, ranks=4, workers=2)
+        assert stats["round_robin"]["worker_count_imbalance"] == 1.0
+        assert stats["greedy"]["worker_byte_imbalance"] < \
+            stats["hash"]["worker_byte_imbalance"]
+        assert stats["greedy"]["worker_byte_imbalance"] < 1.01
+
+    def test_greedy_spreads_empty_files(self):
+        inp = synthetic_input(100)
+        inp.sizes = type(inp.sizes)("Q", [0] * 100)
+        assign = plan_shards(inp, "greedy", 4)
+        assert imbalance(inp, assign, 2, 2)["worker_count_imbalance"] == 1.0
+
+    def test_unknown_planner(self):
+        import pytest
+        with pytest.raises(ValueError, match="Unknown planner"):
+            plan_shards(synthetic_input(10), "random", 2)
+
+    def test_plan_tree_in_subprocess(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=20, depth=2)
+            (result,) = plan_benchmark([root], ["hash"], ranks=2, workers=2)
+            assert result.source == "tree"
+            assert result.entries == sum(len(es) for _, es in _scandir_walk(root))
+
+
+class TestProcessExecutor:
+    def test_executors_agree(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=30, depth=2)
+            expected = sorted((r[3], r[2]) for r in list_tree(root, 7, 2,
+                                                               use_stat=True))
+            for executor in ("process", "hybrid"):
+                records = list_tree(root, 7, 2, use_stat=True,
+                                    executor=executor, processes=2)
+                assert sorted((r[3], r[2]) for r in records) == expected
+                starts = [float(r[0]) for r in records]
+                assert starts == sorted(starts)
+            compact = list_tree(root, 7, 2, use_stat=True, compact=True,
+                                executor="process", processes=2)
+            assert sorted((r[3], r[2]) for r in compact) == expected
+
+    def test_parallelism(self):
+        assert executor_parallelism("thread", 8, processes=4) == 8
+        assert executor_parallelism("process", 8, processes=4) == 4
+        assert executor_parallelism("hybrid", 8, processes=4) == 32
+        assert executor_parallelism("process", 8) == os.cpu_count()
+
+    def test_rejects_thread_only_options(self):
+        import pytest
+        with pytest.raises(ValueError, match="Unknown executor"):
+            list_tree("/nonexistent", 10, 1, executor="fiber")
+        with pytest.raises(ValueError, match="need executor 'thread'"):
+            list_tree("/nonexistent", 10, 1, executor="process",
+                      op_mix=parse_op_mix("stat"))
+
+    def test_scaling_rows(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            stats = executor_scaling(root, 5, [1, 2], hybrid_threads=2)
+            assert [(s.executor, s.workers) for s in stats] == \
+                [(e, n) for n in (1, 2) for e in EXECUTORS]
+            assert len({s.entries for s in stats}) == 1
+
+
+class TestTimeline:
+    def test_overlapping_calls(self):
+        # Two 1 s calls fully overlapped: 1 s of wall clock, not 2.
+        law = littles_law([(10.0, 11.0, 100), (10.0, 11.0, 100)], 2)
+        assert law["wall_sec"] == 1.0
+        assert law["entries_per_sec"] == 200.0
+        assert law["serial_entries_per_sec"] == 100.0
+        assert law["mean_in_flight"] == 2.0
+        assert law["utilization"] == 1.0
+        assert littles_law([], 4)["entries_per_sec"] == 0.0
+
+    def test_bins(self):
+        calls = [(0.0, 2.0, 10), (1.0, 4.0, 5), (3.0, 4.0, 7)]
+        bins = timeline(calls, 1.0)
+        assert [b.t_sec for b in bins] == [0.0, 1.0, 2.0, 3.0]
+        assert [b.in_flight for b in bins] == [1.0, 2.0, 1.0, 2.0]
+        assert [b.completed_calls for b in bins] == [0, 0, 1, 2]
+        assert sum(b.completed_entries for b in bins) == 22
+        default = timeline(calls)
+        assert len(default) == 100
+        assert sum(b.completed_calls for b in default) == 3
+
+    def test_spans_from_rows_and_table(self):
+        rows = [["1.500000", "2.000000", "3", "/a"],
+                ["1.750000", "2.500000", "4", "/b"]]
+        expected = [(1.5, 2.0, 3), (1.75, 2.5, 4)]
+        assert spans(rows) == expected
+        assert spans(RecordTable.from_rows(rows)) == expected
+
+    def test_sweep(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = os.path.join(td, "tree")
+            make_tree(root, entries_per_dir=10, depth=2)
+            swept = concurrency_sweep(root, 5, [1, 2])
+            assert list(swept) == [1, 2]
+            assert swept[1]["entries_per_sec"] > 0
+            assert swept[2]["concurrency"] == 2